@@ -0,0 +1,82 @@
+"""
+Startup benchmark: parses `python -X importtime` for the entry points and
+times a full CLI start (`src/main2.py --help`) in a fresh interpreter.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List, NamedTuple
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# moduler som ska importeras snabbt i CLI-läge
+CLI_MODULES = ("src.main", "src.main2")
+GUI_MODULES = ("src.gui.control_gui",)
+TARGET_MS = 100.0
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class ImportEntry(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportEntry]:
+    """Parses the `-X importtime` lines from stderr (header and other output are skipped)."""
+    entries = []
+    for line in stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            self_us, cumulative_us, indent, module = m.groups()
+            entries.append(ImportEntry(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure_import(module: str) -> List[ImportEntry]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def measure_cli_wall(repeat: int = 5) -> float:
+    """Best-of-`repeat` wall time in ms for `python src/main2.py --help`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, os.path.join("src", "main2.py"), "--help"],
+            cwd=PROJECT_ROOT, capture_output=True, check=True,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(top: int = 5) -> Dict[str, object]:
+    results: Dict[str, object] = {}
+    for module in CLI_MODULES + GUI_MODULES:
+        entries = measure_import(module)
+        total = next((e.cumulative_us for e in reversed(entries) if e.module == module), 0)
+        results[f"import {module} (ms)"] = round(total / 1000, 1)
+        if module in CLI_MODULES:
+            heaviest = sorted(entries, key=lambda e: e.self_us, reverse=True)[:top]
+            results[f"import {module} top self"] = ", ".join(
+                f"{e.module} {e.self_us / 1000:.1f}" for e in heaviest
+            )
+            # Qt får aldrig dras in av CLI-läget
+            results[f"import {module} loads PyQt5"] = any(e.module.startswith("PyQt5") for e in entries)
+    wall = measure_cli_wall()
+    results["cli startup wall (ms)"] = round(wall, 1)
+    results[f"cli startup < {TARGET_MS:.0f} ms"] = wall < TARGET_MS
+    return results
+
+
+if __name__ == "__main__":
+    for key, value in run().items():
+        print(f"{key:40} {value}")
@@ -0,0 +1,97 @@
+"""
+Replay benchmark: records a synthetic simulation with ReplayRecorder and
+reports file size, recording overhead, seek latency and playback speed.
+"""
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.movement_manager import MovementManager
+from src.core.replay import DEFAULT_KEYFRAME_INTERVAL, ReplayPlayer, ReplayRecorder
+from src.core.submarine import Submarine
+
+FLEET = 200
+ROUNDS = 1000
+SEEKS = 200
+
+
+class _NoSensors:
+    def process_next_round(self, round_counter, only_active=True):
+        pass
+
+
+def _fleet(seed: int = 1) -> MovementManager:
+    rng = random.Random(seed)
+    manager = MovementManager(reader=None)
+    for i in range(FLEET):
+        sub = Submarine(f"{10000000 + i}-{i % 100:02d}")
+        # egna banor så att flottan inte förstörs direkt vid origo
+        moves = [("down", 1000 * i)]
+        moves += [(rng.choice(("forward", "up", "down")), rng.randint(1, 9)) for _ in range(ROUNDS - 1)]
+        sub.attach_generator(iter(moves))
+        manager.submarines[sub.id] = sub
+    manager.publish_snapshot(0)
+    return manager
+
+
+def _simulate(path=None) -> float:
+    manager = _fleet()
+    recorder = None
+    if path is not None:
+        recorder = ReplayRecorder(path)
+        recorder.attach(manager)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.run(_NoSensors())
+    if recorder is not None:
+        recorder.close()
+    return time.perf_counter() - start
+
+
+def run() -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.replay")
+        plain = _simulate()
+        recorded = _simulate(path)
+        size = os.path.getsize(path)
+
+        with ReplayPlayer(path) as player:
+            rng = random.Random(2)
+            latencies = []
+            for _ in range(SEEKS):
+                target = rng.randint(0, player.last_round)
+                start = time.perf_counter()
+                player.seek(target)
+                latencies.append((time.perf_counter() - start) * 1000)
+            latencies.sort()
+
+            player.seek(0)
+            start = time.perf_counter()
+            rounds = player.play(publish=False)
+            playback = time.perf_counter() - start
+
+    return {
+        "fleet x rounds": f"{FLEET} x {ROUNDS}",
+        "keyframe interval": DEFAULT_KEYFRAME_INTERVAL,
+        "file size (KiB)": round(size / 1024, 1),
+        "bytes per sub move": round(size / (FLEET * ROUNDS), 2),
+        "simulation (s)": round(plain, 2),
+        "simulation + recording (s)": round(recorded, 2),
+        "seek median (ms)": round(statistics.median(latencies), 2),
+        "seek p95 (ms)": round(latencies[int(0.95 * (len(latencies) - 1))], 2),
+        "playback (rounds/s)": round(rounds / playback) if playback else None,
+    }
+
+
+if __name__ == "__main__":
+    for key, value in run().items():
+        print(f"{key:30} {value}")
@@ -0,0 +1,50 @@
+"""
+Runs every `bench_*.py` module in this directory and prints its results.
+
+Each benchmark module exposes `run() -> dict` (metric name -> value).
+
+    python benchmarks/run_benchmarks.py            # alla
+    python benchmarks/run_benchmarks.py import_time
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BENCH_DIR, ".."))
+for path in (PROJECT_ROOT, BENCH_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def discover():
+    return sorted(
+        name[len("bench_"):-len(".py")]
+        for name in os.listdir(BENCH_DIR)
+        if name.startswith("bench_") and name.endswith(".py")
+    )
+
+
+def main(argv=None):
+    available = discover()
+    parser = argparse.ArgumentParser(description="Run the Ubåtscentralen benchmark suite.")
+    parser.add_argument("names", nargs="*", metavar="NAME",
+                        help=f"benchmarks to run (default: all of {', '.join(available)})")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in available]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    for name in args.names or available:
+        module = importlib.import_module(f"bench_{name}")
+        print(f"=== {name} ===")
+        start = time.perf_counter()
+        for key, value in module.run().items():
+            print(f"  {key:40} {value}")
+        print(f"  ({time.perf_counter() - start:.1f} s)\n")
+
+
+if __name__ == "__main__":
+    main()
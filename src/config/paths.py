@@ -7,6 +7,29 @@ MOVEMENT_REPORTS_DIR = BASE_DIR / "files" / "MovementReports"
 SENSOR_DATA_DIR = BASE_DIR / "files" / "Sensordata"
 SECRETS_DIR = BASE_DIR / "files" / "Secrets"
 LOG_DIR = BASE_DIR / "files" / "Logs"
+SENSOR_CACHE_DIR = BASE_DIR / "files" / "SensorCache"
+LINE_INDEX_DIR = BASE_DIR / "files" / "LineIndex"
+FLEET_MANIFEST_PATH = BASE_DIR / "files" / "fleet_manifest.json"
+EVENT_STORE_PATH = BASE_DIR / "files" / "events.sqlite"
+
+def set_files_dir(files_dir) -> None:
+    """
+    Pekar om alla datakataloger till en annan rot med samma layout som files/
+    (MovementReports, Sensordata, Secrets, ...). Används t.ex. per scenario.
+    Moduler som läser `paths.X` vid anrop ser den nya roten direkt.
+    Loggarna följer inte med automatiskt: anropa logger.set_log_dir(LOG_DIR).
+    """
+    global MOVEMENT_REPORTS_DIR, SENSOR_DATA_DIR, SECRETS_DIR, LOG_DIR
+    global SENSOR_CACHE_DIR, LINE_INDEX_DIR, FLEET_MANIFEST_PATH, EVENT_STORE_PATH
+    files_dir = pathlib.Path(files_dir)
+    MOVEMENT_REPORTS_DIR = files_dir / "MovementReports"
+    SENSOR_DATA_DIR = files_dir / "Sensordata"
+    SECRETS_DIR = files_dir / "Secrets"
+    LOG_DIR = files_dir / "Logs"
+    SENSOR_CACHE_DIR = files_dir / "SensorCache"
+    LINE_INDEX_DIR = files_dir / "LineIndex"
+    FLEET_MANIFEST_PATH = files_dir / "fleet_manifest.json"
+    EVENT_STORE_PATH = files_dir / "events.sqlite"
 
 def movement_file_path(drone_id: str) -> pathlib.Path:
     """Returnerar sökvägen till en specifik rörelserapport-fil."""
@@ -16,6 +39,10 @@ def sensor_file_path(drone_id: str) -> pathlib.Path:
     """Returnerar sökvägen till en specifik sensordata-fil."""
     return SENSOR_DATA_DIR / f"{drone_id}.txt"
 
+def sensor_cache_file_path(drone_id: str) -> pathlib.Path:
+    """Returnerar sökvägen till den bitpackade cachen för en sensordata-fil."""
+    return SENSOR_CACHE_DIR / f"{drone_id}.bin"
+
 def secret_key_file_path() -> pathlib.Path:
     """Returnerar sökvägen till SecretKEY.txt."""
     return SECRETS_DIR / "SecretKEY.txt"
@@ -0,0 +1,150 @@
+import argparse
+import sys
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.core.trajectory_bounds import DEFAULT_WINDOW, TrajectoryBounds
+from src.data.file_reader import FileReader
+from src.utils.logger import collision_logger
+
+
+class CollisionAnalysis(NamedTuple):
+    collisions: List[Tuple[int, Tuple[int, int], str, str]]  # (runda, pos, sub_a, sub_b) som MovementManager
+    destroyed: Dict[str, int]                                  # sub_id -> runda då den förstördes
+    averted: List[Tuple[int, Tuple[int, int], Tuple[str, ...]]]  # möten som uteblev: någon var redan förstörd
+    rounds: int                                                # sista rundan där någon sub fortfarande rör sig
+
+
+class CollisionAnalyzer:
+    """
+    Offline collision finder that does not run the round loop.
+
+    Each sub's path is stored as its cell per round (round n+1 is the round in
+    which its n moves run out; it still takes part in that round's check).
+    Time is cut into windows of `window` rounds; a sweep over the windows'
+    bounding boxes (TrajectoryBounds) drops subs that cannot meet anyone, and
+    only the remaining subs are bucketed by (round, cell). Meetings are then
+    resolved in round order with MovementManager's pairing rule - in fleet
+    order the 2nd sub in a cell destroys itself and the 1st, the 3rd takes
+    the cell, the 4th collides with the 3rd - skipping subs destroyed in an
+    earlier round, which gives the destruction cascade.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.bounds = TrajectoryBounds(window)
+        self.order: List[str] = []   # flottordning = iterationsordning i step_round
+        self.xs: Dict[str, array] = {}
+        self.ys: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def add(self, sub_id: str, moves: Iterable[Tuple[str, int]]) -> None:
+        """Adds a sub (in fleet order) with its movement stream."""
+        moves = list(moves)
+        xs, ys = array("q"), array("q")
+        x = y = 0
+        for direction, distance in moves:
+            if direction == "forward":
+                x += distance
+            elif direction == "down":
+                y += distance
+            elif direction == "up":
+                y -= distance
+            xs.append(x)
+            ys.append(y)
+        xs.append(x)  # rundan då dragen tar slut
+        ys.append(y)
+        if sub_id not in self.xs:
+            self.order.append(sub_id)
+        self.xs[sub_id], self.ys[sub_id] = xs, ys
+        self.bounds.add(sub_id, moves)
+
+    def analyze(self) -> CollisionAnalysis:
+        window = self.bounds.window
+        last_round = max((len(xs) for xs in self.xs.values()), default=0)
+        rank = {sub_id: i for i, sub_id in enumerate(self.order)}
+        destroyed: Dict[str, int] = {}
+        collisions, averted = [], []
+
+        for start in range(1, last_round + 1, window):
+            isolated = self.bounds.isolated(start)
+            # förstörda subs hinkas också, så att uteblivna möten kan rapporteras
+            candidates = [
+                sub_id for sub_id in self.order
+                if sub_id not in isolated and len(self.xs[sub_id]) >= start
+            ]
+            if len(candidates) < 2:
+                continue
+
+            # hinkar: (runda, cell) -> subs i flottordning
+            buckets: Dict[Tuple[int, int, int], List[str]] = {}
+            end = min(start + window, last_round + 1)
+            for sub_id in candidates:
+                xs, ys = self.xs[sub_id], self.ys[sub_id]
+                for r in range(start, min(end, len(xs) + 1)):
+                    key = (r, xs[r - 1], ys[r - 1])
+                    bucket = buckets.get(key)
+                    if bucket is None:
+                        buckets[key] = [sub_id]
+                    else:
+                        bucket.append(sub_id)
+
+            found = []
+            meetings = sorted((key, subs) for key, subs in buckets.items() if len(subs) > 1)
+            for (r, x, y), subs in meetings:
+                alive = [s for s in subs if s not in destroyed]
+                if len(alive) < len(subs):
+                    averted.append((r, (x, y), tuple(subs)))
+                alive.sort(key=rank.__getitem__)
+                occupant = None
+                for sub_id in alive:
+                    if occupant is None:
+                        occupant = sub_id
+                    else:
+                        found.append((r, (x, y), sub_id, occupant))
+                        destroyed[sub_id] = destroyed[occupant] = r
+                        occupant = None
+            # motorn loggar en rundas kollisioner i den ordning den senare suben flyttas
+            found.sort(key=lambda c: (c[0], rank[c[2]]))
+            collisions.extend(found)
+
+        collision_logger.info(
+            f"Collision analysis: {len(collisions)} collisions, {len(destroyed)} subs destroyed, "
+            f"{len(averted)} meetings averted"
+        )
+        rounds = max(
+            (min(len(self.xs[s]), destroyed.get(s, len(self.xs[s]))) for s in self.order), default=0
+        )
+        return CollisionAnalysis(collisions, destroyed, averted, rounds)
+
+
+def analyze_files(sub_ids: Iterable[str], window: int = DEFAULT_WINDOW,
+                  reader: Optional[FileReader] = None, max_lines: int = 10_000) -> CollisionAnalysis:
+    """Analyzes the subs' movement files (parsed exactly like the simulation) in the given fleet order."""
+    reader = reader if reader is not None else FileReader()
+    analyzer = CollisionAnalyzer(window)
+    for sub_id in sub_ids:
+        analyzer.add(sub_id, reader.load_movements(sub_id, max_lines=max_lines))
+    return analyzer.analyze()
+
+
+def main(argv=None) -> int:
+    from src.data.fleet_manifest import load_manifest
+
+    parser = argparse.ArgumentParser(description="List every collision without running the simulation.")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="rounds per time window")
+    parser.add_argument("--limit", type=int, default=50, help="max collisions to print (0 = all)")
+    args = parser.parse_args(argv)
+
+    result = analyze_files(load_manifest().drone_ids(), window=args.window)
+    shown = result.collisions if not args.limit else result.collisions[:args.limit]
+    for r, pos, a, b in shown:
+        print(f"Round {r}: {a} and {b} collide at {pos}")
+    print(f"{len(result.collisions)} collisions, {len(result.destroyed)} subs destroyed, "
+          f"{len(result.averted)} meetings averted by earlier destruction, last round {result.rounds}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import heapq
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.core.submarine import Submarine
+from src.utils.logger import collision_logger, movement_logger
+
+
+class EventScheduler:
+    """
+    Event-driven alternative to MovementManager's lockstep rounds.
+
+    Every submarine moves on its own cadence: once every `period` ticks,
+    starting at tick `phase + period`. A heap keyed by (next tick, fleet order)
+    lets the scheduler jump straight to the next tick where anything moves,
+    so the cost is proportional to the number of moves, not rounds x fleet.
+
+    Collisions are only checked at event ticks, against an occupancy map of
+    every deployed sub (also those that did not move this tick). Movers are
+    lifted out of the map before anyone moves, so - like a round - two subs
+    swapping cells do not collide. A sub is deployed with its first move
+    (the whole fleet starts stacked at the origin). With every period = 1
+    the result is the same as MovementManager.step_round.
+
+    With a `sensor_manager`, every sub that is still active after an event
+    tick reads one sensor line for the move it made (main2 --events).
+    """
+
+    def __init__(self, sensor_manager=None):
+        self.sensor_manager = sensor_manager
+        self.submarines: Dict[str, Submarine] = {}
+        self.periods: Dict[str, int] = {}
+        self.collisions: List[Tuple[int, Tuple[int, int], str, str]] = []  # (tick, pos, sub_a, sub_b)
+        self.round_moves: List[Tuple[Submarine, Tuple[int, int]]] = []     # (sub, position före draget) senaste ticken
+        self.observers = []  # on_round(scheduler, tick), samma gränssnitt som MovementManager
+        self.time = 0
+        self.events = 0
+        self._heap: List[Tuple[int, int, str]] = []  # (nästa tick, flottordning, sub_id)
+        self._occupancy: Dict[Tuple[int, int], Submarine] = {}
+
+    @classmethod
+    def from_manager(cls, manager, periods: Optional[Dict[str, int]] = None,
+                     sensor_manager=None) -> "EventScheduler":
+        """Schedules the submarines (with generators) already loaded in a MovementManager."""
+        scheduler = cls(sensor_manager)
+        periods = periods or {}
+        for sub in manager.submarines.values():
+            scheduler.add(sub, periods.get(sub.id, 1))
+        return scheduler
+
+    def add(self, sub: Submarine, period: int = 1, phase: int = 0) -> None:
+        """Adds `sub`, moving every `period` ticks from tick `phase + period`."""
+        if period < 1:
+            raise ValueError(f"{sub.id}: period must be >= 1")
+        order = len(self.submarines)
+        self.submarines[sub.id] = sub
+        self.periods[sub.id] = period
+        if sub.is_active and sub._gen is not None:
+            heapq.heappush(self._heap, (self.time + phase + period, order, sub.id))
+
+    def add_observer(self, observer) -> None:
+        self.observers.append(observer)
+
+    @property
+    def active_subs(self):
+        return [s for s in self.submarines.values() if s.is_active]
+
+    def next_time(self) -> Optional[int]:
+        return self._heap[0][0] if self._heap else None
+
+    def _collide(self, tick: int, pos, sub: Submarine, other: Submarine):
+        sub.is_active = False
+        other.is_active = False
+        del self._occupancy[pos]
+        self.collisions.append((tick, pos, sub.id, other.id))
+        movement_logger.critical(f"Collision at {pos}: {sub.id} and {other.id} destroyed")
+        collision_logger.critical(f"Collision at {pos}: {sub.id} and {other.id} destroyed")
+
+    def step(self) -> Optional[int]:
+        """Processes every move scheduled at the next event tick. Returns the tick, or None when done."""
+        if not self._heap:
+            return None
+        tick = self._heap[0][0]
+        batch = []
+        while self._heap and self._heap[0][0] == tick:
+            _, order, sub_id = heapq.heappop(self._heap)
+            sub = self.submarines[sub_id]
+            # förstörda subs ligger kvar i heapen tills de poppas (lat borttagning)
+            if sub.is_active and sub._gen is not None:
+                batch.append((order, sub))
+        self.time = tick
+        self.round_moves = []
+
+        # lyft ut alla som ska röra sig innan någon flyttas
+        for _, sub in batch:
+            if self._occupancy.get(sub.position) is sub:
+                del self._occupancy[sub.position]
+
+        ran_out = []
+        for order, sub in batch:
+            prev = sub.position
+            sub.step()
+            pos = sub.position
+            self.events += 1
+            if sub._gen is not None:
+                self.round_moves.append((sub, prev))
+            else:
+                ran_out.append(sub)
+
+            other = self._occupancy.get(pos)
+            if other is not None:
+                self._collide(tick, pos, sub, other)
+            else:
+                self._occupancy[pos] = sub
+                if sub._gen is not None:
+                    heapq.heappush(self._heap, (tick + self.periods[sub.id], order, sub.id))
+
+        # en sub utan drag kvar deltar i denna ticks kollisioner, sedan inte mer
+        for sub in ran_out:
+            if self._occupancy.get(sub.position) is sub:
+                del self._occupancy[sub.position]
+
+        if self.sensor_manager is not None:
+            self.sensor_manager.process_ids(tick, [sub.id for _, sub in batch if sub.is_active])
+        for observer in self.observers:
+            observer.on_round(self, tick)
+        return tick
+
+    def run(self, until: Optional[int] = None) -> int:
+        """Runs until no sub can move (or past tick `until`). Returns the number of event ticks processed."""
+        ticks = 0
+        while self._heap and (until is None or self._heap[0][0] <= until):
+            self.step()
+            ticks += 1
+        movement_logger.info(f"Event simulation finished at tick {self.time}: {self.events} sub steps, {ticks} event ticks")
+        return ticks
+
+
+def load_periods(path: Union[str, Path]) -> Dict[str, int]:
+    """Reads a cadence file: a JSON object {sub_id: period}; unlisted subs move every tick."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object of sub_id -> period")
+    periods = {}
+    for sub_id, period in data.items():
+        if not isinstance(period, int) or isinstance(period, bool) or period < 1:
+            raise ValueError(f"{path}: period for {sub_id} must be an integer >= 1")
+        periods[sub_id] = period
+    return periods
@@ -0,0 +1,79 @@
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class SubmarineState(NamedTuple):
+    """Read-only view of one submarine; has the same id/position/is_active as Submarine."""
+    id: str
+    position: Tuple[int, int]
+    is_active: bool
+
+
+class FleetSnapshot:
+    """
+    Immutable per-round copy of the fleet in compact arrays.
+
+    `MovementManager.step_round` builds a new snapshot after each round and
+    publishes it by replacing a single attribute (an atomic reference swap),
+    so GUI readers always see one consistent round without any locking.
+    """
+
+    __slots__ = ("round_number", "ids", "xs", "ys", "active", "collision_count", "_index")
+
+    def __init__(self, round_number: int, ids: Tuple[str, ...], xs: array, ys: array,
+                 active: bytes, collision_count: int, index: Dict[str, int]):
+        self.round_number = round_number
+        self.ids = ids
+        self.xs = xs
+        self.ys = ys
+        self.active = active
+        self.collision_count = collision_count
+        self._index = index  # sub_id -> rad, delas mellan snapshots med samma flotta
+
+    @classmethod
+    def capture(cls, round_number: int, submarines, collision_count: int = 0,
+                previous: Optional["FleetSnapshot"] = None) -> "FleetSnapshot":
+        """
+        Copies the current state of `submarines` (in fleet order). The id
+        tuple and index of `previous` are shared when the fleet is unchanged.
+        """
+        subs = list(submarines)
+        ids = tuple(s.id for s in subs)
+        # samma flotta (samma id:n i samma ordning) → återanvänd tabellerna
+        if previous is not None and previous.ids == ids:
+            ids, index = previous.ids, previous._index
+        else:
+            index = {sub_id: i for i, sub_id in enumerate(ids)}
+        return cls(
+            round_number,
+            ids,
+            array("q", [s._x for s in subs]),
+            array("q", [s._y for s in subs]),
+            bytes(s._active for s in subs),
+            collision_count,
+            index,
+        )
+
+    @classmethod
+    def empty(cls) -> "FleetSnapshot":
+        return cls(0, (), array("q"), array("q"), b"", 0, {})
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def active_count(self) -> int:
+        return self.active.count(1)
+
+    def state(self, i: int) -> SubmarineState:
+        return SubmarineState(self.ids[i], (self.xs[i], self.ys[i]), bool(self.active[i]))
+
+    def get(self, sub_id: str) -> Optional[SubmarineState]:
+        i = self._index.get(sub_id)
+        return None if i is None else self.state(i)
+
+    def states(self, active_only: bool = False) -> List[SubmarineState]:
+        return [
+            self.state(i) for i in range(len(self.ids))
+            if not active_only or self.active[i]
+        ]
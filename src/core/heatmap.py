@@ -0,0 +1,147 @@
+import math
+import threading
+from array import array
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from src.utils.npy import save_npy
+
+
+class TrafficHeatmap:
+    """
+    Counts how often each cell is visited during a run, including every cell
+    swept by a `forward`/`up`/`down` segment.
+
+    Segments are stored as +1/-1 entries in sparse per-row (horizontal) and
+    per-column (vertical) difference maps, so recording a move costs O(1)
+    regardless of its distance. Counts are only materialized (prefix sums)
+    when the map is queried or exported.
+    """
+
+    def __init__(self):
+        self._rows: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))  # y -> {x: delta}
+        self._cols: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))  # x -> {y: delta}
+        self._bounds: Optional[Tuple[int, int, int, int]] = None                      # min_x, min_y, max_x, max_y
+        self._lock = threading.Lock()  # GUI:t läser medan simuleringen skriver
+        self.segments = 0
+
+    def _extend_bounds(self, x0, y0, x1, y1):
+        if self._bounds is None:
+            self._bounds = (x0, y0, x1, y1)
+        else:
+            bx0, by0, bx1, by1 = self._bounds
+            self._bounds = (min(bx0, x0), min(by0, y0), max(bx1, x1), max(by1, y1))
+
+    def _add(self, start: Tuple[int, int], end: Tuple[int, int]):
+        (sx, sy), (ex, ey) = start, end
+        if sy == ey and sx != ex:
+            # horisontellt: cellerna efter start t.o.m. slut
+            lo, hi = (sx + 1, ex) if ex > sx else (ex, sx - 1)
+            row = self._rows[sy]
+            row[lo] += 1
+            row[hi + 1] -= 1
+            self._extend_bounds(lo, sy, hi, sy)
+        elif sx == ex and sy != ey:
+            lo, hi = (sy + 1, ey) if ey > sy else (ey, sy - 1)
+            col = self._cols[sx]
+            col[lo] += 1
+            col[hi + 1] -= 1
+            self._extend_bounds(sx, lo, sx, hi)
+        else:
+            # stillastående (distans 0) räknas som ett besök i cellen
+            row = self._rows[ey]
+            row[ex] += 1
+            row[ex + 1] -= 1
+            self._extend_bounds(ex, ey, ex, ey)
+        self.segments += 1
+
+    def add_segment(self, start: Tuple[int, int], end: Tuple[int, int]) -> None:
+        """Records one axis-aligned move from `start` to `end`."""
+        with self._lock:
+            self._add(start, end)
+
+    def add_point(self, pos: Tuple[int, int]) -> None:
+        """Records a visit to a single cell (e.g. a start position)."""
+        self.add_segment(pos, pos)
+
+    def on_round(self, manager, round_counter: int) -> None:
+        """MovementManager observer: records every move of the round under one lock."""
+        with self._lock:
+            for sub, prev in manager.round_moves:
+                self._add(prev, sub.position)
+
+    @property
+    def bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        return self._bounds
+
+    def visits(self, x: int, y: int) -> int:
+        """Number of visits to cell (x, y)."""
+        with self._lock:
+            row = self._rows.get(y, {})
+            col = self._cols.get(x, {})
+            return (sum(d for k, d in row.items() if k <= x)
+                    + sum(d for k, d in col.items() if k <= y))
+
+    def grid(self, cell_size: int = 1, bounds: Optional[Tuple[int, int, int, int]] = None):
+        """
+        Materializes the counts as a dense row-major array('I') binned into
+        `cell_size` x `cell_size` blocks. Returns (origin_x, origin_y, width, height, counts).
+        """
+        if cell_size < 1:
+            raise ValueError("cell_size must be >= 1")
+        with self._lock:
+            if bounds is None:
+                bounds = self._bounds or (0, 0, 0, 0)
+            rows = [(y, sorted(deltas.items())) for y, deltas in self._rows.items()]
+            cols = [(x, sorted(deltas.items())) for x, deltas in self._cols.items()]
+
+        min_x, min_y, max_x, max_y = bounds
+        width = (max_x - min_x) // cell_size + 1
+        height = (max_y - min_y) // cell_size + 1
+        counts = array("I", bytes(4 * width * height))
+
+        def add_run(fixed, lo, hi, value, horizontal):
+            # lägg `value` på varje cell i [lo, hi] längs en rad/kolumn, binnat
+            if horizontal:
+                if not min_y <= fixed <= max_y:
+                    return
+                lo, hi = max(lo, min_x), min(hi, max_x)
+                base = ((fixed - min_y) // cell_size) * width
+                origin = min_x
+            else:
+                if not min_x <= fixed <= max_x:
+                    return
+                lo, hi = max(lo, min_y), min(hi, max_y)
+                base = (fixed - min_x) // cell_size
+                origin = min_y
+            while lo <= hi:
+                b = (lo - origin) // cell_size
+                b_end = min(hi, origin + (b + 1) * cell_size - 1)
+                idx = base + b if horizontal else b * width + base
+                counts[idx] += value * (b_end - lo + 1)
+                lo = b_end + 1
+
+        for horizontal, lines in ((True, rows), (False, cols)):
+            for fixed, deltas in lines:
+                running = 0
+                for (k, d), nxt in zip(deltas, deltas[1:] + [(None, 0)]):
+                    running += d
+                    if running and nxt[0] is not None:
+                        add_run(fixed, k, nxt[0] - 1, running, horizontal)
+
+        return min_x, min_y, width, height, counts
+
+    def save_npy(self, path, cell_size: int = 1) -> None:
+        """Exports the (binned) counts as a uint32 .npy array of shape (height, width)."""
+        _, _, width, height, counts = self.grid(cell_size)
+        save_npy(path, counts, (height, width))
+
+    def save_pgm(self, path, cell_size: int = 1) -> None:
+        """Exports a log-scaled grayscale image (binary PGM)."""
+        _, _, width, height, counts = self.grid(cell_size)
+        peak = max(counts, default=0)
+        scale = 255 / math.log1p(peak) if peak else 0
+        pixels = bytes(int(math.log1p(c) * scale) for c in counts)
+        with open(path, "wb") as f:
+            f.write(f"P5\n{width} {height}\n255\n".encode("ascii"))
+            f.write(pixels)
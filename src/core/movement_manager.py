@@ -1,20 +1,45 @@
 from src.utils.logger import movement_logger, log_calls, collision_logger, sensor_logger
 from src.core.submarine import Submarine
 from src.core.sensor_manager import SensorManager
-import time
+from src.core.fleet_snapshot import FleetSnapshot
+from src.core.tick_scheduler import TickScheduler
 
 class MovementManager:
-    def __init__(self, reader, tick_delay=0.0):
+    def __init__(self, reader, tick_delay=0.0, prefetcher=None):
         self.file_reader = reader
+        self.prefetcher = prefetcher  # valfri Prefetcher: läser rörelser i förväg på en bakgrundstråd
         self.submarines = {}
         self.tick_delay = tick_delay
+        # tick_delay = rundans period (arbete + väntan), hålls mot monotona deadlines
+        self.scheduler = TickScheduler(tick_delay) if tick_delay > 0 else None
+        self.collisions: list[tuple[int, tuple[int, int], str, str]] = []  # (runda, pos, sub_a, sub_b)
+        self.round_moves: list[tuple[Submarine, tuple[int, int]]] = []   # (sub, position före draget) senaste rundan
+        self.observers = []  # objekt med on_round(manager, round_counter), körs efter varje runda
+        self.snapshot = FleetSnapshot.empty()  # senaste publicerade rundan, läses av GUI-tråden
+        self.bounds = None  # valfria TrajectoryBounds: isolerade subs hoppar över kollisionskollen
 
     def load_submarines_from_generator(self, gen):
         for sub_id, movement_gen in gen:
             sub = Submarine(sub_id)
             sub.attach_generator(movement_gen)
             self.submarines[sub.id] = sub
-            sub.attach_generator(self.file_reader.load_movements(sub.id))
+            moves = self.file_reader.load_movements(sub.id)
+            if self.prefetcher is not None:
+                moves = self.prefetcher.wrap(moves)
+            sub.attach_generator(moves)
+        self.publish_snapshot(0)
+
+    def publish_snapshot(self, round_counter: int) -> FleetSnapshot:
+        """Bygger en ny snapshot och byter ut referensen (atomiskt) – läsare blockerar aldrig."""
+        snapshot = FleetSnapshot.capture(
+            round_counter, self.submarines.values(), len(self.collisions), previous=self.snapshot
+        )
+        self.snapshot = snapshot
+        return snapshot
+
+    def add_observer(self, observer):
+        """Registrerar en observer som anropas med on_round(manager, round_counter) efter varje runda."""
+        self.observers.append(observer)
 
     @property
     def active_subs(self):
@@ -32,16 +57,24 @@ class MovementManager:
         )
 
         positions: dict[tuple[int, int], object] = {}
+        self.round_moves = []
+        isolated = self.bounds.isolated(round_counter) if self.bounds is not None else ()
 
         for sub in list(self.active_subs):
             if sub._gen is None:
                 continue
+            prev = sub.position
             sub.step()
             pos = sub.position
+            if sub._gen is not None:
+                self.round_moves.append((sub, prev))
+            if sub.id in isolated:
+                continue
             if pos in positions and positions[pos].is_active:
                 other = positions[pos]
                 sub.is_active = False
                 other.is_active = False
+                self.collisions.append((round_counter, pos, sub.id, other.id))
                 movement_logger.critical(
                     f"Collision at {pos}: {sub.id} and {other.id} destroyed"
                 )
@@ -56,12 +89,17 @@ class MovementManager:
         sensor_logger.info(
         f"[Sensor] Round {round_counter} finished → {len(self.active_subs)} subs left"
     )
-        if self.tick_delay > 0:
-            time.sleep(self.tick_delay)
+        self.publish_snapshot(round_counter)
+        for observer in self.observers:
+            observer.on_round(self, round_counter)
+        if self.scheduler is not None:
+            self.scheduler.wait()
 
     def run(self, sensor_manager):
         """Kör hela simuleringen tills inga subs kan röra sig längre."""
         round_counter = 1
+        if self.scheduler is not None:
+            self.scheduler.start()
 
         while True:
             # Kolla om det finns minst en aktiv ubåt med en generator kvar
@@ -76,3 +114,5 @@ class MovementManager:
             round_counter += 1
 
         movement_logger.info("Simulation finished")
+        if self.scheduler is not None:
+            movement_logger.info(f"Tick timing: {self.scheduler.stats().describe()}")
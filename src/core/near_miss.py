@@ -0,0 +1,165 @@
+import math
+from array import array
+from collections import deque
+from typing import Iterator, List, NamedTuple, Tuple
+
+from src.utils.logger import collision_logger
+
+DEFAULT_HORIZON = 5     # rundor framåt
+DEFAULT_DISTANCE = 3.0  # rapportera par som kommer närmare än så
+
+_STEPS = {"forward": (1, 0), "down": (0, 1), "up": (0, -1)}
+
+
+class Lookahead:
+    """
+    Iterator wrapper that can peek at upcoming items without consuming them.
+
+    Peeked items are buffered and handed out again by `next`, so a Submarine
+    keeps stepping through exactly the same moves.
+    """
+
+    __slots__ = ("_it", "_buffer", "exhausted")
+
+    def __init__(self, iterable):
+        self._it = iter(iterable)
+        self._buffer = deque()
+        self.exhausted = False
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        if self._buffer:
+            return self._buffer.popleft()
+        return next(self._it)
+
+    def peek(self, k: int) -> List:
+        """Up to `k` upcoming items (fewer if the stream ends first)."""
+        while len(self._buffer) < k and not self.exhausted:
+            try:
+                self._buffer.append(next(self._it))
+            except StopIteration:
+                self.exhausted = True
+        return list(self._buffer)[:k]
+
+
+class NearMiss(NamedTuple):
+    sub_a: str
+    sub_b: str
+    rounds_ahead: int
+    distance: float
+    pos_a: Tuple[int, int]
+    pos_b: Tuple[int, int]
+
+
+class NearMissPredictor:
+    """
+    Predicts which subs will come within `distance` of each other during the
+    next `horizon` rounds.
+
+    Each active sub's movement stream is wrapped in a Lookahead, so the next
+    moves are peeked rather than consumed. Projected positions are built as
+    one coordinate array per future round. Each sub's projected path gets a
+    bounding box; a sweep over the x-sorted boxes yields the few pairs that
+    can come close, and only those are checked round by round - roughly
+    O(fleet log fleet) per prediction instead of all pairs x horizon.
+    Like in step_round, a sub takes part up to and including the round in
+    which its moves run out.
+    """
+
+    def __init__(self, horizon: int = DEFAULT_HORIZON, distance: float = DEFAULT_DISTANCE):
+        if horizon < 1:
+            raise ValueError("horizon must be >= 1")
+        if distance < 0:
+            raise ValueError("distance must be >= 0")
+        self.horizon = horizon
+        self.distance = distance
+        self.latest: List[NearMiss] = []
+
+    def attach(self, manager) -> None:
+        """Wraps every sub's generator in a Lookahead and runs after each round as an observer."""
+        for sub in manager.submarines.values():
+            if sub._gen is not None and not isinstance(sub._gen, Lookahead):
+                sub._gen = Lookahead(sub._gen)
+        manager.add_observer(self)
+
+    def project(self, subs) -> Tuple[List[str], List[array], List[array], List[int]]:
+        """
+        Projected positions: per future round k (1..horizon) arrays of x and y,
+        indexed like the returned id list; `last[i]` is the number of future
+        rounds sub i is still present in.
+        """
+        ids: List[str] = []
+        last: List[int] = []
+        xs = [array("q") for _ in range(self.horizon)]
+        ys = [array("q") for _ in range(self.horizon)]
+        for sub in subs:
+            gen = sub._gen
+            if gen is None or not sub.is_active:
+                continue
+            if not isinstance(gen, Lookahead):
+                gen = sub._gen = Lookahead(gen)
+            moves = gen.peek(self.horizon)
+            x, y = sub.position
+            for k in range(self.horizon):
+                if k < len(moves):
+                    dx, dy = _STEPS.get(moves[k][0], (0, 0))
+                    x += dx * moves[k][1]
+                    y += dy * moves[k][1]
+                xs[k].append(x)
+                ys[k].append(y)
+            ids.append(sub.id)
+            # rundan efter sista draget deltar suben fortfarande
+            last.append(min(len(moves) + 1, self.horizon))
+        return ids, xs, ys, last
+
+    def _candidate_pairs(self, xs, ys, last) -> List[Tuple[int, int]]:
+        """Pairs whose boxes over the whole horizon come within `distance` (sweep over x)."""
+        limit = self.distance
+        boxes = []
+        for i, steps in enumerate(last):
+            px = [xs[k][i] for k in range(steps)]
+            py = [ys[k][i] for k in range(steps)]
+            boxes.append((min(px), max(px), min(py), max(py), i))
+        boxes.sort()
+
+        pairs = []
+        for n, (x0, x1, y0, y1, i) in enumerate(boxes):
+            for m in range(n + 1, len(boxes)):
+                ox0, _, oy0, oy1, j = boxes[m]
+                if ox0 - x1 > limit:
+                    break
+                if oy0 - y1 <= limit and y0 - oy1 <= limit:
+                    pairs.append((i, j) if i < j else (j, i))
+        return pairs
+
+    def predict(self, subs) -> List[NearMiss]:
+        """Pairs coming within `distance` in the next rounds, earliest round first (one entry per pair)."""
+        ids, xs, ys, last = self.project(subs)
+        limit = self.distance
+        found: List[NearMiss] = []
+
+        # grovsållning på boxar över hela horisonten, exakt kontroll runda för runda
+        for a, b in self._candidate_pairs(xs, ys, last):
+            for k in range(min(last[a], last[b])):
+                d = math.hypot(xs[k][a] - xs[k][b], ys[k][a] - ys[k][b])
+                if d <= limit:
+                    found.append(NearMiss(ids[a], ids[b], k + 1, d,
+                                          (xs[k][a], ys[k][a]), (xs[k][b], ys[k][b])))
+                    break
+
+        return sorted(found, key=lambda m: (m.rounds_ahead, m.distance, m.sub_a, m.sub_b))
+
+    def on_round(self, manager, round_counter: int) -> None:
+        """MovementManager observer: predicts from the positions after `round_counter`."""
+        self.latest = self.predict(manager.submarines.values())
+        if self.latest:
+            collision_logger.info(
+                f"Round {round_counter}: {len(self.latest)} near misses predicted within "
+                f"{self.horizon} rounds (d <= {self.distance})"
+            )
+            for m in self.latest:
+                collision_logger.debug(
+                    f"Near miss in {m.rounds_ahead} rounds: {m.sub_a} {m.pos_a} ↔ {m.sub_b} {m.pos_b} = {m.distance:.2f}"
+                )
@@ -0,0 +1,140 @@
+import argparse
+import sys
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+from src.core.pattern_registry import PatternRegistry
+from src.utils.bitpack import PATTERN_LEN, hamming, pack_pattern, unpack_pattern
+
+
+class PatternIndex:
+    """
+    Multi-index hashing over bit-packed sensor patterns.
+
+    Each pattern is split into `blocks` substrings with one hash table per block.
+    Two patterns within Hamming distance k must agree within k // blocks bits on
+    at least one block (pigeonhole), so a query only probes those buckets and
+    verifies the candidates with popcount instead of scanning every pattern.
+    """
+
+    def __init__(self, registry: Optional[PatternRegistry] = None,
+                 n_bits: int = PATTERN_LEN, blocks: int = 8):
+        if not 0 < blocks <= n_bits:
+            raise ValueError("blocks must be between 1 and n_bits")
+        self.registry = registry if registry is not None else PatternRegistry()
+        self.n_bits = n_bits
+
+        # (shift, width) per block, mest signifikanta blocket först
+        base, extra = divmod(n_bits, blocks)
+        self._blocks: List[Tuple[int, int]] = []
+        shift = n_bits
+        for i in range(blocks):
+            width = base + (1 if i < extra else 0)
+            shift -= width
+            self._blocks.append((shift, width))
+
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(blocks)]
+        self.occurrences: Dict[int, List[Tuple[str, int]]] = {}  # pid -> [(sub_id, round)]
+
+    def __len__(self) -> int:
+        return len(self.occurrences)
+
+    def _substrings(self, value: int):
+        for shift, width in self._blocks:
+            yield (value >> shift) & ((1 << width) - 1)
+
+    def add(self, pid: int, sub_id: str, round_counter: int) -> None:
+        """Indexes one observation of the registry pattern `pid`."""
+        occ = self.occurrences.get(pid)
+        if occ is None:
+            occ = self.occurrences[pid] = []
+            value = self.registry.pattern(pid)
+            for table, sub in zip(self._tables, self._substrings(value)):
+                table.setdefault(sub, []).append(pid)
+        occ.append((sub_id, round_counter))
+
+    def add_pattern(self, pattern: int, sub_id: str, round_counter: int) -> int:
+        """Interns a packed pattern in the registry and indexes it. Returns its id."""
+        pid = self.registry.intern(pattern)
+        self.add(pid, sub_id, round_counter)
+        return pid
+
+    def search(self, pattern: int, k: int) -> List[Tuple[int, int]]:
+        """
+        Returns (pid, distance) for every indexed pattern within Hamming
+        distance `k` of `pattern`, closest first.
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        radius = k // len(self._blocks)
+        candidates = set()
+
+        for table, sub, (_, width) in zip(self._tables, self._substrings(pattern), self._blocks):
+            for r in range(min(radius, width) + 1):
+                for bits in combinations(range(width), r):
+                    probe = sub
+                    for b in bits:
+                        probe ^= 1 << b
+                    candidates.update(table.get(probe, ()))
+
+        matches = []
+        for pid in candidates:
+            d = hamming(pattern, self.registry.pattern(pid))
+            if d <= k:
+                matches.append((pid, d))
+        matches.sort(key=lambda m: (m[1], m[0]))
+        return matches
+
+
+def build_index_from_files(sensor_dir, blocks: int = 8) -> PatternIndex:
+    """Indexes every valid line (round = valid line number) of all sensor files in `sensor_dir`."""
+    from src.core.sensor_manager import SensorManager
+
+    index = PatternIndex(blocks=blocks)
+    sensors = SensorManager()
+    for file_path in sorted(sensor_dir.glob("*.txt")):
+        for round_counter, pattern in enumerate(sensors._sensor_line_generator(file_path), start=1):
+            index.add_pattern(pack_pattern(pattern), file_path.stem, round_counter)
+    return index
+
+
+def main(argv=None) -> int:
+    from src.config import paths
+
+    parser = argparse.ArgumentParser(
+        description="Find sensor patterns within k bit flips across all subs and rounds."
+    )
+    parser.add_argument("query", help="208-bit pattern, or SUB_ID:ROUND to use that reading")
+    parser.add_argument("-k", type=int, default=3, help="max Hamming distance (default 3)")
+    parser.add_argument("--blocks", type=int, default=8, help="number of MIH blocks")
+    parser.add_argument("--limit", type=int, default=20, help="max patterns to print")
+    args = parser.parse_args(argv)
+
+    index = build_index_from_files(paths.SENSOR_DATA_DIR, blocks=args.blocks)
+
+    if ":" in args.query:
+        sub_id, round_str = args.query.rsplit(":", 1)
+        target = next(
+            (pid for pid, occ in index.occurrences.items()
+             if (sub_id, int(round_str)) in occ),
+            None,
+        )
+        if target is None:
+            print(f"No reading for {sub_id} in round {round_str}")
+            return 1
+        query = index.registry.pattern(target)
+    else:
+        query = pack_pattern(args.query)
+
+    matches = index.search(query, args.k)
+    print(f"{len(matches)} patterns within {args.k} bit flips ({len(index)} indexed)")
+    for pid, dist in matches[:args.limit]:
+        occ = index.occurrences[pid]
+        subs = sorted({s for s, _ in occ})
+        print(f"d={dist} seen {len(occ)}x by {len(subs)} subs, first {occ[0][0]}@{occ[0][1]}")
+        print(f"   {unpack_pattern(index.registry.pattern(pid), index.n_bits)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
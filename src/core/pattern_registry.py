@@ -0,0 +1,54 @@
+from collections import Counter
+from typing import Dict, Hashable, List, Set, Tuple
+
+
+class PatternRegistry:
+    """
+    Gemensam mönstertabell för hela flottan.
+    Varje unikt mönster lagras en gång och får ett heltals-id;
+    statistiken per sub sparar bara id:n.
+    """
+
+    def __init__(self):
+        self._ids: Dict[Hashable, int] = {}         # pattern -> id
+        self._patterns: List[Hashable] = []          # id -> pattern
+        self.fleet_counts: Counter = Counter()       # id -> antal över hela flottan
+        self.seen_by: Dict[int, Set[str]] = {}       # id -> sub_ids som sett mönstret
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def __contains__(self, pattern) -> bool:
+        return pattern in self._ids
+
+    def intern(self, pattern) -> int:
+        """Id för `pattern`; registreras första gången mönstret ses."""
+        pid = self._ids.get(pattern)
+        if pid is None:
+            pid = len(self._patterns)
+            self._ids[pattern] = pid
+            self._patterns.append(pattern)
+            self.seen_by[pid] = set()
+        return pid
+
+    def pattern(self, pid: int):
+        """Mönstret som lagrats under `pid`."""
+        return self._patterns[pid]
+
+    def record(self, sub_id: str, pattern) -> int:
+        """Registrerar att `sub_id` sett `pattern` en gång och returnerar id:t."""
+        pid = self.intern(pattern)
+        self.fleet_counts[pid] += 1
+        self.seen_by[pid].add(sub_id)
+        return pid
+
+    def subs_with(self, pattern) -> Set[str]:
+        """Vilka ubåtar som rapporterat `pattern`."""
+        pid = self._ids.get(pattern)
+        if pid is None:
+            return set()
+        return set(self.seen_by[pid])
+
+    def most_common(self, n: int = 1) -> List[Tuple[object, int]]:
+        """De `n` vanligaste mönstren i flottan som (mönster, antal)."""
+        return [(self._patterns[pid], c) for pid, c in self.fleet_counts.most_common(n)]
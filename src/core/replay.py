@@ -0,0 +1,331 @@
+import bisect
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple, Union
+
+from src.core.fleet_snapshot import FleetSnapshot, SubmarineState
+from src.core.tick_scheduler import TickScheduler
+from src.utils.logger import movement_logger
+
+MAGIC = b"UBRPLAY1"
+INDEX_MAGIC = b"UBIX"
+DEFAULT_KEYFRAME_INTERVAL = 256  # rundor mellan nyckelbilder
+
+_HEADER = struct.Struct("<II")       # keyframe-intervall, antal subs
+_RECORD = struct.Struct("<cII")      # typ, runda, längd på innehållet
+_DELTA = struct.Struct("<II")        # antal drag, antal kollisioner
+_TRAILER = struct.Struct("<Q4s")     # indexets offset, INDEX_MAGIC
+
+_DELTA_TAG = b"D"
+_KEYFRAME_TAG = b"K"
+_INDEX_TAG = b"X"
+
+
+def _pack_collisions(collisions, index) -> bytes:
+    subs, coords = array("I"), array("q")
+    for _, (x, y), a, b in collisions:
+        subs.extend((index[a], index[b]))
+        coords.extend((x, y))
+    return subs.tobytes() + coords.tobytes()
+
+
+def _unpack_collisions(data: bytes, count: int, round_numbers, ids) -> List[Tuple[int, Tuple[int, int], str, str]]:
+    subs, coords = array("I"), array("q")
+    subs.frombytes(data[:8 * count])
+    coords.frombytes(data[8 * count:24 * count])
+    return [
+        (round_numbers[i], (coords[2 * i], coords[2 * i + 1]), ids[subs[2 * i]], ids[subs[2 * i + 1]])
+        for i in range(count)
+    ]
+
+
+class ReplayRecorder:
+    """
+    Records a simulation as a compact binary stream for ReplayPlayer.
+
+    Attached as a MovementManager observer, it writes one delta record per
+    round: the subs that moved (fleet index plus dx/dy as 32-bit ints) and
+    the round's collisions. Every `keyframe_interval` rounds it also writes a
+    keyframe with the full fleet state and every collision so far, so a
+    player can seek without replaying from the start. close() appends the
+    keyframe index; a file without one (crashed run) is indexed by scanning.
+    """
+
+    def __init__(self, path: Union[str, Path], keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be >= 1")
+        self.path = Path(path)
+        self.keyframe_interval = keyframe_interval
+        self._file: Optional[BinaryIO] = None
+        self._index = {}
+        self._keyframes: List[Tuple[int, int]] = []  # (runda, offset)
+        self._seen_collisions = 0
+
+    def attach(self, manager) -> None:
+        """Writes the header and a keyframe of the current state, then records every round."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+        ids = list(manager.submarines)
+        self._index = {sub_id: i for i, sub_id in enumerate(ids)}
+        self._file.write(MAGIC + _HEADER.pack(self.keyframe_interval, len(ids)))
+        for sub_id in ids:
+            raw = sub_id.encode("utf-8")
+            self._file.write(struct.pack("<H", len(raw)) + raw)
+        self._seen_collisions = len(manager.collisions)
+        self._write_keyframe(manager, manager.snapshot.round_number)
+        manager.add_observer(self)
+
+    def _write(self, tag: bytes, round_number: int, payload: bytes) -> None:
+        self._file.write(_RECORD.pack(tag, round_number, len(payload)))
+        self._file.write(payload)
+
+    def _write_keyframe(self, manager, round_number: int) -> None:
+        subs = manager.submarines.values()
+        xs = array("q", [s._x for s in subs])
+        ys = array("q", [s._y for s in subs])
+        collisions = manager.collisions
+        rounds = array("I", [c[0] for c in collisions])
+        payload = (
+            struct.pack("<I", len(collisions)) + xs.tobytes() + ys.tobytes()
+            + bytes(s._active for s in subs) + rounds.tobytes() + _pack_collisions(collisions, self._index)
+        )
+        self._keyframes.append((round_number, self._file.tell()))
+        self._write(_KEYFRAME_TAG, round_number, payload)
+
+    def on_round(self, manager, round_counter: int) -> None:
+        """MovementManager observer: writes the round's delta (and a keyframe when due)."""
+        moved, dx, dy = array("I"), array("i"), array("i")
+        for sub, (px, py) in manager.round_moves:
+            moved.append(self._index[sub.id])
+            dx.append(sub._x - px)
+            dy.append(sub._y - py)
+        collisions = manager.collisions[self._seen_collisions:]
+        self._seen_collisions = len(manager.collisions)
+        payload = (
+            _DELTA.pack(len(moved), len(collisions)) + moved.tobytes() + dx.tobytes() + dy.tobytes()
+            + _pack_collisions(collisions, self._index)
+        )
+        self._write(_DELTA_TAG, round_counter, payload)
+        if round_counter % self.keyframe_interval == 0:
+            self._write_keyframe(manager, round_counter)
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        offset = self._file.tell()
+        rounds = array("I", [r for r, _ in self._keyframes])
+        offsets = array("Q", [o for _, o in self._keyframes])
+        self._write(_INDEX_TAG, len(self._keyframes), rounds.tobytes() + offsets.tobytes())
+        self._file.write(_TRAILER.pack(offset, INDEX_MAGIC))
+        self._file.close()
+        self._file = None
+        movement_logger.info(f"Replay written to {self.path} ({len(self._keyframes)} keyframes)")
+
+
+class ReplayPlayer:
+    """
+    Plays back a recording made by ReplayRecorder.
+
+    Exposes the same read-side attributes as MovementManager - `snapshot`,
+    `collisions`, `round_moves` and `observers` with on_round(player, round) -
+    so the GUI and existing observers (e.g. TrafficHeatmap) work unchanged.
+    seek() jumps to the nearest keyframe at or before the target round and
+    applies the deltas from there; play() steps forward at a given speed.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{self.path}: not a replay file")
+        self.keyframe_interval, count = _HEADER.unpack(self._file.read(_HEADER.size))
+        ids = []
+        for _ in range(count):
+            (length,) = struct.unpack("<H", self._file.read(2))
+            ids.append(self._file.read(length).decode("utf-8"))
+        self.ids: Tuple[str, ...] = tuple(ids)
+        self._id_index = {sub_id: i for i, sub_id in enumerate(ids)}
+        self._data_start = self._file.tell()
+        self._keyframe_rounds, self._keyframe_offsets, self.last_round = self._load_index()
+
+        self.observers = []
+        self.round_number = -1
+        self.round_moves: List[Tuple[SubmarineState, Tuple[int, int]]] = []
+        self.collisions: List[Tuple[int, Tuple[int, int], str, str]] = []
+        self.snapshot = FleetSnapshot.empty()
+        self._stopped = False
+        self.seek(self._keyframe_rounds[0])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def add_observer(self, observer) -> None:
+        self.observers.append(observer)
+
+    # --- index ---
+
+    def _records(self, offset: int):
+        """(tag, round, payload offset, payload length) from `offset` until the index or end of file."""
+        f = self._file
+        f.seek(offset)
+        while True:
+            head = f.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return
+            tag, round_number, length = _RECORD.unpack(head)
+            if tag == _INDEX_TAG:
+                return
+            start = f.tell()
+            if start + length > self._size:
+                return  # avbruten skrivning
+            yield tag, round_number, start, length
+            f.seek(start + length)
+
+    def _load_index(self):
+        f = self._file
+        self._size = os.fstat(f.fileno()).st_size
+        rounds, offsets = array("I"), array("Q")
+        if self._size >= _TRAILER.size:
+            f.seek(self._size - _TRAILER.size)
+            index_offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic == INDEX_MAGIC:
+                f.seek(index_offset)
+                _, count, _ = _RECORD.unpack(f.read(_RECORD.size))
+                rounds.frombytes(f.read(4 * count))
+                offsets.frombytes(f.read(8 * count))
+                # sista rundan: sista posten före indexet
+                last = rounds[-1]
+                for _, round_number, _, _ in self._records(offsets[-1]):
+                    last = round_number
+                return rounds, offsets, last
+
+        # inget index (inspelningen avbröts): bygg det genom att läsa igenom filen
+        last = 0
+        for tag, round_number, start, _ in self._records(self._data_start):
+            if tag == _KEYFRAME_TAG:
+                rounds.append(round_number)
+                offsets.append(start - _RECORD.size)
+            last = round_number
+        if not rounds:
+            raise ValueError(f"{self.path}: no keyframes")
+        return rounds, offsets, last
+
+    @property
+    def keyframes(self) -> List[int]:
+        return list(self._keyframe_rounds)
+
+    # --- uppspelning ---
+
+    def _load_keyframe(self, offset: int) -> int:
+        f = self._file
+        f.seek(offset)
+        _, round_number, _ = _RECORD.unpack(f.read(_RECORD.size))
+        n = len(self.ids)
+        (count,) = struct.unpack("<I", f.read(4))
+        self._xs = array("q")
+        self._xs.frombytes(f.read(8 * n))
+        self._ys = array("q")
+        self._ys.frombytes(f.read(8 * n))
+        self._active = bytearray(f.read(n))
+        rounds = array("I")
+        rounds.frombytes(f.read(4 * count))
+        self.collisions = _unpack_collisions(f.read(24 * count), count, rounds, self.ids)
+        self._next_offset = f.tell()
+        self.round_number = round_number
+        self.round_moves = []
+        return round_number
+
+    def _apply_delta(self, round_number: int, payload: bytes, track_moves: bool = True) -> None:
+        moved_count, collision_count = _DELTA.unpack_from(payload)
+        pos = _DELTA.size
+        moved, dx, dy = array("I"), array("i"), array("i")
+        moved.frombytes(payload[pos:pos + 4 * moved_count])
+        pos += 4 * moved_count
+        dx.frombytes(payload[pos:pos + 4 * moved_count])
+        pos += 4 * moved_count
+        dy.frombytes(payload[pos:pos + 4 * moved_count])
+        pos += 4 * moved_count
+
+        xs, ys, ids = self._xs, self._ys, self.ids
+        prevs = [(xs[i], ys[i]) for i in moved] if track_moves else None
+        for i, ddx, ddy in zip(moved, dx, dy):
+            xs[i] += ddx
+            ys[i] += ddy
+        new = _unpack_collisions(payload[pos:], collision_count, [round_number] * collision_count, ids)
+        for _, _, a, b in new:
+            self._active[self._id_index[a]] = 0
+            self._active[self._id_index[b]] = 0
+        self.collisions.extend(new)
+        # observers (t.ex. TrafficHeatmap) läser round_moves som hos MovementManager; behövs inte vid seek
+        self.round_moves = [
+            (SubmarineState(ids[i], (xs[i], ys[i]), bool(self._active[i])), prev) for i, prev in zip(moved, prevs)
+        ] if track_moves else []
+        self.round_number = round_number
+
+    def step(self, track_moves: bool = True) -> Optional[int]:
+        """Advances one round. Returns the round number, or None at the end of the recording."""
+        for tag, round_number, start, length in self._records(self._next_offset):
+            self._next_offset = start + length
+            if tag != _DELTA_TAG:
+                continue  # nyckelbilder behövs bara vid seek
+            self._file.seek(start)
+            self._apply_delta(round_number, self._file.read(length), track_moves)
+            return round_number
+        return None
+
+    def capture(self) -> FleetSnapshot:
+        """Immutable snapshot of the current round (same type the GUI reads from MovementManager)."""
+        return FleetSnapshot(
+            self.round_number, self.ids, array("q", self._xs), array("q", self._ys),
+            bytes(self._active), len(self.collisions), self._id_index,
+        )
+
+    def seek(self, round_number: int) -> FleetSnapshot:
+        """Jumps to `round_number` (clamped to the recording) and publishes its snapshot."""
+        round_number = max(self._keyframe_rounds[0], min(round_number, self.last_round))
+        k = bisect.bisect_right(self._keyframe_rounds, round_number) - 1
+        self._load_keyframe(self._keyframe_offsets[k])
+        while self.round_number < round_number and self.step(track_moves=False) is not None:
+            pass
+        self.snapshot = self.capture()
+        return self.snapshot
+
+    def play(self, start: Optional[int] = None, end: Optional[int] = None,
+             speed: Optional[float] = None, publish: bool = True) -> int:
+        """
+        Plays rounds until `end` (or the end of the recording) at `speed`
+        rounds per second (None = as fast as possible), calling every
+        observer's on_round(player, round). With `publish` a new snapshot is
+        published each round, like MovementManager. Returns rounds played.
+        """
+        if start is not None:
+            self.seek(start)
+        self._stopped = False
+        played = 0
+        ticks = TickScheduler(1 / speed) if speed else None
+        if ticks is not None:
+            ticks.start()
+        while not self._stopped and (end is None or self.round_number < end):
+            round_number = self.step()
+            if round_number is None:
+                break
+            played += 1
+            if publish:
+                self.snapshot = self.capture()
+            for observer in self.observers:
+                observer.on_round(self, round_number)
+            if ticks is not None:
+                ticks.wait()
+        return played
+
+    def stop(self) -> None:
+        """Makes a running play() return after the current round (safe from another thread)."""
+        self._stopped = True
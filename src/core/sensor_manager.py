@@ -1,66 +1,115 @@
+import threading
 from collections import Counter
-import hashlib
 from pathlib import Path
 from src.utils.logger import sensor_logger
-from src.config.paths import SENSOR_DATA_DIR, LOG_DIR
-
-PATTERN_LEN = 208
+from src.core.pattern_registry import PatternRegistry
+from src.core.pattern_index import PatternIndex
+from src.config import paths
+from src.utils.bitpack import PATTERN_LEN, pack_pattern, unpack_pattern, popcount
+from src.data.sensor_cache import SensorCache
+from src.data.reader_pool import ReaderPool
+from src.data.prefetcher import Prefetcher
 
 class SensorManager:
     """Stegvis analys av sensordata: en rad per runda."""
 
-    def __init__(self, movement_manager=None):
+    def __init__(self, movement_manager=None, cache: SensorCache = None, pool: ReaderPool = None,
+                 prefetcher: Prefetcher = None):
         self.movement_manager = movement_manager
+        self.cache = cache if cache is not None else SensorCache()
+        if pool is None:
+            # dela filpoolen med rörelseläsaren så att taket gäller hela flottan
+            pool = getattr(getattr(movement_manager, "file_reader", None), "pool", None)
+            if not isinstance(pool, ReaderPool):
+                pool = ReaderPool()
+        self.pool = pool
+        if prefetcher is None:
+            prefetcher = getattr(movement_manager, "prefetcher", None)
+        self.prefetcher = prefetcher if isinstance(prefetcher, Prefetcher) else None
         self.generators: dict[str, iter] = {}
-        self.pattern_counts: dict[str, Counter] = {}    # sub_id -> Counter över mönster-hash
-        self.pattern_examples: dict[str, dict] = {}     # sub_id -> {hash: exempelsträng}
+        self.patterns = PatternRegistry()               # delad tabell: packat mönster -> id
+        self.pattern_index = PatternIndex(self.patterns)  # Hamming-sökning över (sub, runda)
+        self.pattern_counts: dict[str, Counter] = {}    # sub_id -> Counter över mönster-id
+        self.error_totals: Counter = Counter()          # sub_id -> summa sensorfel (0:or)
+        # statistiken skrivs av simuleringstråden; GUI-tråden läser under samma lås
+        self.lock = threading.Lock()
 
     def _sensor_line_generator(self, file_path: Path):
         """Ger giltiga rader (208 tecken av 0/1) från en sensorfil."""
-        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-            for line in f:
-                s = line.strip()
-                if len(s) == PATTERN_LEN and not (set(s) - {"0","1"}):
-                    yield s
+        for line in self.pool.lines(file_path, errors="replace"):
+            s = line.strip()
+            if len(s) == PATTERN_LEN and not (set(s) - {"0","1"}):
+                yield s
+
+    def _packed_generator(self, sub_id: str, file_path: Path):
+        """Ger packade avläsningar (int) via binärcachen, med textfilen som reserv."""
+        try:
+            self.cache.ensure(sub_id, file_path)
+        except OSError as e:
+            sensor_logger.warning(f"{sub_id}: sensor cache unavailable ({e}), reading text file")
+            return (pack_pattern(s) for s in self._sensor_line_generator(file_path))
+        return self.cache.iter_packed(sub_id, file_path, pool=self.pool)
 
     def attach_generators(self, submarines):
         """Initiera sensor-generators för alla subs."""
-        for sub in submarines:
-            file_path = SENSOR_DATA_DIR / f"{sub.id}.txt"
+        self.attach_ids(sub.id for sub in submarines)
+
+    def attach_ids(self, sub_ids):
+        """Som attach_generators, men med bara id:n (t.ex. i en arbetsprocess utan Submarine-objekt)."""
+        for sub_id in sub_ids:
+            file_path = paths.sensor_file_path(sub_id)
             if not file_path.exists():
-                sensor_logger.warning(f"No sensor file for {sub.id}")
+                sensor_logger.warning(f"No sensor file for {sub_id}")
                 continue
-            self.generators[sub.id] = self._sensor_line_generator(file_path)
-            self.pattern_counts[sub.id] = Counter()
-            self.pattern_examples[sub.id] = {}
+            gen = self._packed_generator(sub_id, file_path)
+            if self.prefetcher is not None:
+                gen = self.prefetcher.wrap(gen)
+            self.generators[sub_id] = gen
+            self.pattern_counts[sub_id] = Counter()
 
     def process_next_round(self, round_counter: int, only_active=True):
-        """Läs nästa rad för varje sub och logga antalet fel + uppdatera mönsterstatistik."""
+        """Läs nästa (packade) avläsning för varje sub och logga antalet fel + uppdatera mönsterstatistik."""
         subs = (
             self.movement_manager.active_subs
             if only_active else self.movement_manager.submarines.values()
         )
+        self.process_ids(round_counter, [sub.id for sub in subs])
 
-        for sub in subs:
-            gen = self.generators.get(sub.id)
+    def process_ids(self, round_counter: int, sub_ids):
+        """Bearbetar en runda för de givna sub-id:na (i den ordningen)."""
+        for sub_id in sub_ids:
+            gen = self.generators.get(sub_id)
             if not gen:
                 continue
 
             try:
-                new_pattern = next(gen)
+                packed = next(gen)
             except StopIteration:
-                sensor_logger.info(f"{sub.id}: no more sensor data")
+                sensor_logger.info(f"{sub_id}: no more sensor data")
                 continue
 
             # 1. Antal fel (0:or)
-            zero_count = new_pattern.count("0")
-            sensor_logger.info(f"{sub.id}: {zero_count} sensor errors this round")
+            zero_count = PATTERN_LEN - popcount(packed)
+            sensor_logger.info(f"{sub_id}: {zero_count} sensor errors this round")
+
+            with self.lock:
+                self.error_totals[sub_id] += zero_count
+
+                # 2. Mönsterstatistik
+                pid = self.patterns.record(sub_id, packed)
+                self.pattern_counts[sub_id][pid] += 1
+                self.pattern_index.add(pid, sub_id, round_counter)
 
-            # 2. Mönsterstatistik
-            h = hashlib.sha1(new_pattern.encode("ascii")).hexdigest()
-            self.pattern_counts[sub.id][h] += 1
-            if h not in self.pattern_examples[sub.id]:
-                self.pattern_examples[sub.id][h] = new_pattern
+    def pattern_string(self, pid: int) -> str:
+        """Mönstret med registrets id `pid` som sträng av 0/1."""
+        return unpack_pattern(self.patterns.pattern(pid))
+
+    def find_similar(self, pattern: str, k: int):
+        """Mönster inom `k` bitflippar från `pattern`: (mönster, avstånd, [(sub_id, runda)])."""
+        return [
+            (self.pattern_string(pid), dist, self.pattern_index.occurrences[pid])
+            for pid, dist in self.pattern_index.search(pack_pattern(pattern), k)
+        ]
 
     def final_summary(self):
         """Summera sensordata efter simuleringen och logga till sensor_logger."""
@@ -70,10 +119,36 @@ class SensorManager:
             unique = len(self.pattern_counts.get(sub_id, {}))
             top5 = self.pattern_counts[sub_id].most_common(5)
             examples = [
-                (self.pattern_examples[sub_id][h], c) for h, c in top5
+                (self.pattern_string(pid), c) for pid, c in top5
             ]
 
             sensor_logger.info(
                 f"{sub_id}: unique_patterns={unique}, top={examples}"
             )
-                
+
+        if self.patterns.fleet_counts:
+            top_pattern, top_count = self.patterns.most_common(1)[0]
+            sensor_logger.info(
+                f"Fleet: unique_patterns={len(self.patterns)}, "
+                f"most_common={unpack_pattern(top_pattern)} ({top_count}x, "
+                f"{len(self.patterns.subs_with(top_pattern))} subs)"
+            )
+
+    def summary(self) -> dict:
+        """Sammanfattning som dict: avläsningar, fel och unika mönster per sub och för flottan."""
+        per_sub = {
+            sub_id: {
+                "readings": sum(counts.values()),
+                "sensor_errors": self.error_totals[sub_id],
+                "unique_patterns": len(counts),
+            }
+            for sub_id, counts in self.pattern_counts.items()
+        }
+        top = self.patterns.most_common(1)
+        return {
+            "readings": sum(s["readings"] for s in per_sub.values()),
+            "sensor_errors": sum(self.error_totals.values()),
+            "unique_patterns": len(self.patterns),
+            "most_common_count": top[0][1] if top else 0,
+            "subs": per_sub,
+        }
@@ -0,0 +1,174 @@
+import multiprocessing
+import struct
+from typing import Dict, List, Optional, Sequence
+
+from src.config import paths
+from src.utils.logger import sensor_logger
+
+DEFAULT_DEPTH = 16  # rundor som får ligga i kö innan rörelsesteget väntar
+
+_HEADER = struct.Struct("<q")  # rundnummer per plats, -1 = slut
+_STOP = -1
+_POLL = 0.5    # sekunder mellan livstecken-kontroller när ringen är full
+
+
+class ActiveChannel:
+    """
+    Fixed ring of `depth` slots in shared memory, one slot per round:
+    the round number followed by a bitmap of active subs (bit i = the i:th
+    sub in fleet order). Two semaphores count free and filled slots, so
+    there is exactly one producer and one consumer and no locking otherwise.
+    Only this bitmap crosses the process boundary - a few bytes per round.
+    """
+
+    def __init__(self, fleet_size: int, depth: int = DEFAULT_DEPTH, ctx=None):
+        if depth < 1:
+            raise ValueError("depth must be >= 1")
+        ctx = ctx if ctx is not None else multiprocessing.get_context()
+        self.fleet_size = fleet_size
+        self.depth = depth
+        self.slot_size = _HEADER.size + (fleet_size + 7) // 8
+        self.buffer = ctx.RawArray("B", depth * self.slot_size)
+        self.free = ctx.Semaphore(depth)
+        self.filled = ctx.Semaphore(0)
+        self._write = 0  # nästa plats för producenten
+        self._read = 0   # nästa plats för konsumenten
+
+    def __getstate__(self):
+        # följer med till arbetsprocessen när den startas; platsräknarna börjar om på 0
+        state = self.__dict__.copy()
+        state["_write"] = state["_read"] = 0
+        return state
+
+    def put(self, round_number: int, active: Sequence[int], timeout: Optional[float] = None) -> bool:
+        """
+        Writes the indices of active subs for a round. Blocks while the ring
+        is full; returns False if no slot freed up within `timeout`.
+        """
+        bitmap = bytearray(self.slot_size - _HEADER.size)
+        for i in active:
+            bitmap[i >> 3] |= 1 << (i & 7)
+        if not self.free.acquire(timeout=timeout):
+            return False
+        offset = self._write * self.slot_size
+        view = memoryview(self.buffer).cast("B")
+        _HEADER.pack_into(view, offset, round_number)
+        view[offset + _HEADER.size:offset + self.slot_size] = bitmap
+        self._write = (self._write + 1) % self.depth
+        self.filled.release()
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Tells the consumer that no more rounds follow (False on timeout, like put)."""
+        if not self.free.acquire(timeout=timeout):
+            return False
+        _HEADER.pack_into(memoryview(self.buffer).cast("B"), self._write * self.slot_size, _STOP)
+        self._write = (self._write + 1) % self.depth
+        self.filled.release()
+        return True
+
+    def get(self):
+        """Next (round, [active indices]), or None after close()."""
+        self.filled.acquire()
+        offset = self._read * self.slot_size
+        view = memoryview(self.buffer).cast("B")
+        (round_number,) = _HEADER.unpack_from(view, offset)
+        bitmap = bytes(view[offset + _HEADER.size:offset + self.slot_size])
+        self._read = (self._read + 1) % self.depth
+        self.free.release()
+        if round_number == _STOP:
+            return None
+        active = [
+            (byte_index << 3) + bit
+            for byte_index, byte in enumerate(bitmap) if byte
+            for bit in range(8) if byte >> bit & 1
+        ]
+        return round_number, active
+
+
+def _sensor_worker(sub_ids: List[str], files_dir: str, channel: ActiveChannel, conn) -> None:
+    """Arbetsprocess: kör SensorManager runda för runda utifrån kanalens aktiva subs."""
+    paths.set_files_dir(files_dir)
+    from src.core.sensor_manager import SensorManager
+
+    sensors = SensorManager()
+    sensors.attach_ids(sub_ids)
+    while True:
+        item = channel.get()
+        if item is None:
+            break
+        round_number, active = item
+        sensors.process_ids(round_number, [sub_ids[i] for i in active])
+    sensors.final_summary()
+    conn.send(sensors.summary())
+    conn.close()
+
+
+class PipelinedSensorManager:
+    """
+    Drop-in for SensorManager in MovementManager.step_round that runs the
+    sensor stage in a separate process.
+
+    process_next_round only hands the round's active sub ids to the worker
+    over an ActiveChannel and returns at once, so the main process moves the
+    fleet for round R+1 while the worker processes round R's readings. The
+    worker sees exactly the ids SensorManager would have seen, in fleet
+    order, so the statistics are identical; only the sensor log lines are
+    written from the worker. The results (summary()) are available after
+    final_summary() or close().
+    """
+
+    def __init__(self, movement_manager, depth: int = DEFAULT_DEPTH, files_dir: Optional[str] = None,
+                 start_method: Optional[str] = "spawn"):
+        self.movement_manager = movement_manager
+        self.sub_ids: List[str] = list(movement_manager.submarines)
+        self._index: Dict[str, int] = {sub_id: i for i, sub_id in enumerate(self.sub_ids)}
+        # spawn: arbetsprocessen ärver inga trådar (t.ex. Prefetcher) från huvudprocessen
+        ctx = multiprocessing.get_context(start_method)
+        if files_dir is None:
+            files_dir = str(paths.SENSOR_DATA_DIR.parent)  # samma datarot som huvudprocessen
+        self.channel = ActiveChannel(len(self.sub_ids), depth, ctx)
+        self._conn, child_conn = ctx.Pipe(duplex=False)
+        self.process = ctx.Process(
+            target=_sensor_worker,
+            args=(self.sub_ids, files_dir, self.channel, child_conn),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self._summary: Optional[dict] = None
+        sensor_logger.info(f"Sensor pipeline started (pid {self.process.pid}, {len(self.sub_ids)} subs, depth {depth})")
+
+    def process_next_round(self, round_counter: int, only_active=True):
+        subs = (
+            self.movement_manager.active_subs
+            if only_active else self.movement_manager.submarines.values()
+        )
+        active = [self._index[sub.id] for sub in subs if sub.id in self._index]
+        self._send(lambda: self.channel.put(round_counter, active, timeout=_POLL))
+
+    def _send(self, put) -> None:
+        # vänta på en ledig plats, men häng inte om arbetsprocessen har dött
+        while not put():
+            if not self.process.is_alive():
+                raise RuntimeError(f"sensor worker exited with code {self.process.exitcode}")
+
+    def close(self) -> dict:
+        """Waits for the worker to finish every queued round and returns its summary()."""
+        if self._summary is None:
+            self._send(lambda: self.channel.close(timeout=_POLL))
+            try:
+                self._summary = self._conn.recv()
+            except EOFError:
+                raise RuntimeError(f"sensor worker exited with code {self.process.exitcode}") from None
+            finally:
+                self._conn.close()
+                self.process.join()
+        return self._summary
+
+    def final_summary(self):
+        """The worker logs the final summary itself when the pipeline is closed."""
+        self.close()
+
+    def summary(self) -> dict:
+        return self.close()
@@ -0,0 +1,100 @@
+import math
+import time
+from array import array
+from typing import Callable, NamedTuple, Optional
+
+MAX_SAMPLES = 10_000  # senaste tickintervall som sparas för percentiler
+
+
+class TickStats(NamedTuple):
+    ticks: int
+    target_rate: float      # ticks/s
+    achieved_rate: float    # ticks/s sedan start
+    overruns: int           # ticks där arbetet tog längre än perioden
+    max_overrun: float      # s
+    jitter_p50: float       # |intervall - period| i s
+    jitter_p95: float
+    jitter_p99: float
+
+    def describe(self) -> str:
+        return (
+            f"{self.ticks} ticks at {self.achieved_rate:.2f}/s (target {self.target_rate:.2f}/s), "
+            f"{self.overruns} overruns (max {self.max_overrun * 1000:.1f} ms), jitter "
+            f"p50 {self.jitter_p50 * 1000:.2f} ms, p95 {self.jitter_p95 * 1000:.2f} ms, "
+            f"p99 {self.jitter_p99 * 1000:.2f} ms"
+        )
+
+
+def _percentile(sorted_values, q: float) -> float:
+    """Nearest-rank percentile."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+class TickScheduler:
+    """
+    Fixed-rate ticks against absolute time.monotonic deadlines.
+
+    `wait` is called when a tick's work is done and sleeps only for what is
+    left of the period, so the tick period stays `period` regardless of how
+    long the work took and errors do not accumulate. A tick whose work ran
+    past its deadline is counted as an overrun; the schedule then restarts
+    from now instead of firing a burst of catch-up ticks.
+    """
+
+    def __init__(self, period: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if period <= 0:
+            raise ValueError("period must be > 0")
+        self.period = period
+        self._clock = clock
+        self._sleep = sleep
+        self.ticks = 0
+        self.overruns = 0
+        self.max_overrun = 0.0
+        self._started: Optional[float] = None
+        self._deadline: Optional[float] = None
+        self._last: Optional[float] = None
+        self._jitter = array("d")
+
+    def start(self) -> None:
+        """Starts the schedule: the first tick ends one period from now."""
+        now = self._clock()
+        self._started = self._last = now
+        self._deadline = now + self.period
+
+    def wait(self) -> None:
+        """Ends the current tick: sleeps until its deadline (or records an overrun)."""
+        if self._deadline is None:
+            self.start()
+        now = self._clock()
+        remaining = self._deadline - now
+        if remaining > 0:
+            self._sleep(remaining)
+            self._deadline += self.period
+        else:
+            self.overruns += 1
+            self.max_overrun = max(self.max_overrun, -remaining)
+            self._deadline = now + self.period
+
+        end = self._clock()
+        if len(self._jitter) >= MAX_SAMPLES:
+            del self._jitter[:MAX_SAMPLES // 2]
+        self._jitter.append(abs(end - self._last - self.period))
+        self._last = end
+        self.ticks += 1
+
+    def stats(self) -> TickStats:
+        elapsed = (self._last - self._started) if self._started is not None else 0.0
+        jitter = sorted(self._jitter)
+        return TickStats(
+            ticks=self.ticks,
+            target_rate=1 / self.period,
+            achieved_rate=self.ticks / elapsed if elapsed > 0 else 0.0,
+            overruns=self.overruns,
+            max_overrun=self.max_overrun,
+            jitter_p50=_percentile(jitter, 0.50),
+            jitter_p95=_percentile(jitter, 0.95),
+            jitter_p99=_percentile(jitter, 0.99),
+        )
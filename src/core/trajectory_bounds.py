@@ -0,0 +1,143 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.data.file_reader import FileReader
+from src.utils.logger import collision_logger, file_logger
+
+DEFAULT_WINDOW = 256  # rundor per tidsfönster
+
+Box = Tuple[int, int, int, int]  # min_x, min_y, max_x, max_y
+
+
+def _isolated(boxes: List[Tuple[Box, str]]) -> Set[str]:
+    """Sweep-and-prune on x: returns the ids whose box overlaps no other box."""
+    boxes = sorted(boxes)
+    touched: Set[str] = set()
+    open_boxes: List[Tuple[Box, str]] = []
+    for box, sub_id in boxes:
+        min_x, min_y, _, max_y = box
+        open_boxes = [entry for entry in open_boxes if entry[0][2] >= min_x]
+        for (_, o_min_y, _, o_max_y), other in open_boxes:
+            if o_min_y <= max_y and min_y <= o_max_y:
+                touched.add(sub_id)
+                touched.add(other)
+        open_boxes.append((box, sub_id))
+    return {sub_id for _, sub_id in boxes} - touched
+
+
+class TrajectoryBounds:
+    """
+    Precomputed bounding boxes of each submarine's trajectory, overall and
+    per window of `window` rounds.
+
+    A box covers every position the sub can occupy in the collision check of
+    a round in the window, including the round in which it runs out of moves.
+    Two subs whose boxes do not overlap cannot meet in that window, so subs
+    whose box overlaps nobody's are reported as isolated and MovementManager
+    leaves them out of the collision dict.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self.boxes: Dict[str, array] = {}   # sub_id -> 4 värden per fönster
+        self.overall: Dict[str, Box] = {}
+        self._overall_isolated: Optional[Set[str]] = None
+        self._cached_window: Optional[int] = None
+        self._cached_isolated: Set[str] = set()
+
+    def __contains__(self, sub_id: str) -> bool:
+        return sub_id in self.boxes
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def add(self, sub_id: str, moves: Iterable[Tuple[str, int]], start: Tuple[int, int] = (0, 0)) -> None:
+        """Replays `moves` from `start` and records the boxes of its trajectory."""
+        x, y = start
+        boxes = array("q")
+        box: Optional[List[int]] = None
+        round_number = 0
+
+        def visit(px, py):
+            nonlocal box
+            if (round_number - 1) % self.window == 0:
+                if box is not None:
+                    boxes.extend(box)
+                box = [px, py, px, py]
+            else:
+                box[0], box[1] = min(box[0], px), min(box[1], py)
+                box[2], box[3] = max(box[2], px), max(box[3], py)
+
+        for direction, distance in moves:
+            round_number += 1
+            if direction == "forward":
+                x += distance
+            elif direction == "down":
+                y += distance
+            elif direction == "up":
+                y -= distance
+            visit(x, y)
+        # rundan då generatorn tar slut står suben kvar och deltar i kollisionskollen
+        round_number += 1
+        visit(x, y)
+        boxes.extend(box)
+
+        self.boxes[sub_id] = boxes
+        self.overall[sub_id] = (
+            min(boxes[0::4]), min(boxes[1::4]), max(boxes[2::4]), max(boxes[3::4])
+        )
+        self._overall_isolated = None
+        self._cached_window = None
+
+    def box(self, sub_id: str, round_number: int) -> Optional[Box]:
+        """The sub's box for the window containing `round_number`, or None if it is not present then."""
+        boxes = self.boxes.get(sub_id)
+        i = 4 * ((round_number - 1) // self.window)
+        if boxes is None or i >= len(boxes):
+            return None
+        return boxes[i], boxes[i + 1], boxes[i + 2], boxes[i + 3]
+
+    def isolated(self, round_number: int) -> Set[str]:
+        """Ids of subs that provably cannot collide in the window containing `round_number`."""
+        w = (round_number - 1) // self.window
+        if w == self._cached_window:
+            return self._cached_isolated
+
+        if self._overall_isolated is None:
+            self._overall_isolated = _isolated([(box, sub_id) for sub_id, box in self.overall.items()])
+        overall_isolated = self._overall_isolated
+
+        i = 4 * w
+        window_boxes = []
+        present_isolated = set()
+        for sub_id, boxes in self.boxes.items():
+            if i >= len(boxes):
+                continue
+            if sub_id in overall_isolated:
+                present_isolated.add(sub_id)
+            else:
+                window_boxes.append(((boxes[i], boxes[i + 1], boxes[i + 2], boxes[i + 3]), sub_id))
+
+        self._cached_isolated = present_isolated | _isolated(window_boxes)
+        self._cached_window = w
+        collision_logger.debug(
+            f"Window {w}: {len(self._cached_isolated)} isolated subs, "
+            f"{len(window_boxes) + len(present_isolated) - len(self._cached_isolated)} collision candidates"
+        )
+        return self._cached_isolated
+
+
+def build_bounds(sub_ids: Iterable[str], window: int = DEFAULT_WINDOW,
+                 reader: Optional[FileReader] = None, max_lines: int = 10_000) -> TrajectoryBounds:
+    """Precomputes TrajectoryBounds from the subs' movement files (same parsing as the simulation)."""
+    reader = reader if reader is not None else FileReader()
+    bounds = TrajectoryBounds(window)
+    for sub_id in sub_ids:
+        try:
+            bounds.add(sub_id, reader.load_movements(sub_id, max_lines=max_lines))
+        except FileNotFoundError:
+            continue  # utan bana → alltid kandidat
+    file_logger.info(f"Trajectory bounds precomputed for {len(bounds)} subs (window {window})")
+    return bounds
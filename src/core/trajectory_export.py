@@ -0,0 +1,90 @@
+import json
+from array import array
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+from src.utils.logger import movement_logger
+from src.utils.npy import DTYPES, NpyAppender, load_npy, save_npy_strings
+
+DEFAULT_CHUNK_ROWS = 1 << 18  # rader i minnet innan de skrivs till disk
+
+# kolumn -> array-typkod
+COLUMNS = {"round": "I", "sub": "I", "x": "q", "y": "q", "active": "B"}
+
+
+class TrajectoryExporter:
+    """
+    Streams per-round fleet state to a directory of columnar .npy files.
+
+    Every exported round adds one row per sub: round, sub (index into the
+    dictionary-encoded id table ids.npy), x, y and active. Rows are taken
+    straight from the published FleetSnapshot arrays and buffered up to
+    `chunk_rows`, then appended to one NpyAppender per column, so memory
+    stays bounded and each column file is a valid array after every chunk.
+    Downstream tools can np.load(..., mmap_mode="r") a run instead of
+    parsing logs. `every` exports only every n:th round.
+    """
+
+    def __init__(self, out_dir: Union[str, Path], every: int = 1, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        if every < 1:
+            raise ValueError("every must be >= 1")
+        self.out_dir = Path(out_dir)
+        self.every = every
+        self.chunk_rows = chunk_rows
+        self.rounds = 0
+        self._writers: Dict[str, NpyAppender] = {}
+        self._buffers: Dict[str, array] = {}
+        self._sub_index = array("I")
+
+    def attach(self, manager) -> None:
+        """Writes the id table and the starting state, then exports after every round."""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        snapshot = manager.snapshot
+        save_npy_strings(self.out_dir / "ids.npy", snapshot.ids)
+        self._sub_index = array("I", range(len(snapshot.ids)))
+        for name, typecode in COLUMNS.items():
+            self._writers[name] = NpyAppender(self.out_dir / f"{name}.npy", typecode)
+            self._buffers[name] = array(typecode)
+        self.add(snapshot)
+        manager.add_observer(self)
+
+    def add(self, snapshot) -> None:
+        """Buffers one row per sub from `snapshot`."""
+        n = len(snapshot.ids)
+        buffers = self._buffers
+        buffers["round"].extend(array("I", [snapshot.round_number]) * n)
+        buffers["sub"].extend(self._sub_index)
+        buffers["x"].extend(snapshot.xs)
+        buffers["y"].extend(snapshot.ys)
+        buffers["active"].frombytes(snapshot.active)
+        self.rounds += 1
+        if len(buffers["round"]) >= self.chunk_rows:
+            self.flush()
+
+    def on_round(self, manager, round_counter: int) -> None:
+        """MovementManager observer: exports the snapshot published for this round."""
+        if round_counter % self.every == 0:
+            self.add(manager.snapshot)
+
+    def flush(self) -> None:
+        for name, buffer in self._buffers.items():
+            if buffer:
+                self._writers[name].append(buffer)
+                self._buffers[name] = array(buffer.typecode)
+
+    def close(self) -> None:
+        self.flush()
+        rows = self._writers["round"].length if self._writers else 0
+        for writer in self._writers.values():
+            writer.close()
+        with open(self.out_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({"rows": rows, "rounds": self.rounds, "every": self.every,
+                       "columns": {name: DTYPES[tc] for name, tc in COLUMNS.items()}}, f, indent=1)
+        movement_logger.info(f"Exported {rows} rows ({self.rounds} rounds) to {self.out_dir}")
+
+
+def load_export(out_dir: Union[str, Path]) -> Tuple[List[str], Dict[str, array]]:
+    """Reads an export without NumPy: (id table, {column: array})."""
+    out_dir = Path(out_dir)
+    ids, _ = load_npy(out_dir / "ids.npy")
+    return ids, {name: load_npy(out_dir / f"{name}.npy")[0] for name in COLUMNS}
@@ -0,0 +1,208 @@
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Set, Tuple, Union
+
+from src.config import paths
+from src.utils.logger import collision_logger
+
+COLLISION = "collision"
+DESTROYED = "destroyed"
+RUNOUT = "runout"
+KINDS = (COLLISION, DESTROYED, RUNOUT)
+
+DEFAULT_BATCH_ROUNDS = 256  # rundor per transaktion
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id  INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    label   TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    run_id   INTEGER NOT NULL,
+    round    INTEGER NOT NULL,
+    kind     TEXT NOT NULL,
+    sub_id   TEXT NOT NULL,
+    other_id TEXT,
+    x        INTEGER NOT NULL,
+    y        INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_round ON events (run_id, round);
+CREATE INDEX IF NOT EXISTS events_sub ON events (sub_id, round);
+CREATE INDEX IF NOT EXISTS events_other ON events (other_id, round);
+CREATE INDEX IF NOT EXISTS events_xy ON events (run_id, x, y);
+"""
+
+Box = Tuple[int, int, int, int]  # min_x, min_y, max_x, max_y
+
+
+class Event(NamedTuple):
+    run_id: int
+    round: int
+    kind: str
+    sub_id: str
+    other_id: Optional[str]
+    x: int
+    y: int
+
+
+class EventStore:
+    """
+    Append-only SQLite store of simulation events: collisions (one row per
+    pair), destructions (one row per destroyed sub) and run-outs (a sub
+    whose movement file ended). Every run gets its own run_id.
+
+    Attached to a MovementManager as an observer, it picks up the round's
+    new entries in `manager.collisions` and the subs that ran out of moves,
+    and writes them in one transaction every `batch_rounds` rounds (and
+    when the simulation can no longer move). Indexes on round, sub id and
+    position back the query methods and the CLI.
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, batch_rounds: int = DEFAULT_BATCH_ROUNDS):
+        self.db_path = Path(db_path if db_path is not None else paths.EVENT_STORE_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)  # GUI:t kör simuleringen i en tråd
+        self.conn.executescript(_SCHEMA)
+        self.batch_rounds = batch_rounds
+        self.run_id: Optional[int] = None
+        self._pending: List[tuple] = []
+        self._pending_rounds = 0
+        self._seen_collisions = 0
+        self._moving: Set = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- skrivning ---
+
+    def begin_run(self, label: Optional[str] = None) -> int:
+        with self.conn:
+            cur = self.conn.execute("INSERT INTO runs (started, label) VALUES (?, ?)", (time.time(), label))
+        self.run_id = cur.lastrowid
+        return self.run_id
+
+    def attach(self, manager, label: Optional[str] = None) -> int:
+        """Starts a new run and records `manager`'s events after every round."""
+        run_id = self.begin_run(label)
+        self._seen_collisions = len(manager.collisions)
+        self._moving = {sub for sub in manager.submarines.values() if sub.is_active and sub._gen is not None}
+        manager.add_observer(self)
+        return run_id
+
+    def add(self, round_number: int, kind: str, sub_id: str, other_id: Optional[str], pos: Tuple[int, int]) -> None:
+        """Buffers one event; it is written with the next flush()."""
+        if self.run_id is None:
+            self.begin_run()
+        self._pending.append((self.run_id, round_number, kind, sub_id, other_id, pos[0], pos[1]))
+
+    def on_round(self, manager, round_counter: int) -> None:
+        """MovementManager observer: buffers the round's collisions, destructions and run-outs."""
+        new = manager.collisions[self._seen_collisions:]
+        self._seen_collisions = len(manager.collisions)
+        for r, pos, a, b in new:
+            self.add(r, COLLISION, a, b, pos)
+            self.add(r, DESTROYED, a, b, pos)
+            self.add(r, DESTROYED, b, a, pos)
+
+        # subs som körde sitt sista drag denna runda (förstörda subs tar aldrig slut)
+        moved = {sub for sub, _ in manager.round_moves}
+        for sub in self._moving - moved:
+            if sub._gen is None:
+                self.add(round_counter, RUNOUT, sub.id, None, sub.position)
+        self._moving = {sub for sub in moved if sub.is_active}
+
+        self._pending_rounds += 1
+        if self._pending_rounds >= self.batch_rounds or not self._moving:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            with self.conn:
+                self.conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", self._pending)
+            collision_logger.debug(f"Event store: wrote {len(self._pending)} events (run {self.run_id})")
+        self._pending = []
+        self._pending_rounds = 0
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+    # --- frågor ---
+
+    def runs(self) -> List[Tuple[int, float, Optional[str]]]:
+        return self.conn.execute("SELECT run_id, started, label FROM runs ORDER BY run_id").fetchall()
+
+    def latest_run(self) -> Optional[int]:
+        return self.conn.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+
+    def query(self, kind: Optional[str] = None, sub_id: Optional[str] = None,
+              rounds: Optional[Tuple[int, int]] = None, box: Optional[Box] = None,
+              run_id: Optional[int] = None) -> List[Event]:
+        """
+        Events matching every given filter, in round order: `rounds` is an
+        inclusive (first, last) range, `box` an inclusive (min_x, min_y,
+        max_x, max_y) region and `sub_id` matches either side of a pair.
+        `run_id` defaults to the latest run.
+        """
+        run_id = run_id if run_id is not None else self.latest_run()
+        where, args = ["run_id = ?"], [run_id]
+        if kind is not None:
+            where.append("kind = ?")
+            args.append(kind)
+        if sub_id is not None:
+            where.append("(sub_id = ? OR other_id = ?)")
+            args += [sub_id, sub_id]
+        if rounds is not None:
+            where.append("round BETWEEN ? AND ?")
+            args += list(rounds)
+        if box is not None:
+            where.append("x BETWEEN ? AND ? AND y BETWEEN ? AND ?")
+            args += [box[0], box[2], box[1], box[3]]
+        sql = f"SELECT * FROM events WHERE {' AND '.join(where)} ORDER BY round, rowid"
+        return [Event(*row) for row in self.conn.execute(sql, args)]
+
+    def collided_with(self, sub_id: str, run_id: Optional[int] = None) -> List[Tuple[int, str, Tuple[int, int]]]:
+        """(round, other sub, position) for every collision `sub_id` took part in."""
+        return [
+            (e.round, e.other_id if e.sub_id == sub_id else e.sub_id, (e.x, e.y))
+            for e in self.query(COLLISION, sub_id=sub_id, run_id=run_id)
+        ]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Query recorded collisions, destructions and run-outs.")
+    parser.add_argument("--db", default=None, help="event store (default: files/events.sqlite)")
+    parser.add_argument("--run", type=int, default=None, help="run id (default: latest)")
+    parser.add_argument("--kind", choices=KINDS, default=None)
+    parser.add_argument("--sub", default=None, help="sub id (either side of a collision)")
+    parser.add_argument("--rounds", type=int, nargs=2, metavar=("FIRST", "LAST"), default=None)
+    parser.add_argument("--box", type=int, nargs=4, metavar=("MIN_X", "MIN_Y", "MAX_X", "MAX_Y"), default=None)
+    parser.add_argument("--runs", action="store_true", help="list recorded runs")
+    args = parser.parse_args(argv)
+
+    db = Path(args.db) if args.db else paths.EVENT_STORE_PATH
+    if not db.exists():
+        print(f"No event store at {db}")
+        return 1
+    with EventStore(db) as store:
+        if args.runs:
+            for run_id, started, label in store.runs():
+                print(f"{run_id}\t{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started))}\t{label or ''}")
+            return 0
+        events = store.query(args.kind, args.sub, args.rounds, args.box, args.run)
+        for e in events:
+            other = f" with {e.other_id}" if e.other_id else ""
+            print(f"Round {e.round}: {e.kind} {e.sub_id}{other} at ({e.x}, {e.y})")
+        print(f"{len(events)} events")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
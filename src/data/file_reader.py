@@ -1,29 +1,62 @@
 import os
 from pathlib import Path
-from typing import Generator, Tuple, Union
+from typing import Generator, Optional, Tuple, Union
 from src.config import paths
+from src.data.fleet_manifest import FleetManifest, load_manifest
+from src.data.line_index import LineIndex
+from src.data.reader_pool import ReaderPool
+from src.utils.bitpack import PATTERN_LEN
 from src.utils.logger import file_logger, sensor_file_logger, log_calls
 
+MAX_MOVEMENT_LINES = 10_000
+
+
+def _movement_line(line: bytes) -> Optional[bool]:
+    """LineIndex-filter med samma regler som load_movements: stopp på tom rad, hoppa över ogiltiga."""
+    parts = line.decode("utf-8", errors="replace").split()
+    if not parts:
+        return None
+    if len(parts) != 2:
+        return False
+    try:
+        int(parts[1])
+    except ValueError:
+        return False
+    return True
+
+
+def _sensor_line(line: bytes) -> bool:
+    """LineIndex-filter med samma regler som sensorgeneratorn: 208 tecken av 0/1."""
+    s = line.strip()
+    return len(s) == PATTERN_LEN and not s.translate(None, b"01")
+
 
 class FileReader:
     """Synchronous version: yields movements from file line by line."""
 
+    def __init__(self, line_index: Optional[LineIndex] = None, manifest: Optional[FleetManifest] = None,
+                 pool: Optional[ReaderPool] = None):
+        self.line_index = line_index if line_index is not None else LineIndex()
+        self.manifest = manifest
+        # alla generatorer delar en begränsad mängd öppna filer
+        self.pool = pool if pool is not None else ReaderPool()
+
     @log_calls(file_logger, "movement_files")
     def load_all_movement_files(self) -> Generator[Tuple[str, Generator[Tuple[str, int], None, None]], None, None]:
         """
         Generates a tuple for each movement file found.
         Each tuple contains the drone's ID and its movement generator.
+        The drone list comes from the fleet manifest, not a directory scan.
         """
-        try:
-            for file_path in paths.MOVEMENT_REPORTS_DIR.glob("*.txt"):
-                drone_id = file_path.stem
-                yield (drone_id, self.load_movements(drone_id))
-        except FileNotFoundError:
-            file_logger.error("MovementReports directory not found")
-            raise
+        if self.manifest is None:
+            self.manifest = load_manifest()
+        else:
+            self.manifest.refresh()
+        for drone_id in self.manifest.drone_ids():
+            yield (drone_id, self.load_movements(drone_id))
 
     @log_calls(file_logger, "movement_files", context_args=["drone_id"])
-    def load_movements(self, drone_id: str, max_lines: int = 10_000):
+    def load_movements(self, drone_id: str, max_lines: int = MAX_MOVEMENT_LINES):
         """
         Loads movement commands for a specific drone.
         Läser högst `max_lines` rader. Stoppar även på första tomma raden.
@@ -34,40 +67,39 @@ class FileReader:
             raise FileNotFoundError(file_path)
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                count = 0
-                for i, line in enumerate(f, start=1):
-                    if count >= max_lines:
-                        file_logger.warning(
-                            f"[{drone_id}] Movement file {file_path} has more than {max_lines} lines → extra lines ignored"
-                        )
-                        break
+            count = 0
+            for i, line in enumerate(self.pool.lines(file_path), start=1):
+                if count >= max_lines:
+                    file_logger.warning(
+                        f"[{drone_id}] Movement file {file_path} has more than {max_lines} lines → extra lines ignored"
+                    )
+                    break
 
-                    stripped = line.strip()
-                    if not stripped:   # stoppa på första tomma rad
-                        file_logger.info(
-                            f"[{drone_id}] Empty line at line {i}, stopping read"
-                        )
-                        break
-
-                    parts = stripped.split()
-                    if len(parts) == 2:
-                        direction = parts[0]
-                        try:
-                            distance = int(parts[1])
-                        except ValueError:
-                            file_logger.error(
-                                f"[{drone_id}] Invalid distance at line {i}: {parts[1]}"
-                            )
-                            continue
-
-                        count += 1
-                        file_logger.debug(
-                            f"[{drone_id}] Loaded move {count}: {direction} {distance}"
+                stripped = line.strip()
+                if not stripped:   # stoppa på första tomma rad
+                    file_logger.info(
+                        f"[{drone_id}] Empty line at line {i}, stopping read"
+                    )
+                    break
+
+                parts = stripped.split()
+                if len(parts) == 2:
+                    direction = parts[0]
+                    try:
+                        distance = int(parts[1])
+                    except ValueError:
+                        file_logger.error(
+                            f"[{drone_id}] Invalid distance at line {i}: {parts[1]}"
                         )
-                        yield (direction, distance)
+                        continue
+
+                    count += 1
+                    file_logger.debug(
+                        f"[{drone_id}] Loaded move {count}: {direction} {distance}"
+                    )
+                    yield (direction, distance)
 
-                file_logger.info(f"[{drone_id}] Total moves loaded: {count}")
+            file_logger.info(f"[{drone_id}] Total moves loaded: {count}")
 
         except Exception as e:
             file_logger.error(f"Failed to load movements for {drone_id}: {e}")
@@ -94,9 +126,37 @@ class FileReader:
             raise FileNotFoundError()
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    yield line.strip()
+            for line in self.pool.lines(file_path):
+                yield line.strip()
         except ValueError as e:
             sensor_file_logger.error(f"Invalid data in sensor file {file_path}: {e}")
             raise
+
+    def read_movement(self, drone_id: str, round_number: int) -> Optional[Tuple[str, int]]:
+        """
+        Random access: returns the move the drone makes in round
+        `round_number` (1-based) - the same move load_movements yields at
+        that position - or None if the drone has no move that round.
+        """
+        file_path = paths.movement_file_path(drone_id)
+        if not os.path.exists(file_path):
+            file_logger.error(f"Movement file not found: {file_path}")
+            raise FileNotFoundError(file_path)
+        if round_number > MAX_MOVEMENT_LINES:
+            return None
+
+        line = self.line_index.read_line(file_path, round_number, "moves", _movement_line)
+        if line is None:
+            return None
+        direction, distance = line.split()
+        return (direction, int(distance))
+
+    def read_sensor(self, drone_id: str, round_number: int) -> Optional[str]:
+        """Random access: returns the drone's valid sensor reading for round `round_number` (1-based)."""
+        file_path = paths.sensor_file_path(drone_id)
+        if not os.path.exists(file_path):
+            sensor_file_logger.error(f"Sensor file not found: {file_path}")
+            raise FileNotFoundError(file_path)
+
+        line = self.line_index.read_line(file_path, round_number, "readings", _sensor_line)
+        return line.strip() if line is not None else None
@@ -0,0 +1,235 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+from src.config import paths
+from src.utils.logger import file_logger
+from src.utils.validators import Validator
+
+MANIFEST_VERSION = 1
+_CHUNK = 1 << 20
+
+
+class DroneEntry(NamedTuple):
+    id: str
+    movement_size: int
+    movement_mtime_ns: int
+    movement_lines: int
+    sensor_size: Optional[int]      # None = ingen sensorfil
+    sensor_mtime_ns: Optional[int]
+    sensor_lines: Optional[int]
+    valid_serial: bool
+
+    @property
+    def has_sensor(self) -> bool:
+        return self.sensor_size is not None
+
+
+def count_lines(path: Union[str, Path]) -> int:
+    """Number of lines in a file (a last line without newline counts too)."""
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_CHUNK)
+            if not chunk:
+                break
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    return lines + (last != b"\n")
+
+
+class FleetManifest:
+    """
+    Persisted index of every drone: movement file size/mtime/line count,
+    sensor file presence/line count and whether the serial is valid.
+
+    `refresh` only lists a directory when its mtime changed (files were added
+    or removed) and only re-counts lines for files whose size or mtime
+    changed, so startup does not rescan tens of thousands of files.
+    """
+
+    def __init__(self, manifest_path: Optional[Union[str, Path]] = None,
+                 movement_dir: Optional[Union[str, Path]] = None,
+                 sensor_dir: Optional[Union[str, Path]] = None):
+        self.manifest_path = Path(manifest_path if manifest_path is not None else paths.FLEET_MANIFEST_PATH)
+        self.movement_dir = Path(movement_dir if movement_dir is not None else paths.MOVEMENT_REPORTS_DIR)
+        self.sensor_dir = Path(sensor_dir if sensor_dir is not None else paths.SENSOR_DATA_DIR)
+        self.entries: Dict[str, DroneEntry] = {}
+        self._dir_mtimes: Dict[str, Optional[int]] = {"movement": None, "sensor": None}
+        self._sensor_ids: set = set()
+        self.dirty = False
+
+    # --- persistens ---
+
+    def load(self) -> bool:
+        """Reads the manifest from disk. Returns False if it is missing, stale or for other directories."""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            file_logger.warning(f"Fleet manifest {self.manifest_path} unreadable, rebuilding: {e}")
+            return False
+
+        if (data.get("version") != MANIFEST_VERSION
+                or data.get("movement_dir") != str(self.movement_dir)
+                or data.get("sensor_dir") != str(self.sensor_dir)):
+            return False
+
+        self._dir_mtimes = {"movement": data.get("movement_dir_mtime_ns"),
+                            "sensor": data.get("sensor_dir_mtime_ns")}
+        self.entries = {row[0]: DroneEntry(*row) for row in data["drones"]}
+        self._sensor_ids = {e.id for e in self.entries.values() if e.has_sensor}
+        self._sensor_ids.update(data.get("orphan_sensors", []))
+        return True
+
+    def save(self) -> None:
+        """Writes the manifest atomically (temp file + rename)."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "movement_dir": str(self.movement_dir),
+            "sensor_dir": str(self.sensor_dir),
+            "movement_dir_mtime_ns": self._dir_mtimes["movement"],
+            "sensor_dir_mtime_ns": self._dir_mtimes["sensor"],
+            "orphan_sensors": sorted(self._sensor_ids - self.entries.keys()),
+            "drones": [list(entry) for entry in self.entries.values()],
+        }
+        tmp = self.manifest_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, self.manifest_path)
+        self.dirty = False
+
+    # --- uppdatering ---
+
+    @staticmethod
+    def _dir_mtime(directory: Path) -> Optional[int]:
+        try:
+            return os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _list_ids(directory: Path) -> set:
+        try:
+            with os.scandir(directory) as it:
+                return {e.name[:-4] for e in it if e.name.endswith(".txt") and e.is_file()}
+        except FileNotFoundError:
+            return set()
+
+    @staticmethod
+    def _stat(path: Path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def refresh(self) -> bool:
+        """Brings the manifest up to date with the directories. Returns True if anything changed."""
+        movement_mtime = self._dir_mtime(self.movement_dir)
+        sensor_mtime = self._dir_mtime(self.sensor_dir)
+
+        # katalogerna listas bara om filer har lagts till/tagits bort
+        if movement_mtime != self._dir_mtimes["movement"] or not self.entries:
+            movement_ids = self._list_ids(self.movement_dir)
+        else:
+            movement_ids = set(self.entries)
+        if sensor_mtime != self._dir_mtimes["sensor"]:
+            self._sensor_ids = self._list_ids(self.sensor_dir)
+
+        changed = False
+        for drone_id in list(self.entries):
+            if drone_id not in movement_ids:
+                del self.entries[drone_id]
+                changed = True
+
+        for drone_id in movement_ids:
+            entry = self._refresh_entry(drone_id, self.entries.get(drone_id))
+            if entry is None:
+                changed |= self.entries.pop(drone_id, None) is not None
+            elif entry is not self.entries.get(drone_id):
+                self.entries[drone_id] = entry
+                changed = True
+
+        changed |= self._dir_mtimes != {"movement": movement_mtime, "sensor": sensor_mtime}
+        self._dir_mtimes = {"movement": movement_mtime, "sensor": sensor_mtime}
+        if changed:
+            self.dirty = True
+            file_logger.info(f"Fleet manifest refreshed: {len(self.entries)} drones")
+        return changed
+
+    def _refresh_entry(self, drone_id: str, old: Optional[DroneEntry]) -> Optional[DroneEntry]:
+        """Stat:ar en drönares filer; räknar bara om rader för filer som ändrats."""
+        movement_path = self.movement_dir / f"{drone_id}.txt"
+        movement_stat = self._stat(movement_path)
+        if movement_stat is None:
+            return None
+
+        sensor_path = self.sensor_dir / f"{drone_id}.txt"
+        sensor_stat = self._stat(sensor_path) if drone_id in self._sensor_ids else None
+
+        if old is not None:
+            same_movement = (old.movement_size, old.movement_mtime_ns) == movement_stat
+            same_sensor = (old.sensor_size, old.sensor_mtime_ns) == (sensor_stat or (None, None))
+            if same_movement and same_sensor:
+                return old
+        else:
+            same_movement = same_sensor = False
+
+        movement_lines = old.movement_lines if same_movement else count_lines(movement_path)
+        if sensor_stat is None:
+            sensor_lines = None
+        else:
+            sensor_lines = old.sensor_lines if same_sensor else count_lines(sensor_path)
+
+        return DroneEntry(
+            drone_id,
+            movement_stat[0], movement_stat[1], movement_lines,
+            *(sensor_stat or (None, None)), sensor_lines,
+            Validator.validate_serial_number(drone_id),
+        )
+
+    # --- frågor ---
+
+    def drone_ids(self, valid_only: bool = False) -> List[str]:
+        """All drone ids in sorted order (optionally only those with a valid serial)."""
+        return sorted(e.id for e in self.entries.values() if e.valid_serial or not valid_only)
+
+    def get(self, drone_id: str) -> Optional[DroneEntry]:
+        return self.entries.get(drone_id)
+
+    def summary(self) -> Dict[str, int]:
+        entries = self.entries.values()
+        return {
+            "drones": len(self.entries),
+            "movement_lines": sum(e.movement_lines for e in entries),  # fysiska rader, inte validerade drag
+            "movement_bytes": sum(e.movement_size for e in entries),
+            "with_sensor": sum(e.has_sensor for e in entries),
+            "invalid_serials": sum(not e.valid_serial for e in entries),
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, drone_id: str) -> bool:
+        return drone_id in self.entries
+
+    def __iter__(self) -> Iterator[DroneEntry]:
+        return iter(self.entries.values())
+
+
+def load_manifest(manifest_path: Optional[Union[str, Path]] = None) -> FleetManifest:
+    """Loads the persisted manifest, refreshes it against the directories and saves it if it changed."""
+    manifest = FleetManifest(manifest_path)
+    manifest.load()
+    if manifest.refresh():
+        try:
+            manifest.save()
+        except OSError as e:
+            file_logger.warning(f"Could not save fleet manifest {manifest.manifest_path}: {e}")
+    return manifest
@@ -0,0 +1,151 @@
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from src.config import paths
+from src.utils.logger import file_logger
+
+MAGIC = b"LIX1"
+HEADER = struct.Struct("<4sqqQ")  # magic, source mtime_ns, source size, line count
+CHUNK_SIZE = 1 << 20
+
+# rad (bytes) -> True (ta med), False (hoppa över) eller None (sluta läsa)
+LineFilter = Callable[[bytes], Optional[bool]]
+
+
+class LineIndex:
+    """
+    Sidecar index of line start offsets for movement and sensor files.
+
+    The offsets are built once in a streaming pass, stored next to the other
+    caches and reused as long as the source file's mtime and size match,
+    so line N can be read with a single seek instead of a scan from line 1.
+
+    A named `keep` filter indexes only the lines a reader would actually
+    yield (and stops where the reader stops), so entry N is the N:th
+    record rather than the N:th physical line. Each filter kind has its
+    own sidecar file.
+    """
+
+    def __init__(self, index_dir: Optional[Union[str, Path]] = None):
+        self.index_dir = Path(index_dir) if index_dir is not None else None
+        # (source, kind) -> (mtime_ns, size, offsets)
+        self._loaded: Dict[Tuple[Path, Optional[str]], Tuple[int, int, array]] = {}
+
+    def index_path(self, source: Union[str, Path], kind: Optional[str] = None) -> Path:
+        """MovementReports/X.txt -> LineIndex/MovementReports/X.idx (X.<kind>.idx for a filtered index)"""
+        source = Path(source)
+        base = self.index_dir if self.index_dir is not None else paths.LINE_INDEX_DIR
+        suffix = f".{kind}.idx" if kind else ".idx"
+        return base / source.parent.name / f"{source.stem}{suffix}"
+
+    @staticmethod
+    def scan(source: Union[str, Path]) -> array:
+        """Streams `source` once and returns the start offset of every line."""
+        offsets = array("Q")
+        pos = 0
+        with open(source, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if pos == 0:
+                    offsets.append(0)
+                i = chunk.find(b"\n")
+                while i != -1:
+                    offsets.append(pos + i + 1)
+                    i = chunk.find(b"\n", i + 1)
+                pos += len(chunk)
+        # sista offset pekar på filslutet om filen slutar med radbrytning
+        if offsets and offsets[-1] == pos:
+            offsets.pop()
+        return offsets
+
+    @staticmethod
+    def scan_filtered(source: Union[str, Path], keep: LineFilter) -> array:
+        """Streams `source` once and returns the start offset of every line `keep` accepts."""
+        offsets = array("Q")
+        pos = 0
+        with open(source, "rb", buffering=CHUNK_SIZE) as f:
+            for line in f:
+                verdict = keep(line)
+                if verdict is None:
+                    break
+                if verdict:
+                    offsets.append(pos)
+                pos += len(line)
+        return offsets
+
+    def _read_index_file(self, index_file: Path, st: os.stat_result) -> Optional[array]:
+        try:
+            with open(index_file, "rb") as f:
+                raw = f.read(HEADER.size)
+                if len(raw) != HEADER.size:
+                    return None
+                magic, mtime_ns, size, count = HEADER.unpack(raw)
+                if magic != MAGIC or mtime_ns != st.st_mtime_ns or size != st.st_size:
+                    return None
+                offsets = array("Q")
+                offsets.fromfile(f, count)
+                return offsets
+        except (OSError, EOFError):
+            return None
+
+    def build(self, source: Union[str, Path], kind: Optional[str] = None,
+              keep: Optional[LineFilter] = None) -> array:
+        """(Re)builds and stores the index for `source` (only lines `keep` accepts, if given)."""
+        source = Path(source)
+        st = os.stat(source)
+        offsets = self.scan_filtered(source, keep) if keep is not None else self.scan(source)
+        index_file = self.index_path(source, kind)
+        try:
+            index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = index_file.with_suffix(".tmp")
+            with open(tmp_file, "wb") as f:
+                f.write(HEADER.pack(MAGIC, st.st_mtime_ns, st.st_size, len(offsets)))
+                offsets.tofile(f)
+            os.replace(tmp_file, index_file)
+        except OSError as e:
+            file_logger.warning(f"Could not store line index for {source}: {e}")
+        file_logger.info(f"Indexed {len(offsets)} lines of {source}" + (f" ({kind})" if kind else ""))
+        self._loaded[(source, kind)] = (st.st_mtime_ns, st.st_size, offsets)
+        return offsets
+
+    def offsets(self, source: Union[str, Path], kind: Optional[str] = None,
+                keep: Optional[LineFilter] = None) -> array:
+        """
+        Returns the line offsets for `source`, loading or building the index
+        as needed. `kind` names the sidecar of a `keep`-filtered index.
+        """
+        if (kind is None) != (keep is None):
+            raise ValueError("kind and keep must be given together")
+        source = Path(source)
+        st = os.stat(source)
+        cached = self._loaded.get((source, kind))
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
+        offsets = self._read_index_file(self.index_path(source, kind), st)
+        if offsets is None:
+            return self.build(source, kind, keep)
+        self._loaded[(source, kind)] = (st.st_mtime_ns, st.st_size, offsets)
+        return offsets
+
+    def line_count(self, source: Union[str, Path], kind: Optional[str] = None,
+                   keep: Optional[LineFilter] = None) -> int:
+        return len(self.offsets(source, kind, keep))
+
+    def read_line(self, source: Union[str, Path], line_no: int, kind: Optional[str] = None,
+                  keep: Optional[LineFilter] = None) -> Optional[str]:
+        """
+        Returns line `line_no` (1-based, newline stripped) or None if out of
+        range. With `kind`/`keep`, `line_no` counts only the accepted lines.
+        """
+        offsets = self.offsets(source, kind, keep)
+        if not 1 <= line_no <= len(offsets):
+            return None
+        with open(source, "rb") as f:
+            f.seek(offsets[line_no - 1])
+            return f.readline().decode("utf-8", errors="replace").rstrip("\r\n")
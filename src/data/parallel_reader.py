@@ -0,0 +1,223 @@
+import concurrent.futures
+import os
+from array import array
+from pathlib import Path
+from typing import Generator, List, NamedTuple, Optional, Tuple, Union
+
+from src.config import paths
+from src.utils.bitpack import PACKED_LEN, PATTERN_LEN
+from src.utils.logger import file_logger, sensor_file_logger
+
+DIRECTIONS = ("up", "down", "forward")
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+MIN_CHUNK_BYTES = 1 << 20  # mindre filer parsas i samma process
+
+
+class MovementArrays(NamedTuple):
+    codes: array          # 'I': index i directions
+    distances: array      # 'q'
+    line_numbers: array   # 'Q': global radnummer för varje giltigt drag
+    invalid: List[Tuple[int, str, str]]  # (radnummer, rad, orsak)
+    directions: Tuple[str, ...] = DIRECTIONS  # DIRECTIONS + okända riktningar i filen
+
+    def __len__(self):
+        return len(self.codes)
+
+    def iter_moves(self) -> Generator[Tuple[str, int], None, None]:
+        """Same (direction, distance) stream as FileReader.load_movements."""
+        directions = self.directions
+        for code, distance in zip(self.codes, self.distances):
+            yield (directions[code], distance)
+
+
+class SensorArrays(NamedTuple):
+    packed: bytes         # PACKED_LEN bytes per avläsning, big-endian
+    line_numbers: array   # 'Q'
+    invalid: List[Tuple[int, str, str]]
+
+    def __len__(self):
+        return len(self.line_numbers)
+
+    def iter_packed(self) -> Generator[int, None, None]:
+        for i in range(0, len(self.packed), PACKED_LEN):
+            yield int.from_bytes(self.packed[i:i + PACKED_LEN], "big")
+
+
+def split_ranges(file_path: Union[str, Path], parts: int,
+                 min_chunk: int = MIN_CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """Splits a file into at most `parts` byte ranges that each start at a line start."""
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return []
+    parts = max(1, min(parts, size // max(min_chunk, 1)))
+    bounds = [0]
+    with open(file_path, "rb") as f:
+        for i in range(1, parts):
+            f.seek(max(size * i // parts - 1, bounds[-1]))
+            f.readline()  # flytta fram till nästa radbörjan
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _read_lines(file_path, start: int, end: int) -> List[bytes]:
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    lines = data.split(b"\n")
+    if data.endswith(b"\n"):
+        lines.pop()
+    return lines
+
+
+def _parse_movement_range(file_path, start: int, end: int):
+    """
+    Worker: parses one byte range into arrays with chunk-local line numbers.
+    Directions are not validated (FileReader yields them as-is); codes index
+    DIRECTIONS followed by the chunk's own unknown directions.
+    """
+    codes, distances, line_numbers = array("I"), array("q"), array("Q")
+    directions = dict(DIRECTION_CODES)
+    invalid = []
+    empty_at = None
+    lines = _read_lines(file_path, start, end)
+
+    for i, raw in enumerate(lines, start=1):
+        stripped = raw.decode("utf-8", errors="replace").strip()
+        if not stripped:
+            empty_at = i
+            break
+        parts = stripped.split()
+        if len(parts) != 2:
+            invalid.append((i, stripped, "expected '<direction> <distance>'"))
+            continue
+        try:
+            distance = int(parts[1])
+        except ValueError:
+            invalid.append((i, stripped, f"invalid distance {parts[1]}"))
+            continue
+        codes.append(directions.setdefault(parts[0], len(directions)))
+        distances.append(distance)
+        line_numbers.append(i)
+
+    return codes, distances, line_numbers, tuple(directions), invalid, empty_at, len(lines)
+
+
+def _parse_sensor_range(file_path, start: int, end: int):
+    """Worker: validates and packs one byte range of a sensor file."""
+    packed, line_numbers = bytearray(), array("Q")
+    invalid = []
+    valid_chars = {"0", "1"}
+    lines = _read_lines(file_path, start, end)
+
+    for i, raw in enumerate(lines, start=1):
+        s = raw.decode("utf-8", errors="replace").strip()
+        if not s:
+            continue
+        if len(s) != PATTERN_LEN or set(s) - valid_chars:
+            invalid.append((i, s[:40], "not a 208-bit 0/1 pattern"))
+            continue
+        packed += int(s, 2).to_bytes(PACKED_LEN, "big")
+        line_numbers.append(i)
+
+    return bytes(packed), line_numbers, invalid, None, len(lines)
+
+
+class ParallelFileReader:
+    """
+    Parses a single large movement or sensor file on several cores.
+
+    The file is split into newline-aligned byte ranges, each range is parsed
+    in a worker process into compact arrays, and the chunks are stitched back
+    in order with global line numbers. Semantics follow FileReader: movement
+    files stop at the first empty line and after `max_lines` valid moves.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_chunk: int = MIN_CHUNK_BYTES):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_chunk = min_chunk
+
+    def _run(self, worker, file_path) -> list:
+        ranges = split_ranges(file_path, self.workers, self.min_chunk)
+        if len(ranges) <= 1:
+            return [worker(file_path, start, end) for start, end in ranges]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(self.workers, len(ranges))) as pool:
+            futures = [pool.submit(worker, str(file_path), start, end) for start, end in ranges]
+            return [fut.result() for fut in futures]
+
+    def load_movements(self, drone_id: str, max_lines: Optional[int] = 10_000) -> MovementArrays:
+        file_path = paths.movement_file_path(drone_id)
+        if not os.path.exists(file_path):
+            file_logger.error(f"Movement file not found: {file_path}")
+            raise FileNotFoundError(file_path)
+
+        codes, distances, line_numbers = array("I"), array("q"), array("Q")
+        directions = dict(DIRECTION_CODES)
+        invalid = []
+        empty_line = None
+        line_offset = 0
+
+        for c_codes, c_dist, c_lines, c_dirs, c_invalid, empty_at, n_lines in self._run(
+                _parse_movement_range, file_path):
+            if len(c_dirs) > len(DIRECTIONS):
+                # okända riktningar har chunk-lokala koder → översätt till filens tabell
+                remap = [directions.setdefault(d, len(directions)) for d in c_dirs]
+                c_codes = array("I", [remap[c] for c in c_codes])
+            codes.extend(c_codes)
+            distances.extend(c_dist)
+            line_numbers.extend(n + line_offset for n in c_lines)
+            invalid.extend((n + line_offset, text, reason) for n, text, reason in c_invalid)
+            if empty_at is not None:
+                empty_line = line_offset + empty_at
+                break
+            line_offset += n_lines
+
+        total_lines = empty_line if empty_line is not None else line_offset
+        stop_line = empty_line  # första globala rad som inte längre läses
+        last_kept = None  # rad med sista tillåtna draget (0: max_lines=0, inga drag alls)
+        if max_lines is not None and len(codes) >= max_lines:
+            last_kept = line_numbers[max_lines - 1] if max_lines else 0
+        if last_kept is not None and last_kept < total_lines:
+            stop_line = last_kept + 1
+            file_logger.warning(
+                f"[{drone_id}] Movement file {file_path} has more than {max_lines} lines → extra lines ignored"
+            )
+            del codes[max_lines:], distances[max_lines:], line_numbers[max_lines:]
+        elif empty_line is not None:
+            file_logger.info(f"[{drone_id}] Empty line at line {empty_line}, stopping read")
+        if stop_line is not None:
+            invalid = [entry for entry in invalid if entry[0] < stop_line]
+
+        for n, text, reason in invalid:
+            file_logger.error(f"[{drone_id}] Invalid line {n}: {text!r} ({reason})")
+        file_logger.info(f"[{drone_id}] Total moves loaded: {len(codes)}")
+        return MovementArrays(codes, distances, line_numbers, invalid, tuple(directions))
+
+    def load_sensor_data(self, drone_id: str, max_lines: Optional[int] = None) -> SensorArrays:
+        file_path = paths.sensor_file_path(drone_id)
+        if not os.path.exists(file_path):
+            sensor_file_logger.error(f"Sensor file not found: {file_path}")
+            raise FileNotFoundError(file_path)
+
+        packed, line_numbers = bytearray(), array("Q")
+        invalid = []
+        line_offset = 0
+
+        for c_packed, c_lines, c_invalid, _, n_lines in self._run(_parse_sensor_range, file_path):
+            packed += c_packed
+            line_numbers.extend(n + line_offset for n in c_lines)
+            invalid.extend((n + line_offset, text, reason) for n, text, reason in c_invalid)
+            line_offset += n_lines
+
+        if max_lines is not None and len(line_numbers) > max_lines:
+            stop_line = line_numbers[max_lines - 1] + 1 if max_lines else 0
+            del packed[max_lines * PACKED_LEN:], line_numbers[max_lines:]
+            invalid = [entry for entry in invalid if entry[0] < stop_line]
+
+        for n, text, reason in invalid:
+            sensor_file_logger.error(f"[{drone_id}] Invalid sensor line {n}: {text!r} ({reason})")
+        return SensorArrays(bytes(packed), line_numbers, invalid)
@@ -0,0 +1,153 @@
+import threading
+from collections import deque
+from typing import Deque, Generator, Iterator, Optional
+
+DEFAULT_DEPTH = 32   # max buffrade poster per källa
+DEFAULT_BLOCK = 16   # poster som hämtas per påfyllning
+_DIRECT = object()
+
+
+class _Source:
+    __slots__ = ("gen", "buffer", "done", "error", "requested", "closed", "reading")
+
+    def __init__(self, gen: Iterator):
+        self.gen = gen
+        self.buffer: Deque = deque()
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.requested = False
+        self.closed = False  # konsumenten är klar, läs inte mer
+        self.reading = False  # tråden är inne i next(gen) just nu
+
+
+class Prefetcher:
+    """
+    Reads ahead from per-submarine generators on a background thread.
+
+    Each wrapped generator gets a bounded buffer of at most `depth` items.
+    The consumer only pops from memory; when a buffer drains to half it asks
+    the thread for a refill of up to `block` items (back-pressure: full
+    buffers are never read further). A consumer that finds its buffer empty
+    jumps the refill queue and waits; those waits are counted in `stalls`.
+    """
+
+    def __init__(self, depth: int = DEFAULT_DEPTH, block: int = DEFAULT_BLOCK):
+        if depth < 1 or block < 1:
+            raise ValueError("depth and block must be >= 1")
+        self.depth = depth
+        self.block = block
+        self.low_water = depth // 2
+        self._needs: Deque[_Source] = deque()
+        self.live_sources = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.stalls = 0
+        self.refills = 0
+
+    def wrap(self, gen: Iterator) -> Generator:
+        """Registers `gen` and returns a generator yielding the same items from the read-ahead buffer."""
+        source = _Source(gen)
+        with self._cond:
+            self.live_sources += 1
+            self._request(source)
+        self._start()
+        return self._consume(source)
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="prefetcher", daemon=True)
+            self._thread.start()
+
+    def _request(self, source: _Source, urgent: bool = False):
+        """Köar en påfyllning (anropas med låset hållet). Brådskande läggs först."""
+        if urgent:
+            source.requested = True
+            self._needs.appendleft(source)
+        elif not source.requested:
+            source.requested = True
+            self._needs.append(source)
+        else:
+            return
+        self._cond.notify_all()
+
+    def _consume(self, source: _Source) -> Generator:
+        try:
+            while True:
+                with self._cond:
+                    if not source.buffer and not source.done and not self._stopping:
+                        self.stalls += 1
+                        self._request(source, urgent=True)
+                        while not source.buffer and not source.done and not self._stopping:
+                            self._cond.wait()
+                    if source.buffer:
+                        item = source.buffer.popleft()
+                        if len(source.buffer) <= self.low_water and not source.done:
+                            self._request(source)
+                    elif source.done:
+                        if source.error is not None:
+                            raise source.error
+                        return
+                    elif source.reading:
+                        # stoppad, men tråden läser fortfarande ett block ur samma källa → vänta in det
+                        while source.reading:
+                            self._cond.wait()
+                        continue
+                    else:
+                        item = _DIRECT
+                if item is _DIRECT:
+                    # tråden är stoppad: läs direkt från källan
+                    try:
+                        item = next(source.gen)
+                    except StopIteration:
+                        return
+                yield item
+        finally:
+            with self._cond:
+                source.closed = True
+                self.live_sources -= 1
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._needs and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                source = self._needs.popleft()
+                if source.closed or not source.requested or source.done:
+                    continue
+                source.requested = False
+                source.reading = True
+                room = min(self.depth - len(source.buffer), self.block)
+
+            # själva läsningen sker utan lås: simuleringstråden kan poppa under tiden
+            items, done, error = [], False, None
+            try:
+                for _ in range(room):
+                    items.append(next(source.gen))
+            except StopIteration:
+                done = True
+            except Exception as e:
+                done, error = True, e
+
+            with self._cond:
+                source.reading = False
+                source.buffer.extend(items)
+                source.done, source.error = done, error
+                self.refills += 1
+                if not done and len(source.buffer) < self.depth:
+                    self._request(source)  # fyll resten efter de andra i kön
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        """Stops the background thread (buffered items can still be consumed)."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> str:
+        return f"sources={self.live_sources} refills={self.refills} stalls={self.stalls}"
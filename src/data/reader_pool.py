@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Generator, Optional, Union
+
+DEFAULT_MAX_OPEN = 256
+DEFAULT_BLOCK_SIZE = 4096
+
+
+class ReaderPool:
+    """
+    Shared pool of open files for the per-submarine readers.
+
+    At most `max_open` files are open at once (LRU). A reader never holds a
+    file object itself: it keeps its own byte offset plus one read-ahead
+    block, and asks the pool for the next block when the buffer runs dry.
+    If its file was evicted in the meantime the pool reopens it and seeks
+    to the offset, so a 50k-sub fleet runs within any `ulimit -n`.
+    """
+
+    def __init__(self, max_open: int = DEFAULT_MAX_OPEN, block_size: int = DEFAULT_BLOCK_SIZE):
+        if max_open < 1:
+            raise ValueError("max_open must be >= 1")
+        self.max_open = max_open
+        self.block_size = block_size
+        self._files: "OrderedDict[str, BinaryIO]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.opens = 0
+        self.evictions = 0
+
+    def _file(self, key: str) -> BinaryIO:
+        f = self._files.get(key)
+        if f is not None:
+            self._files.move_to_end(key)
+            return f
+        while len(self._files) >= self.max_open:
+            _, oldest = self._files.popitem(last=False)
+            oldest.close()
+            self.evictions += 1
+        f = open(key, "rb")
+        self._files[key] = f
+        self.opens += 1
+        return f
+
+    def read_block(self, path: Union[str, Path], offset: int, size: Optional[int] = None) -> bytes:
+        """Reads up to `size` bytes at `offset`, (re)opening the file if it is not in the pool."""
+        with self._lock:
+            f = self._file(str(path))
+            f.seek(offset)
+            return f.read(size or self.block_size)
+
+    def release(self, path: Union[str, Path]) -> None:
+        """Closes `path` if it is open (its reader is done)."""
+        with self._lock:
+            f = self._files.pop(str(path), None)
+            if f is not None:
+                f.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+
+    @property
+    def open_count(self) -> int:
+        return len(self._files)
+
+    def blocks(self, path: Union[str, Path], start: int = 0,
+               block_size: Optional[int] = None) -> Generator[bytes, None, None]:
+        """Yields the file from `start` in blocks of `block_size` bytes."""
+        offset = start
+        size = block_size or self.block_size
+        try:
+            while True:
+                block = self.read_block(path, offset, size)
+                if not block:
+                    return
+                offset += len(block)
+                yield block
+        finally:
+            self.release(path)
+
+    def lines(self, path: Union[str, Path], encoding: str = "utf-8",
+              errors: str = "strict") -> Generator[str, None, None]:
+        """Yields the lines of a text file (newline kept), like iterating an open file."""
+        partial = b""
+        for block in self.blocks(path):
+            data = partial + block
+            end = data.rfind(b"\n") + 1
+            partial = data[end:]
+            if end:
+                text = data[:end].decode(encoding, errors)
+                for line in text[:-1].split("\n"):
+                    yield line + "\n"
+        if partial:
+            yield partial.decode(encoding, errors)
+
+    def stats(self) -> str:
+        return f"open={self.open_count}/{self.max_open} opens={self.opens} evictions={self.evictions}"
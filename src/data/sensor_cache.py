@@ -0,0 +1,152 @@
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Generator, NamedTuple, Optional, Union
+
+from src.config import paths
+from src.data.reader_pool import ReaderPool
+from src.utils.bitpack import PACKED_LEN, PATTERN_LEN
+from src.utils.logger import sensor_file_logger
+
+MAGIC = b"SPK1"
+HEADER = struct.Struct("<4sHHIIqq")  # magic, version, pattern_len, lines, invalid, mtime_ns, size
+VERSION = 1
+BLOCK_LINES = 4096
+
+
+class CacheHeader(NamedTuple):
+    line_count: int
+    invalid_count: int
+    source_mtime_ns: int
+    source_size: int
+
+
+class SensorCache:
+    """
+    Bit-packed cache of validated sensor readings.
+
+    Each 208-bit reading is stored as 26 big-endian bytes after a small header,
+    so repeated runs skip both the 209-byte text lines and the validation.
+    The cache is rebuilt when the source file's mtime or size changes.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+
+    def cache_path(self, drone_id: str) -> Path:
+        if self.cache_dir is None:
+            return paths.sensor_cache_file_path(drone_id)
+        return self.cache_dir / f"{drone_id}.bin"
+
+    @staticmethod
+    def read_header(cache_file: Union[str, Path]) -> Optional[CacheHeader]:
+        """Returns the header of `cache_file`, or None if missing or not a valid cache."""
+        try:
+            with open(cache_file, "rb") as f:
+                raw = f.read(HEADER.size)
+        except OSError:
+            return None
+        if len(raw) != HEADER.size:
+            return None
+        magic, version, pattern_len, lines, invalid, mtime_ns, size = HEADER.unpack(raw)
+        if magic != MAGIC or version != VERSION or pattern_len != PATTERN_LEN:
+            return None
+        return CacheHeader(lines, invalid, mtime_ns, size)
+
+    def is_fresh(self, source: Union[str, Path], cache_file: Union[str, Path]) -> bool:
+        header = self.read_header(cache_file)
+        if header is None:
+            return False
+        st = os.stat(source)
+        return header.source_mtime_ns == st.st_mtime_ns and header.source_size == st.st_size
+
+    def build(self, source: Union[str, Path], cache_file: Union[str, Path]) -> CacheHeader:
+        """Validates and packs every line of `source` into `cache_file`."""
+        st = os.stat(source)
+        cache_file = Path(cache_file)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+
+        lines = invalid = 0
+        valid_chars = {"0", "1"}
+        with open(source, "r", encoding="utf-8", errors="replace") as src, open(tmp_file, "wb") as out:
+            out.write(HEADER.pack(MAGIC, VERSION, PATTERN_LEN, 0, 0, 0, 0))
+            buf = bytearray()
+            for line in src:
+                s = line.strip()
+                if not s:
+                    continue
+                if len(s) != PATTERN_LEN or set(s) - valid_chars:
+                    invalid += 1
+                    continue
+                buf += int(s, 2).to_bytes(PACKED_LEN, "big")
+                lines += 1
+                if len(buf) >= BLOCK_LINES * PACKED_LEN:
+                    out.write(buf)
+                    buf.clear()
+            out.write(buf)
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, VERSION, PATTERN_LEN, lines, invalid, st.st_mtime_ns, st.st_size))
+
+        os.replace(tmp_file, cache_file)
+        sensor_file_logger.info(
+            f"Cached {lines} sensor readings from {source} → {cache_file} ({invalid} invalid lines skipped)"
+        )
+        return CacheHeader(lines, invalid, st.st_mtime_ns, st.st_size)
+
+    def ensure(self, drone_id: str, source: Optional[Union[str, Path]] = None) -> Path:
+        """Returns a fresh cache file for `drone_id`, building it if needed."""
+        if source is None:
+            source = paths.sensor_file_path(drone_id)
+        cache_file = self.cache_path(drone_id)
+        if not self.is_fresh(source, cache_file):
+            self.build(source, cache_file)
+        return cache_file
+
+    def iter_packed(self, drone_id: str, source: Optional[Union[str, Path]] = None,
+                    pool: Optional[ReaderPool] = None) -> Generator[int, None, None]:
+        """
+        Yields the packed readings (ints) of `drone_id` in file order.
+        With a ReaderPool the file is not held open between blocks.
+        """
+        cache_file = self.ensure(drone_id, source)
+        if pool is not None:
+            # läs-framåt: så många hela avläsningar som ryms i poolens block
+            block_size = PACKED_LEN * max(1, pool.block_size // PACKED_LEN)
+            blocks = pool.blocks(cache_file, HEADER.size, block_size)
+        else:
+            blocks = self._file_blocks(cache_file)
+        for block in blocks:
+            for i in range(0, len(block) - PACKED_LEN + 1, PACKED_LEN):
+                yield int.from_bytes(block[i:i + PACKED_LEN], "big")
+
+    @staticmethod
+    def _file_blocks(cache_file: Path) -> Generator[bytes, None, None]:
+        with open(cache_file, "rb") as f:
+            f.seek(HEADER.size)
+            while True:
+                block = f.read(BLOCK_LINES * PACKED_LEN)
+                if not block:
+                    break
+                yield block
+
+
+def main() -> int:
+    """Converts every sensor file in SENSOR_DATA_DIR to the packed cache format."""
+    cache = SensorCache()
+    built = fresh = 0
+    for source in sorted(paths.SENSOR_DATA_DIR.glob("*.txt")):
+        cache_file = cache.cache_path(source.stem)
+        if cache.is_fresh(source, cache_file):
+            fresh += 1
+            continue
+        header = cache.build(source, cache_file)
+        built += 1
+        print(f"{source.stem}: {header.line_count} readings, {header.invalid_count} invalid lines skipped")
+    print(f"Built {built} caches, {fresh} already up to date → {paths.SENSOR_CACHE_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
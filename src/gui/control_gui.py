@@ -1,20 +1,29 @@
-import os
 import math
 import concurrent.futures
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QPushButton, QVBoxLayout,
-    QListWidget, QMessageBox, QDialog, QLabel, QMainWindow,
-    QLineEdit, QPushButton, QHBoxLayout
+    QMessageBox, QDialog, QLabel, QMainWindow,
+    QLineEdit, QPushButton, QHBoxLayout, QInputDialog
 )
 from PyQt5.QtCore import QThread, pyqtSignal, QObject, QTimer
 
-from src.config.paths import MOVEMENT_REPORTS_DIR
+from src.data.fleet_manifest import load_manifest
 from src.data.file_reader import FileReader
+from src.data.prefetcher import Prefetcher
 from src.core.movement_manager import MovementManager
 from src.core.torpedo_system import TorpedoSystem
 from src.core.nuke_activation import NukeActivation
 from src.data.secrets_loader import SecretsLoader
 from src.core.sensor_manager import SensorManager
+from src.gui.fleet_model import create_fleet_view, selected_sub
+from src.gui.map_view import MapView
+from src.gui.heatmap_view import HeatmapView
+from src.gui.log_view import LogView
+from src.core.heatmap import TrafficHeatmap
+from src.core.replay import ReplayPlayer
+from src.utils.update_coalescer import UpdateCoalescer
+
+FRAME_RATE = 30  # GUI-uppdateringar per sekund, oberoende av simuleringstakten
 
 
 # === Start Menu ===
@@ -47,31 +56,47 @@ class StartMenu(QWidget):
         self.close()  # stäng startmenyn när simulationen börjar
 
     def show_stats(self):
-        subs = [
-            f.replace(".txt", "")
-            for f in os.listdir(MOVEMENT_REPORTS_DIR)
-            if f.endswith(".txt")
-        ]
-        stats = f"Antal ubåtar: {len(subs)}\n" + "\n".join(subs[:15])
+        manifest = load_manifest()
+        summary = manifest.summary()
+        subs = manifest.drone_ids()
+        stats = (
+            f"Antal ubåtar: {summary['drones']}\n"
+            f"Rader i rörelsefiler: {summary['movement_lines']}\n"
+            f"Med sensordata: {summary['with_sensor']}\n"
+            f"Ogiltiga serienummer: {summary['invalid_serials']}\n\n"
+            + "\n".join(subs[:15])
+        )
         QMessageBox.information(self, "Stats", stats)
 
 
 # === Main Menu ===
 class MainMenu(QMainWindow):
-    def __init__(self, manager, torpedo_system, nuke_activation, sensor_manager):
+    def __init__(self, manager, torpedo_system, nuke_activation, sensor_manager, coalescer=None, heatmap=None):
         super().__init__()
         self.manager = manager
+        self.heatmap = heatmap
         self.torpedo_system = torpedo_system
         self.nuke_activation = nuke_activation
         self.sensor_manager = sensor_manager
+        self.coalescer = coalescer
 
         # Widgets för status
         self.status_label = QLabel("Simulation not started")
         self.round_label = QLabel("")
         self.subs_label = QLabel("")
+        self.rate_label = QLabel("")
+        self.map_view = None
+        self.heatmap_view = None
+        self.log_view = None
 
         self.init_ui()
 
+        # Hämta senaste sammanfattningen med fast bildfrekvens
+        self.update_timer = QTimer(self)
+        self.update_timer.timeout.connect(self.poll_updates)
+        if self.coalescer is not None:
+            self.update_timer.start(1000 // FRAME_RATE)
+
     def init_ui(self):
         self.setWindowTitle("Ubåtscentralen - Main Menu")
         layout = QVBoxLayout()
@@ -79,6 +104,7 @@ class MainMenu(QMainWindow):
         layout.addWidget(self.status_label)
         layout.addWidget(self.round_label)
         layout.addWidget(self.subs_label)
+        layout.addWidget(self.rate_label)
 
         # --- Search Submarine ---
         search_layout = QHBoxLayout()
@@ -110,6 +136,22 @@ class MainMenu(QMainWindow):
         sensor_btn.clicked.connect(self.show_sensor_errors)
         layout.addWidget(sensor_btn)
 
+        similar_btn = QPushButton("Similar Sensor Patterns")
+        similar_btn.clicked.connect(self.show_similar_patterns)
+        layout.addWidget(similar_btn)
+
+        map_btn = QPushButton("Show Map")
+        map_btn.clicked.connect(self.show_map)
+        layout.addWidget(map_btn)
+
+        heatmap_btn = QPushButton("Traffic Heatmap")
+        heatmap_btn.clicked.connect(self.show_heatmap)
+        layout.addWidget(heatmap_btn)
+
+        logs_btn = QPushButton("Show Logs")
+        logs_btn.clicked.connect(self.show_logs)
+        layout.addWidget(logs_btn)
+
         distance_btn = QPushButton("Distance Analysis")
         distance_btn.clicked.connect(self.distance_analysis)
         layout.addWidget(distance_btn)
@@ -122,28 +164,70 @@ class MainMenu(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
     
-    def update_status(self, round_number: int, active_subs: int):
-        """Kallas av SimulationWorker varje runda"""
+    def poll_updates(self):
+        """Körs av QTimer (FRAME_RATE Hz) – visar bara den senaste rundan."""
+        summary = self.coalescer.take()
+        if summary is not None:
+            self.update_status(summary)
+            self.refresh_map()
+
+    def update_status(self, summary):
         self.status_label.setText("Simulation running...")
-        self.round_label.setText(f"Round {round_number}")
-        self.subs_label.setText(f"Active submarines: {active_subs}")
+        self.round_label.setText(f"Round {summary.round_number}")
+        self.subs_label.setText(f"Active submarines: {summary.active_subs}")
+        self.rate_label.setText(
+            f"{summary.rounds_per_sec:.0f} rounds/s, "
+            f"{summary.collisions_in_interval} collisions this frame, "
+            f"{summary.collisions_total} total"
+        )
+
+    def show_map(self):
+        if self.map_view is None:
+            self.map_view = MapView()
+        self.map_view.show()
+        self.map_view.raise_()
+        self.refresh_map()
+
+    def show_heatmap(self):
+        if self.heatmap is None:
+            QMessageBox.information(self, "Traffic Heatmap", "No heatmap is being recorded.")
+            return
+        if self.heatmap_view is None:
+            self.heatmap_view = HeatmapView(self.heatmap)
+        else:
+            self.heatmap_view.refresh()
+        self.heatmap_view.show()
+        self.heatmap_view.raise_()
+
+    def show_logs(self):
+        if self.log_view is None:
+            self.log_view = LogView()
+        self.log_view.show()
+        self.log_view.raise_()
+
+    def refresh_map(self):
+        """Skickar en snapshot av flottan till kartan (bara om den är öppen)."""
+        if self.map_view is None or not self.map_view.isVisible():
+            return
+        snapshot = self.manager.snapshot
+        self.map_view.set_snapshot(
+            snapshot.xs,
+            snapshot.ys,
+            snapshot.active,
+            [pos for _, pos, _, _ in self.manager.collisions[:snapshot.collision_count]],
+        )
 
     def simulation_finished(self):
+        self.update_timer.stop()
+        if self.coalescer is not None:
+            self.poll_updates()  # visa sista rundan
         self.status_label.setText("Simulation finished")
 
-    # === Hjälpmetod ===
-    def populate_sub_list(self, list_widget, active_only=False):
-        """Fyller en QListWidget med alla ubåtar eller bara aktiva."""
-        list_widget.clear()
-        for sub in self.manager.submarines.values():
-            if not active_only or sub.is_active:
-                list_widget.addItem(f"{sub.id} → pos {sub.position}, active={sub.is_active}")
-
     def search_submarine(self):
         sub_id = self.search_input.text().strip()
 
         if sub_id:  # om användaren skrev in ett ID
-            sub = self.manager.submarines.get(sub_id)
+            sub = self.manager.snapshot.get(sub_id)
             if sub:
                 QMessageBox.information(
                     self,
@@ -159,29 +243,17 @@ class MainMenu(QMainWindow):
                     f"No submarine found with ID {sub_id}"
                 )
         else:
-            results = []
-            for sub in self.manager.submarines.values():
-                results.append(
-                    f"{sub.id} - Position: {sub.position} - Active: {'Yes' if sub.is_active else 'No'}"
-                )
-            if results:
-                QMessageBox.information(self, "All Submarines", "\n".join(results))
-            else:
+            if not len(self.manager.snapshot):
                 QMessageBox.information(self, "All Submarines", "No submarines available")
-
+                return
+            self.show_all_stats()
 
     def show_all_stats(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("All Submarines")
         layout = QVBoxLayout(dialog)
 
-        list_widget = QListWidget()
-        self.populate_sub_list(list_widget)  # alla subs
-        layout.addWidget(list_widget)
-
-        active_btn = QPushButton("Show Active Only")
-        active_btn.clicked.connect(lambda: self.populate_sub_list(list_widget, active_only=True))
-        layout.addWidget(active_btn)
+        create_fleet_view(self.manager.snapshot.states(), layout)
 
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(dialog.accept)
@@ -190,105 +262,139 @@ class MainMenu(QMainWindow):
         dialog.setLayout(layout)
         dialog.exec_()
 
-    def fire_torpedo(self):
+    def choose_submarine(self, title: str, button_text: str):
+        """
+        Dialog med ubåtarna i senaste snapshot.
+        Returnerar (vald ubåt, hela flottan i samma snapshot) eller (None, flottan).
+        """
+        fleet = self.manager.snapshot.states()
         dialog = QDialog(self)
-        dialog.setWindowTitle("Choose Submarine to Fire Torpedo From")
+        dialog.setWindowTitle(title)
         layout = QVBoxLayout(dialog)
 
-        list_widget = QListWidget()
-        for sub in self.manager.submarines.values():
-            if sub.is_active:
-                list_widget.addItem(f"{sub.id} → pos {sub.position}")
-        layout.addWidget(list_widget)
+        view, proxy = create_fleet_view(fleet, layout, active_only=True)
+        view.doubleClicked.connect(dialog.accept)
 
-        fire_btn = QPushButton("Fire")
-        fire_btn.clicked.connect(dialog.accept)
-        layout.addWidget(fire_btn)
+        ok_btn = QPushButton(button_text)
+        ok_btn.clicked.connect(dialog.accept)
+        layout.addWidget(ok_btn)
 
         dialog.setLayout(layout)
-        if dialog.exec_():
-            selected = list_widget.currentItem()
-            if not selected:
-                QMessageBox.warning(self, "Error", "No submarine selected.")
-                return
-            sub_id = selected.text().split(" ")[0]
-            sub = self.manager.submarines.get(sub_id)
-            report = self.torpedo_system.get_friendly_fire_report(
-                list(self.manager.submarines.values()), sub
-            )
-            msg = f"Torpedo check for {sub_id}:\n"
-            for direction, info in report.items():
-                msg += f"{direction}: {'SAFE' if info['safe'] else 'RISK'}\n"
-            QMessageBox.information(self, "Torpedo Report", msg)
-
-    def activate_nuke(self):
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Choose Submarine to Activate Nuke")
-        layout = QVBoxLayout(dialog)
+        if not dialog.exec_():
+            return None, fleet
+        sub = selected_sub(view, proxy)
+        if sub is None:
+            QMessageBox.warning(self, "Error", "No submarine selected.")
+        return sub, fleet
 
-        list_widget = QListWidget()
-        for sub in self.manager.submarines.values():
-            if sub.is_active:
-                list_widget.addItem(f"{sub.id} → pos {sub.position}")
-        layout.addWidget(list_widget)
-
-        activate_btn = QPushButton("Activate")
-        activate_btn.clicked.connect(dialog.accept)
-        layout.addWidget(activate_btn)
+    def fire_torpedo(self):
+        sub, fleet = self.choose_submarine("Choose Submarine to Fire Torpedo From", "Fire")
+        if sub is None:
+            return
+        report = self.torpedo_system.get_friendly_fire_report(fleet, sub)
+        msg = f"Torpedo check for {sub.id}:\n"
+        for direction, info in report.items():
+            msg += f"{direction}: {'SAFE' if info['safe'] else 'RISK'}\n"
+        QMessageBox.information(self, "Torpedo Report", msg)
 
-        dialog.setLayout(layout)
-        if dialog.exec_():
-            selected = list_widget.currentItem()
-            if not selected:
-                QMessageBox.warning(self, "Error", "No submarine selected.")
-                return
-            sub_id = selected.text().split(" ")[0]
-            sub = self.manager.submarines.get(sub_id)
-            allowed = self.nuke_activation.allowed_to_activate(
-                list(self.manager.submarines.values()), sub
-            )
-            if allowed:
-                QMessageBox.information(self, "Nuke Activation", f"Nuke activated for {sub_id}")
-            else:
-                QMessageBox.warning(self, "Nuke Activation", f"Activation blocked (friendly fire risk) for {sub_id}")
+    def activate_nuke(self):
+        sub, fleet = self.choose_submarine("Choose Submarine to Activate Nuke", "Activate")
+        if sub is None:
+            return
+        allowed = self.nuke_activation.allowed_to_activate(fleet, sub)
+        if allowed:
+            QMessageBox.information(self, "Nuke Activation", f"Nuke activated for {sub.id}")
+        else:
+            QMessageBox.warning(self, "Nuke Activation", f"Activation blocked (friendly fire risk) for {sub.id}")
 
     def show_sensor_errors(self):
-        results = []
-
         # Om generatorer inte är kopplade ännu
         if not self.sensor_manager.generators:
             QMessageBox.information(self, "Sensor Errors",
                 "Sensors are not attached yet. Start the simulation first.")
             return
 
-        for sub in self.manager.submarines.values():
-            if not sub.is_active:
-                continue
+        # simuleringstråden uppdaterar statistiken varje runda → läs den under dess lås
+        with self.sensor_manager.lock:
+            results = self._sensor_error_lines()
 
-            counts = self.sensor_manager.pattern_counts.get(sub.id)
+        if results:
+            QMessageBox.information(self, "Sensor Errors", "\n".join(results))
+        else:
+            QMessageBox.information(self, "Sensor Errors",
+                "No active submarines with sensor data.")
+
+    def _sensor_error_lines(self):
+        """Bygger texten för show_sensor_errors (anropas med sensor_manager.lock hållet)."""
+        sensor_manager = self.sensor_manager
+        results = []
+        for sub in self.manager.snapshot.states(active_only=True):
+            counts = sensor_manager.pattern_counts.get(sub.id)
             if not counts:
                 results.append(f"{sub.id}: no sensor data read")
                 continue
 
             total_patterns = sum(counts.values())
             unique = len(counts)
-            top_hash, top_count = counts.most_common(1)[0]
-            example_pattern = self.sensor_manager.pattern_examples[sub.id][top_hash]
+            top_pid, top_count = counts.most_common(1)[0]
+            example_pattern = sensor_manager.pattern_string(top_pid)
             results.append(
                 f"{sub.id}: {total_patterns} lines, {unique} unique patterns\n"
                 f"   Most common pattern ({top_count}x): {example_pattern[:50]}..."
             )
 
-        if results:
-            QMessageBox.information(self, "Sensor Errors", "\n".join(results))
-        else:
-            QMessageBox.information(self, "Sensor Errors",
-                "No active submarines with sensor data.")
+        patterns = sensor_manager.patterns
+        if results and patterns.fleet_counts:
+            # id:t direkt från räknaren: ingen uppslagning som kan skriva i registret
+            fleet_pid, fleet_count = patterns.fleet_counts.most_common(1)[0]
+            results.insert(0,
+                f"Fleet: {len(patterns)} unique patterns, most common ({fleet_count}x, "
+                f"{len(patterns.seen_by[fleet_pid])} subs): "
+                f"{sensor_manager.pattern_string(fleet_pid)[:50]}..."
+            )
+        return results
 
+    def show_similar_patterns(self):
+        """Söker mönster inom k bitflippar från en ubåts vanligaste mönster."""
+        if not self.sensor_manager.generators:
+            QMessageBox.information(self, "Similar Patterns",
+                "Sensors are not attached yet. Start the simulation first.")
+            return
 
+        sub_id = self.search_input.text().strip()
+        if not sub_id:
+            sub_id, ok = QInputDialog.getText(self, "Similar Patterns", "Submarine ID:")
+            if not ok or not sub_id.strip():
+                return
+            sub_id = sub_id.strip()
+
+        with self.sensor_manager.lock:
+            counts = self.sensor_manager.pattern_counts.get(sub_id)
+            top_pid = counts.most_common(1)[0][0] if counts else None
+        if top_pid is None:
+            QMessageBox.information(self, "Similar Patterns", f"No sensor data read for {sub_id}")
+            return
+
+        # låset hålls inte medan dialogen är öppen, då skulle simuleringen stå still
+        k, ok = QInputDialog.getInt(self, "Similar Patterns", "Max bit flips (k):", 3, 0, 64)
+        if not ok:
+            return
+
+        with self.sensor_manager.lock:
+            query = self.sensor_manager.pattern_string(top_pid)
+            matches = self.sensor_manager.find_similar(query, k)
+            results = [f"{len(matches)} patterns within {k} bit flips of {sub_id}'s most common pattern"]
+            for pattern, dist, occurrences in matches[:20]:
+                subs = {s for s, _ in occurrences}
+                first_sub, first_round = occurrences[0]
+                results.append(
+                    f"d={dist}: {len(occurrences)}x by {len(subs)} subs "
+                    f"(first {first_sub} round {first_round})\n   {pattern[:50]}..."
+                )
+        QMessageBox.information(self, "Similar Patterns", "\n".join(results))
 
     def distance_analysis(self):
-        subs = [s for s in self.manager.submarines.values() if s.is_active]
+        subs = self.manager.snapshot.states(active_only=True)
         if len(subs) < 2:
             QMessageBox.warning(self, "Distance Analysis", "Not enough active submarines.")
             return
@@ -310,12 +416,12 @@ class MainMenu(QMainWindow):
 
 class SimulationWorker(QObject):
     finished = pyqtSignal()
-    round_update = pyqtSignal(int, int)  # round_number, active_subs
 
-    def __init__(self, manager, sensor_manager):
+    def __init__(self, manager, sensor_manager, coalescer):
         super().__init__()
         self.manager = manager
         self.sensor_manager = sensor_manager
+        self.coalescer = coalescer
 
     def run(self):
         round_counter = 1
@@ -328,16 +434,38 @@ class SimulationWorker(QObject):
                 break
 
             self.manager.step_round(round_counter, self.sensor_manager)
-            self.round_update.emit(round_counter, len(self.manager.active_subs))
+            # ingen signal per runda: GUI:t hämtar senaste värdet i sin egen takt
+            snapshot = self.manager.snapshot
+            self.coalescer.publish(round_counter, snapshot.active_count, snapshot.collision_count)
             round_counter += 1
 
         self.finished.emit()
 
+class ReplayWorker(QObject):
+    """Plays a recording on a background thread and feeds the coalescer like SimulationWorker."""
+    finished = pyqtSignal()
+
+    def __init__(self, player, coalescer, speed=None):
+        super().__init__()
+        self.player = player
+        self.coalescer = coalescer
+        self.speed = speed
+        player.add_observer(self)
+
+    def on_round(self, player, round_number):
+        snapshot = player.snapshot
+        self.coalescer.publish(round_number, snapshot.active_count, snapshot.collision_count)
+
+    def run(self):
+        self.player.play(speed=self.speed)
+        self.finished.emit()
+
 def launch_gui():
     app = QApplication([])
 
     reader = FileReader()
-    manager = MovementManager(reader, tick_delay=0.0)
+    prefetcher = Prefetcher()  # läser rörelser och sensordata i förväg åt simuleringstråden
+    manager = MovementManager(reader, tick_delay=0.0, prefetcher=prefetcher)
     manager.load_submarines_from_generator(reader.load_all_movement_files())
 
     torpedos = TorpedoSystem()
@@ -347,16 +475,21 @@ def launch_gui():
     sensor_manager = SensorManager(manager)                      
     sensor_manager.attach_generators(manager.submarines.values())
 
+    heatmap = TrafficHeatmap()
+    for sub in manager.submarines.values():
+        heatmap.add_point(sub.position)  # startpositionerna räknas som ett besök
+    manager.add_observer(heatmap)
+
     def start_simulation():
         app.thread = QThread()
-        app.worker = SimulationWorker(manager, sensor_manager)
+        coalescer = UpdateCoalescer()
+        app.worker = SimulationWorker(manager, sensor_manager, coalescer)
         app.worker.moveToThread(app.thread)
 
-        app.main_menu = MainMenu(manager, torpedos, nuke, sensor_manager)
+        app.main_menu = MainMenu(manager, torpedos, nuke, sensor_manager, coalescer, heatmap)
         app.main_menu.show()
 
         app.thread.started.connect(app.worker.run)
-        app.worker.round_update.connect(app.main_menu.update_status)
         app.worker.finished.connect(app.thread.quit)
         app.worker.finished.connect(app.worker.deleteLater)
         app.thread.finished.connect(app.thread.deleteLater)
@@ -369,6 +502,7 @@ def launch_gui():
         if hasattr(app, "thread") and app.thread.isRunning():
             app.thread.quit()
             app.thread.wait()
+        prefetcher.close()
 
     app.aboutToQuit.connect(cleanup)
 
@@ -376,3 +510,41 @@ def launch_gui():
     sm.show()
 
     app.exec_()
+
+def launch_replay(path, speed=None):
+    """Visar en inspelning (ReplayRecorder) i huvudmenyn, med `speed` rundor/s (None = så fort som möjligt)."""
+    app = QApplication([])
+
+    player = ReplayPlayer(path)
+    torpedos = TorpedoSystem()
+    nuke = NukeActivation(secrets_loader=SecretsLoader(), torpedo_system=torpedos)
+
+    heatmap = TrafficHeatmap()
+    for state in player.snapshot.states():
+        heatmap.add_point(state.position)
+    player.add_observer(heatmap)
+
+    app.thread = QThread()
+    coalescer = UpdateCoalescer()
+    app.worker = ReplayWorker(player, coalescer, speed)
+    app.worker.moveToThread(app.thread)
+
+    # ingen sensordata i inspelningen → tom SensorManager
+    app.main_menu = MainMenu(player, torpedos, nuke, SensorManager(), coalescer, heatmap)
+    app.main_menu.setWindowTitle(f"Ubåtscentralen - Replay {path}")
+    app.main_menu.show()
+
+    app.thread.started.connect(app.worker.run)
+    app.worker.finished.connect(app.thread.quit)
+    app.worker.finished.connect(app.main_menu.simulation_finished)
+
+    def cleanup():
+        player.stop()
+        if app.thread.isRunning():
+            app.thread.quit()
+            app.thread.wait()
+        player.close()
+
+    app.aboutToQuit.connect(cleanup)
+    app.thread.start()
+    app.exec_()
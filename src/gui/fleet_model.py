@@ -0,0 +1,136 @@
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from PyQt5.QtWidgets import QCheckBox, QHBoxLayout, QHeaderView, QLineEdit, QTableView
+
+COLUMNS = ("ID", "Position", "Active")
+SORT_KEYS = (
+    lambda sub: sub.id,
+    lambda sub: sub.position,
+    lambda sub: sub.is_active,
+)
+
+
+class FleetTableModel(QAbstractTableModel):
+    """
+    Table model over the fleet. Rows are only formatted when the view asks
+    for them, so opening a dialog costs the same for 20 or 50 000 subs.
+    """
+
+    def __init__(self, submarines, parent=None):
+        super().__init__(parent)
+        self._subs = list(submarines)
+
+    def refresh(self, submarines):
+        """Byter underliggande flotta (t.ex. efter en ny runda)."""
+        self.beginResetModel()
+        self._subs = list(submarines)
+        self.endResetModel()
+
+    def sub_at(self, row: int):
+        return self._subs[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._subs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sorts the rows in Python in one pass instead of per-row comparisons through Qt."""
+        if not 0 <= column < len(SORT_KEYS):
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_rows = {id(sub): row for row, sub in enumerate(self._subs)}
+        self._subs.sort(key=SORT_KEYS[column], reverse=(order == Qt.DescendingOrder))
+        old_indexes = self.persistentIndexList()
+        new_rows = {id(sub): row for row, sub in enumerate(self._subs)}
+        row_map = {old_rows[key]: row for key, row in new_rows.items()}
+        self.changePersistentIndexList(
+            old_indexes,
+            [self.index(row_map[i.row()], i.column()) for i in old_indexes],
+        )
+        self.layoutChanged.emit()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        sub = self._subs[index.row()]
+        column = index.column()
+        if column == 0:
+            return sub.id
+        if column == 1:
+            return f"{sub.position}"
+        return "Yes" if sub.is_active else "No"
+
+
+class FleetFilterProxy(QSortFilterProxyModel):
+    """Sorting and filtering (active only, id substring) on top of FleetTableModel."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.active_only = False
+        self.id_filter = ""
+
+    def set_active_only(self, active_only: bool):
+        self.active_only = bool(active_only)
+        self.invalidateFilter()
+
+    def set_id_filter(self, text: str):
+        self.id_filter = text.strip()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        sub = self.sourceModel().sub_at(source_row)
+        if self.active_only and not sub.is_active:
+            return False
+        return not self.id_filter or self.id_filter in sub.id
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # sortera källmodellen; proxyn behåller bara filtreringen
+        self.sourceModel().sort(column, order)
+
+
+def create_fleet_view(submarines, layout, active_only=False):
+    """
+    Lägger till filterfält + tabell i `layout` och returnerar (view, proxy).
+    Används av alla dialoger som listar ubåtar.
+    """
+    view = QTableView()
+    proxy = FleetFilterProxy(view)               # view äger proxyn, proxyn äger modellen
+    proxy.setSourceModel(FleetTableModel(submarines, proxy))
+    proxy.set_active_only(active_only)
+
+    filter_layout = QHBoxLayout()
+    id_filter = QLineEdit()
+    id_filter.setPlaceholderText("Filter by ID...")
+    id_filter.textChanged.connect(proxy.set_id_filter)
+    filter_layout.addWidget(id_filter)
+
+    active_box = QCheckBox("Active only")
+    active_box.setChecked(active_only)
+    active_box.toggled.connect(proxy.set_active_only)
+    filter_layout.addWidget(active_box)
+    layout.addLayout(filter_layout)
+
+    view.setModel(proxy)
+    view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)  # behåll filordning tills användaren sorterar
+    view.setSortingEnabled(True)
+    view.setSelectionBehavior(QTableView.SelectRows)
+    view.setSelectionMode(QTableView.SingleSelection)
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.verticalHeader().setVisible(False)
+    view.horizontalHeader().setStretchLastSection(True)
+    layout.addWidget(view)
+    return view, proxy
+
+
+def selected_sub(view, proxy):
+    """Returns the submarine on the selected row, or None."""
+    index = view.currentIndex()
+    if not index.isValid():
+        return None
+    return proxy.sourceModel().sub_at(proxy.mapToSource(index).row())
@@ -0,0 +1,79 @@
+import math
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QFileDialog, QHBoxLayout, QLabel, QPushButton, QVBoxLayout, QWidget
+
+MAX_SIDE = 1024  # största bildsida i pixlar; större kartor binnas
+
+
+class HeatmapView(QWidget):
+    """Shows the accumulated TrafficHeatmap as a log-scaled image with export buttons."""
+
+    def __init__(self, heatmap, parent=None):
+        super().__init__(parent)
+        self.heatmap = heatmap
+        self.setWindowTitle("Ubåtscentralen - Traffic Heatmap")
+
+        layout = QVBoxLayout(self)
+        self.info_label = QLabel("")
+        layout.addWidget(self.info_label)
+
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.image_label)
+
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        buttons.addWidget(refresh_btn)
+
+        export_btn = QPushButton("Export...")
+        export_btn.clicked.connect(self.export)
+        buttons.addWidget(export_btn)
+        layout.addLayout(buttons)
+
+        self.refresh()
+
+    def _cell_size(self) -> int:
+        bounds = self.heatmap.bounds
+        if bounds is None:
+            return 1
+        min_x, min_y, max_x, max_y = bounds
+        span = max(max_x - min_x + 1, max_y - min_y + 1)
+        return max(1, math.ceil(span / MAX_SIDE))
+
+    def refresh(self):
+        if self.heatmap.bounds is None:
+            self.info_label.setText("No movement recorded yet.")
+            return
+
+        cell_size = self._cell_size()
+        min_x, min_y, width, height, counts = self.heatmap.grid(cell_size)
+        peak = max(counts, default=0)
+        scale = 255 / math.log1p(peak) if peak else 0
+
+        # varm färgskala: svart -> röd -> gul, en pixel per (binnad) cell
+        buf = bytearray(4 * width * height)
+        for i, c in enumerate(counts):
+            if c:
+                v = int(math.log1p(c) * scale)
+                # Format_ARGB32 ligger som BGRA i minnet
+                buf[4 * i:4 * i + 4] = bytes((0, max(0, 2 * v - 255), min(255, 2 * v), 255))
+        image = QImage(bytes(buf), width, height, 4 * width, QImage.Format_ARGB32).copy()
+        self.image_label.setPixmap(QPixmap.fromImage(image))
+        self.info_label.setText(
+            f"Origin ({min_x}, {min_y}), {width}x{height} cells of {cell_size}x{cell_size}, "
+            f"max {peak} visits, {self.heatmap.segments} segments"
+        )
+
+    def export(self):
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Export heatmap", "heatmap.npy", "NumPy array (*.npy);;PGM image (*.pgm)"
+        )
+        if not path:
+            return
+        if path.endswith(".pgm") or "pgm" in selected:
+            self.heatmap.save_pgm(path, self._cell_size())
+        else:
+            self.heatmap.save_npy(path, self._cell_size())
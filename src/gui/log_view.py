@@ -0,0 +1,80 @@
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import (
+    QCheckBox, QComboBox, QHBoxLayout, QLabel, QPlainTextEdit, QVBoxLayout, QWidget
+)
+
+from src.utils.log_tail import LEVELS, LogTailer
+from src.utils.logger import LOG_FILES
+
+POLL_INTERVAL_MS = 250
+MAX_LINES = 5_000
+
+
+class LogView(QWidget):
+    """
+    Log panel that tails the project's log files.
+
+    New lines are read from the last offset on a timer and appended in one
+    batch; filtering by logger/level only re-renders the ring buffer that is
+    already in memory, never the files.
+    """
+
+    def __init__(self, files=None, max_lines: int = MAX_LINES, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Ubåtscentralen - Logs")
+        self.resize(900, 500)
+        self.tailer = LogTailer(files if files is not None else LOG_FILES, max_lines=max_lines)
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+
+        controls.addWidget(QLabel("Logger:"))
+        self.logger_box = QComboBox()
+        self.logger_box.addItem("All")
+        self.logger_box.addItems(sorted(self.tailer.files))
+        self.logger_box.currentIndexChanged.connect(self.rerender)
+        controls.addWidget(self.logger_box)
+
+        controls.addWidget(QLabel("Min level:"))
+        self.level_box = QComboBox()
+        self.level_box.addItems(LEVELS)
+        self.level_box.setCurrentText("INFO")
+        self.level_box.currentIndexChanged.connect(self.rerender)
+        controls.addWidget(self.level_box)
+
+        self.pause_box = QCheckBox("Pause")
+        self.pause_box.toggled.connect(lambda paused: paused or self.rerender())
+        controls.addWidget(self.pause_box)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(max_lines)  # widgeten är också en ringbuffert
+        self.text.setFont(QFont("Monospace"))
+        layout.addWidget(self.text)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        self.timer.start(POLL_INTERVAL_MS)
+        self.poll()
+
+    def _filter(self):
+        logger = self.logger_box.currentText()
+        return (None if logger == "All" else {logger}), self.level_box.currentText()
+
+    def poll(self):
+        new_lines = self.tailer.poll()
+        if not new_lines or self.pause_box.isChecked():
+            return
+        loggers, min_level = self._filter()
+        batch = [line.text for line in new_lines if self.tailer.matches(line, loggers, min_level)]
+        if batch:
+            self.text.appendPlainText("\n".join(batch))
+
+    def rerender(self):
+        """Filtret ändrades: rita om från ringbufferten."""
+        loggers, min_level = self._filter()
+        self.text.setPlainText("\n".join(line.text for line in self.tailer.filtered(loggers, min_level)))
+        self.text.verticalScrollBar().setValue(self.text.verticalScrollBar().maximum())
@@ -0,0 +1,168 @@
+import math
+
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QColor, QImage, QPainter, QPen
+from PyQt5.QtWidgets import QWidget
+
+BACKGROUND = QColor(10, 25, 45)
+ACTIVE_COLOR = QColor(80, 220, 120)
+DESTROYED_COLOR = QColor(120, 120, 120)
+COLLISION_COLOR = QColor(230, 60, 60)
+DETAIL_SCALE = 4.0  # pixlar per cell där vi byter från pixelbild till rutor
+
+
+def _argb(color: QColor) -> bytes:
+    # QImage.Format_ARGB32 lagras som BGRA i minnet (little-endian)
+    return bytes((color.blue(), color.green(), color.red(), 255))
+
+
+class MapView(QWidget):
+    """
+    Live map of the fleet.
+
+    Every frame is drawn from a fleet snapshot (x, y, active sequences) in one
+    batched pass: zoomed out, all subs are binned into a pixel buffer that is
+    blitted as a single QImage, so each screen pixel is written at most once
+    regardless of fleet size (level of detail). Zoomed in, only the visible
+    subs are drawn as cells. Drag to pan, wheel to zoom, double-click to fit.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Ubåtscentralen - Map")
+        self.setMinimumSize(400, 300)
+        self.setMouseTracking(False)
+
+        self._xs, self._ys, self._active = (), (), ()
+        self._collision_sites = []
+        self._scale = 1.0                    # pixlar per cell
+        self._origin = QPointF(0.0, 0.0)     # världskoordinat i widgetens övre vänstra hörn
+        self._fitted = False
+        self._drag_start = None
+        self._image = None                   # cachad bild för aktuell snapshot + vy
+
+    # === Data ===
+    def set_snapshot(self, xs, ys, active, collision_sites=()):
+        """Byter snapshot och ritar om (anropas av GUI-timern)."""
+        self._xs, self._ys, self._active = xs, ys, active
+        self._collision_sites = list(collision_sites)
+        if not self._fitted and len(xs):
+            self.fit_to_fleet()
+        self._invalidate()
+
+    def fit_to_fleet(self):
+        if not len(self._xs):
+            return
+        min_x, max_x = min(self._xs), max(self._xs)
+        min_y, max_y = min(self._ys), max(self._ys)
+        span_x = max(max_x - min_x + 1, 1)
+        span_y = max(max_y - min_y + 1, 1)
+        self._scale = max(min(self.width() / span_x, self.height() / span_y) * 0.95, 1e-6)
+        self._origin = QPointF(
+            min_x - (self.width() / self._scale - span_x) / 2,
+            min_y - (self.height() / self._scale - span_y) / 2,
+        )
+        self._fitted = True
+        self._invalidate()
+
+    def _invalidate(self):
+        self._image = None
+        self.update()
+
+    # === Rendering ===
+    def _render_pixels(self, w: int, h: int) -> QImage:
+        """Lågdetalj: binna alla ubåtar till pixlar och skriv varje pixel en gång."""
+        s, ox, oy = self._scale, self._origin.x(), self._origin.y()
+        # projicera alla ubåtar i en comprehension-pass, klipp mot fönstret;
+        # floor (inte int) så att ubåtar strax till vänster/ovanför hamnar på -1, utanför bild
+        floor = math.floor
+        cols = [floor((x - ox) * s) for x in self._xs]
+        rows = [floor((y - oy) * s) for y in self._ys]
+        active_px, destroyed_px = set(), set()
+        for px, py, act in zip(cols, rows, self._active):
+            if 0 <= px < w and 0 <= py < h:
+                (active_px if act else destroyed_px).add(py * w + px)
+
+        buf = bytearray(_argb(BACKGROUND) * (w * h))
+        dead = _argb(DESTROYED_COLOR)
+        alive = _argb(ACTIVE_COLOR)
+        for i in destroyed_px - active_px:
+            buf[4 * i:4 * i + 4] = dead
+        for i in active_px:
+            buf[4 * i:4 * i + 4] = alive
+
+        image = QImage(bytes(buf), w, h, 4 * w, QImage.Format_ARGB32)
+        return image.copy()  # äg pixeldatan oberoende av bufferten
+
+    def _render_detail(self, painter: QPainter, w: int, h: int):
+        """Högdetalj: rita synliga ubåtar som rutor."""
+        s, ox, oy = self._scale, self._origin.x(), self._origin.y()
+        min_x, max_x = ox - 1, ox + w / s
+        min_y, max_y = oy - 1, oy + h / s
+        size = max(s - 1, 1)
+        for x, y, act in zip(self._xs, self._ys, self._active):
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                painter.fillRect(
+                    QRectF((x - ox) * s, (y - oy) * s, size, size),
+                    ACTIVE_COLOR if act else DESTROYED_COLOR,
+                )
+
+    def paintEvent(self, event):
+        w, h = self.width(), self.height()
+        painter = QPainter(self)
+        if self._scale >= DETAIL_SCALE:
+            painter.fillRect(0, 0, w, h, BACKGROUND)
+            self._render_detail(painter, w, h)
+        else:
+            if self._image is None or self._image.size() != self.size():
+                self._image = self._render_pixels(w, h)
+            painter.drawImage(0, 0, self._image)
+
+        # kollisionsplatser som kryss, en batch
+        if self._collision_sites:
+            s, ox, oy = self._scale, self._origin.x(), self._origin.y()
+            r = max(3.0, s / 2)
+            lines = []
+            for x, y in self._collision_sites:
+                cx, cy = (x - ox + 0.5) * s, (y - oy + 0.5) * s
+                if -r <= cx <= w + r and -r <= cy <= h + r:
+                    lines += [QPointF(cx - r, cy - r), QPointF(cx + r, cy + r),
+                              QPointF(cx - r, cy + r), QPointF(cx + r, cy - r)]
+            painter.setPen(QPen(COLLISION_COLOR, 1.5))
+            painter.drawLines(lines)
+        painter.end()
+
+    # === Pan / zoom ===
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag_start = (event.pos(), QPointF(self._origin))
+
+    def mouseMoveEvent(self, event):
+        if self._drag_start is not None:
+            start_pos, start_origin = self._drag_start
+            delta = event.pos() - start_pos
+            self._origin = QPointF(
+                start_origin.x() - delta.x() / self._scale,
+                start_origin.y() - delta.y() / self._scale,
+            )
+            self._invalidate()
+
+    def mouseReleaseEvent(self, event):
+        self._drag_start = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit_to_fleet()
+
+    def wheelEvent(self, event):
+        factor = 1.25 if event.angleDelta().y() > 0 else 0.8
+        pos = event.pos()
+        # håll världspunkten under muspekaren still
+        wx = self._origin.x() + pos.x() / self._scale
+        wy = self._origin.y() + pos.y() / self._scale
+        self._scale *= factor
+        self._origin = QPointF(wx - pos.x() / self._scale, wy - pos.y() / self._scale)
+        self._invalidate()
+
+    def resizeEvent(self, event):
+        self._invalidate()
+        super().resizeEvent(event)
@@ -1,16 +1,13 @@
 # src/main.py
-import sys, os, asyncio
+import sys, os
 
 # --- Ensure project root is in sys.path ---
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from src.config.paths import MOVEMENT_REPORTS_DIR
+from src.data.fleet_manifest import load_manifest
 from src.data.secrets_loader import SecretsLoader
-from src.core.nuke_activation import NukeActivation
-from src.core.sensor_manager import SensorManager
-from src.core.torpedo_system import TorpedoSystem
 
 
 def parse_speed_arg(default: float = 1.0) -> float:
@@ -25,24 +22,22 @@ def parse_speed_arg(default: float = 1.0) -> float:
 
 
 def run_sync(tick_delay: float):
-    from src.core.submarine import Submarine
     from src.data.file_reader import FileReader
     from src.core.movement_manager import MovementManager
-
-    drone_ids = [
-        f.replace(".txt", "")
-        for f in os.listdir(MOVEMENT_REPORTS_DIR)
-        if f.endswith(".txt")
-    ]
-    subs = [Submarine(id) for id in drone_ids]
+    from src.core.sensor_manager import SensorManager
 
     reader = FileReader()
+    # tick_delay är rundans period; schemaläggaren drar av rundans arbetstid
     manager = MovementManager(reader, tick_delay=tick_delay)
-    manager.load_submarines_from_generator(subs)
-    manager.run()
+    manager.load_submarines_from_generator(reader.load_all_movement_files())
+    sensor_manager = SensorManager(manager)
+    sensor_manager.attach_generators(manager.submarines.values())
+    manager.run(sensor_manager)
+    if manager.scheduler is not None:
+        print(f"Tick timing: {manager.scheduler.stats().describe()}")
     remaining_subs = list(manager.submarines.values())
-    post_run_analysis(remaining_subs)
-    show_menu(remaining_subs)
+    post_run_analysis(remaining_subs, sensor_manager)
+    show_menu(remaining_subs, sensor_manager)
 
 
 async def run_async(tick_delay: float):
@@ -50,11 +45,7 @@ async def run_async(tick_delay: float):
     from src.data.file_reader_async import AsyncFileReader
     from src.core.movement_manager_async import AsyncMovementManager
 
-    drone_ids = [
-        f.replace(".txt", "")
-        for f in os.listdir(MOVEMENT_REPORTS_DIR)
-        if f.endswith(".txt")
-    ]
+    drone_ids = load_manifest().drone_ids()
     subs = [Submarine(id) for id in drone_ids]
 
     reader = AsyncFileReader()
@@ -85,21 +76,38 @@ def main():
         run_sync(tick_delay)
     else:
         print("Kör i ASYNKRONT läge")
+        import asyncio
         asyncio.run(run_async(tick_delay))
 
-def post_run_analysis(subs):
+def write_sensor_analysis(sensor_manager, sub_id: str, output_path: str) -> bool:
+    """Skriver sensoranalysen för en ubåt från det som samlades in under körningen."""
+    counts = sensor_manager.pattern_counts.get(sub_id)
+    if counts is None:
+        return False
+    lines = [
+        f"Submarine: {sub_id}",
+        f"Readings: {sum(counts.values())}",
+        f"Sensor errors: {sensor_manager.error_totals[sub_id]}",
+        f"Unique patterns: {len(counts)}",
+    ]
+    lines += [f"{c}x {sensor_manager.pattern_string(pid)}" for pid, c in counts.most_common(5)]
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return True
+
+
+def post_run_analysis(subs, sensor_manager):
+    from src.core.nuke_activation import NukeActivation
+    from src.core.torpedo_system import TorpedoSystem
+
     print("\n=== Alla ubåtar har nått sina slutpositioner ===\n")
 
-    # --- Sensoranalys ---
-    sensor_manager = SensorManager()
+    # --- Sensoranalys (avläsningarna gjordes redan under körningen) ---
+    sensor_manager.final_summary()
     for sub in subs:
         output_path = f"logs/sensor_analysis_{sub.id}.txt"
-        sensor_manager.process_sensor_by_serial(
-            serial_number=sub.id,
-            data_folder="files/Sensordata",
-            output_path=output_path
-        )
-        print(f"Sensoranalys sparad för {sub.id} → {output_path}")
+        if write_sensor_analysis(sensor_manager, sub.id, output_path):
+            print(f"Sensoranalys sparad för {sub.id} → {output_path}")
 
     # --- Torped-check ---
     torpedo_system = TorpedoSystem()
@@ -114,14 +122,18 @@ def post_run_analysis(subs):
 
     nuke = NukeActivation(secrets_loader=secrets, torpedo_system=torpedo_system)
 
-    # Här kan man aktivera för en specifik ubåt (exempel första)
+    # Här kan man aktivera för en specifik ubåt (exempel första);
+    # skarp aktivering kräver en hash och görs från menyn
     if subs:
         target = subs[0]
-        nuke.activate_nuke(target.id, subs, target)
+        allowed = nuke.allowed_to_activate(subs, target)
+        print(f"Nuke för {target.id}: {'tillåten' if allowed else 'blockerad (friendly fire-risk)'}")
+
 
+def show_menu(subs, sensor_manager):
+    from src.core.nuke_activation import NukeActivation
+    from src.core.torpedo_system import TorpedoSystem
 
-def show_menu(subs):
-    sensor_manager = SensorManager()
     torpedo_system = TorpedoSystem()
     secrets = SecretsLoader()
     secrets.load_secrets()
@@ -142,12 +154,10 @@ def show_menu(subs):
         if choice == "1":
             serial = input("Ange ubåtens serienummer (XXXXXXXX-XX): ").strip()
             output_path = f"logs/sensor_analysis_{serial}.txt"
-            sensor_manager.process_sensor_by_serial(
-                serial_number=serial,
-                data_folder="files/Sensordata",
-                output_path=output_path
-            )
-            print(f"✅ Sensoranalys sparad till {output_path}")
+            if write_sensor_analysis(sensor_manager, serial, output_path):
+                print(f"✅ Sensoranalys sparad till {output_path}")
+            else:
+                print("⚠️ Ingen sensordata för den ubåten.")
 
         elif choice == "2":
             for sub in subs:
@@ -160,7 +170,11 @@ def show_menu(subs):
             if not found:
                 print("⚠️ Ubåten hittades inte i listan.")
                 continue
-            nuke.activate_nuke(serial, subs, found)
+            provided_hash = input("Ange aktiveringshash: ").strip()
+            if nuke.activate_nuke(serial, subs, found, provided_hash):
+                print(f"☢️ Nuke aktiverad för {serial}")
+            else:
+                print("⚠️ Aktiveringen nekades (se nukes.log).")
 
         elif choice == "4":
             print("Avslutar menyn.")
@@ -1,22 +1,14 @@
 import os, sys
-import concurrent.futures
 import argparse
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from src.config.paths import MOVEMENT_REPORTS_DIR
+from src.data.fleet_manifest import load_manifest
 
-from src.gui.control_gui import launch_gui
-from src.data.file_reader import FileReader
-from src.data.secrets_loader import SecretsLoader
-from src.core.submarine import Submarine
-from src.data.file_reader import FileReader
-from src.core.movement_manager import MovementManager
-from src.core.sensor_manager import SensorManager
-from src.core.torpedo_system import TorpedoSystem
-from src.core.nuke_activation import NukeActivation
+# Tunga moduler (PyQt5, simuleringskärnan) importeras först när de behövs,
+# så att `--help` och CLI-läget startar utan att ladda GUI:t.
 
 
 def main():
@@ -27,16 +19,17 @@ def main():
 
     print("Startar Ubåtscentralen...")
 
+    from src.data.file_reader import FileReader
+    from src.data.secrets_loader import SecretsLoader
+    from src.core.submarine import Submarine
+    from src.core.movement_manager import MovementManager
+
     secrets = SecretsLoader()
     if not secrets.load_secrets():
         print("Kunde inte ladda hemligheter. Avslutar.")
         sys.exit(1)
 
-    drone_ids = [
-        f.replace(".txt", "")
-        for f in os.listdir(MOVEMENT_REPORTS_DIR)
-        if f.endswith(".txt")
-    ]
+    drone_ids = load_manifest().drone_ids()
     subs = [Submarine(id) for id in drone_ids]
 
     reader = FileReader()
@@ -44,16 +37,75 @@ def main():
     manager.load_submarines(subs)
     manager.run()
 
-def run_cli():
+def run_replay(path, speed=None):
+    """Spelar upp en inspelning utan GUI och skriver en sammanfattning."""
+    from src.core.replay import ReplayPlayer
+
+    with ReplayPlayer(path) as player:
+        rounds = player.play(speed=speed)
+        snapshot = player.snapshot
+        print(f"Replayed {rounds} rounds: {snapshot.active_count} active submarines, "
+              f"{snapshot.collision_count} collisions")
+
+def run_cli(pipeline=False, record=None, export=None, event_driven=False, cadence=None):
     print("Running simulation in CLI mode...")
 
+    from src.data.file_reader import FileReader
+    from src.data.secrets_loader import SecretsLoader
+    from src.core.movement_manager import MovementManager
+    from src.core.sensor_manager import SensorManager
+    from src.core.torpedo_system import TorpedoSystem
+    from src.core.nuke_activation import NukeActivation
+    from src.data.prefetcher import Prefetcher
+    from src.data.event_store import EventStore
+
     reader = FileReader()
-    manager = MovementManager(reader, tick_delay=0.0)
+    prefetcher = Prefetcher()
+    manager = MovementManager(reader, tick_delay=0.0, prefetcher=prefetcher)
     manager.load_submarines_from_generator(reader.load_all_movement_files())
 
-    sensor_manager = SensorManager(reader, manager)
-
-    manager.run(sensor_manager)
+    if pipeline:
+        # sensorsteget i en egen process, överlappar med nästa rundas rörelser
+        from src.core.sensor_pipeline import PipelinedSensorManager
+        sensor_manager = PipelinedSensorManager(manager)
+    else:
+        sensor_manager = SensorManager(manager)
+        sensor_manager.attach_generators(manager.submarines.values())
+
+    events = EventStore()
+    recorder = exporter = None
+    if event_driven:
+        # händelsestyrd motor: varje sub rör sig i sin egen takt (--cadence), inga tomma rundor
+        from src.core.event_scheduler import EventScheduler, load_periods
+        periods = load_periods(cadence) if cadence else {}
+        scheduler = EventScheduler.from_manager(manager, periods, sensor_manager=sensor_manager)
+        events.attach(scheduler, label="cli-events")
+        ticks = scheduler.run()
+        print(f"Event simulation: {ticks} event ticks, {scheduler.events} sub moves, "
+              f"{len(scheduler.collisions)} collisions (last tick {scheduler.time})")
+    else:
+        from src.core.trajectory_bounds import build_bounds
+        from src.core.near_miss import NearMissPredictor
+        manager.bounds = build_bounds(manager.submarines, reader=reader)
+        NearMissPredictor().attach(manager)  # loggar förutsedda nära-ögat-par efter varje runda
+        events.attach(manager, label="cli")  # kollisioner och slutade banor, sökbara med src/data/event_store.py
+        if record:
+            from src.core.replay import ReplayRecorder
+            recorder = ReplayRecorder(record)
+            recorder.attach(manager)
+        if export:
+            from src.core.trajectory_export import TrajectoryExporter
+            exporter = TrajectoryExporter(export)
+            exporter.attach(manager)
+        manager.run(sensor_manager)
+
+    sensor_manager.final_summary()
+    prefetcher.close()
+    events.close()
+    if recorder is not None:
+        recorder.close()
+    if exporter is not None:
+        exporter.close()
 
     # När alla rundor är klara → kör torped/nuke-steg
     torpedos = TorpedoSystem()
@@ -68,9 +120,31 @@ def run_cli():
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--gui", action="store_true", help="Run with GUI")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Process sensor data in a separate process, overlapping with movement")
+    parser.add_argument("--record", metavar="FILE", help="Record the run for later replay")
+    parser.add_argument("--export", metavar="DIR", help="Export per-round fleet state as .npy columns")
+    parser.add_argument("--replay", metavar="FILE", help="Play back a recording instead of simulating")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="Replay speed in rounds per second (default: as fast as possible)")
+    parser.add_argument("--events", action="store_true",
+                        help="Use the event-driven engine (per-submarine cadence) instead of lockstep rounds")
+    parser.add_argument("--cadence", metavar="FILE",
+                        help="JSON object {sub_id: period} for --events (default: every sub moves every tick)")
     args = parser.parse_args()
-
-    if args.gui:
+    if args.events and (args.pipeline or args.record or args.export):
+        parser.error("--events cannot be combined with --pipeline, --record or --export")
+    if args.cadence and not args.events:
+        parser.error("--cadence requires --events")
+
+    if args.replay and args.gui:
+        from src.gui.control_gui import launch_replay
+        launch_replay(args.replay, args.speed)
+    elif args.replay:
+        run_replay(args.replay, args.speed)
+    elif args.gui:
+        from src.gui.control_gui import launch_gui
         launch_gui()
     else:
-        run_cli()
+        run_cli(pipeline=args.pipeline, record=args.record, export=args.export,
+                event_driven=args.events, cadence=args.cadence)
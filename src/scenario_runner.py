@@ -0,0 +1,172 @@
+# src/scenario_runner.py
+import argparse
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# --- Ensure project root is in sys.path ---
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def run_scenario(root: str) -> Dict[str, object]:
+    """
+    Runs the whole pipeline for one scenario root (same layout as files/):
+    movement simulation with sensors, then torpedo and nuke checks. Logs
+    go to <root>/Logs. Runs in its own process, so the path and log
+    overrides never leak.
+    """
+    from src.config import paths
+    from src.utils.logger import set_log_dir
+    paths.set_files_dir(root)
+    set_log_dir(paths.LOG_DIR)  # egna loggar per scenario, inte delade logs/*.log
+
+    from src.core.movement_manager import MovementManager
+    from src.core.nuke_activation import NukeActivation
+    from src.core.sensor_manager import SensorManager
+    from src.core.torpedo_system import TorpedoSystem
+    from src.data.file_reader import FileReader
+    from src.data.secrets_loader import SecretsLoader
+
+    reader = FileReader()
+    manager = MovementManager(reader, tick_delay=0.0)
+    manager.load_submarines_from_generator(reader.load_all_movement_files())
+    sensor_manager = SensorManager(manager)
+    sensor_manager.attach_generators(manager.submarines.values())
+    manager.run(sensor_manager)
+
+    subs = list(manager.submarines.values())
+    active = [s for s in subs if s.is_active]
+
+    torpedos = TorpedoSystem()
+    friendly_fire = 0
+    for sub in active:
+        report = torpedos.get_friendly_fire_report(active, sub)
+        torpedos.log_torpedo_launch(sub, report)
+        friendly_fire += not all(info["safe"] for info in report.values())
+
+    secrets = SecretsLoader(str(paths.secret_key_file_path()), str(paths.activation_codes_file_path()))
+    secrets.load_secrets()
+    nuke = NukeActivation(secrets_loader=secrets, torpedo_system=torpedos)
+    nuke_allowed = sum(nuke.allowed_to_activate(active, sub) for sub in active)
+
+    return {
+        "rounds": manager.snapshot.round_number,
+        "submarines": len(subs),
+        "active": len(active),
+        "collision_count": len(manager.collisions),
+        "collisions": [[r, list(pos), a, b] for r, pos, a, b in manager.collisions],
+        "final_positions": {s.id: [*s.position, s.is_active] for s in subs},
+        "sensor": sensor_manager.summary(),
+        "torpedo_friendly_fire_risks": friendly_fire,
+        "nuke_allowed": nuke_allowed,
+    }
+
+
+def _child(target: Callable[[str], Dict], root: str, conn) -> None:
+    sys.stdout = open(os.devnull, "w")  # ubåtarna skriver varje drag till stdout
+    try:
+        conn.send(("ok", target(root)))
+    except BaseException:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+class ScenarioRunner:
+    """
+    Runs independent scenarios in parallel, one process per scenario.
+
+    At most `workers` processes run at once. A process that exceeds
+    `timeout` seconds is terminated and reported as "timeout"; a failing
+    scenario is reported as "error" with its traceback. Results come back
+    in the order of the given roots.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None,
+                 target: Callable[[str], Dict] = run_scenario):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.timeout = timeout
+        self.target = target
+
+    def run(self, roots: List[str]) -> List[Dict[str, object]]:
+        results: List[Optional[Dict[str, object]]] = [None] * len(roots)
+        pending = deque(enumerate(roots))
+        running = {}  # index -> (process, conn, start)
+
+        def finish(index, status, payload, started):
+            entry = {"root": str(roots[index]), "status": status, "seconds": round(time.monotonic() - started, 3)}
+            if status == "ok":
+                entry.update(payload)
+            elif payload:
+                entry["error"] = payload
+            results[index] = entry
+            print(f"[{status}] {roots[index]} ({entry['seconds']} s)")
+
+        while pending or running:
+            while pending and len(running) < self.workers:
+                index, root = pending.popleft()
+                parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+                proc = multiprocessing.Process(target=_child, args=(self.target, str(root), child_conn), daemon=True)
+                proc.start()
+                child_conn.close()
+                running[index] = (proc, parent_conn, time.monotonic())
+
+            waitables = [conn for _, conn, _ in running.values()] + [p.sentinel for p, _, _ in running.values()]
+            multiprocessing.connection.wait(waitables, timeout=0.1)
+
+            for index, (proc, conn, started) in list(running.items()):
+                if conn.poll():
+                    try:
+                        status, payload = conn.recv()
+                    except EOFError:
+                        status, payload = "error", f"process exited with code {proc.exitcode}"
+                    proc.join()
+                elif not proc.is_alive():
+                    status, payload = "error", f"process exited with code {proc.exitcode}"
+                elif self.timeout is not None and time.monotonic() - started > self.timeout:
+                    proc.terminate()
+                    proc.join()
+                    status, payload = "timeout", f"exceeded {self.timeout} s"
+                else:
+                    continue
+                conn.close()
+                del running[index]
+                finish(index, status, payload, started)
+
+        return results
+
+
+def write_results(path: str, results: List[Dict[str, object]], **meta) -> None:
+    data = {"created": datetime.now().isoformat(timespec="seconds"), **meta, "scenarios": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run several scenario directories in parallel.")
+    parser.add_argument("roots", nargs="+", help="scenario roots (same layout as files/)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="parallel processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per scenario before it is stopped")
+    parser.add_argument("-o", "--output", default="scenario_results.json", help="result file (JSON)")
+    args = parser.parse_args(argv)
+
+    runner = ScenarioRunner(args.workers, args.timeout)
+    results = runner.run(args.roots)
+    write_results(args.output, results, workers=runner.workers, timeout=args.timeout)
+
+    failed = sum(r["status"] != "ok" for r in results)
+    print(f"{len(results) - failed}/{len(results)} scenarios ok → {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+PATTERN_LEN = 208
+PACKED_LEN = PATTERN_LEN // 8  # 26 bytes per 208-bit avläsning
+
+
+def pack_pattern(pattern: str) -> int:
+    """Packs a string of '0'/'1' into an int (first character = most significant bit)."""
+    return int(pattern, 2)
+
+
+def unpack_pattern(value: int, length: int = PATTERN_LEN) -> str:
+    """Inverse of pack_pattern: returns the '0'/'1' string of `length` bits."""
+    return format(value, f"0{length}b")
+
+
+def popcount(value: int) -> int:
+    """Number of set bits (working sensors) in a packed pattern."""
+    return value.bit_count()
+
+
+def hamming(a: int, b: int) -> int:
+    """Hamming distance between two packed patterns."""
+    return (a ^ b).bit_count()
@@ -0,0 +1,107 @@
+import os
+import re
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_LEVEL_RE = re.compile(r"\[(DEBUG|INFO|WARNING|ERROR|CRITICAL)\]")
+
+
+class LogLine(NamedTuple):
+    logger: str
+    level: str
+    text: str
+
+
+class LogTailer:
+    """
+    Follows a set of log files from their last read offset.
+
+    Only bytes appended since the previous `poll` are read, and only the
+    latest `max_lines` lines are kept (ring buffer), so the cost of a poll is
+    proportional to what was written, never to the size of the file. A
+    file that has grown by more than one poll may read is skipped ahead to
+    its newest bytes, so the view never falls behind a fast writer.
+    """
+
+    def __init__(self, files: Dict[str, str], max_lines: int = 10_000,
+                 backlog_bytes: int = 64 * 1024):
+        self.files = dict(files)
+        self.buffer: deque = deque(maxlen=max_lines)
+        self.skipped_bytes = 0  # överhoppat när en fil växte snabbare än vi hann läsa
+        self._offsets: Dict[str, int] = {}
+        self._partial: Dict[str, bytes] = {}
+        # börja nära slutet: visa bara de senaste raderna av redan stora filer
+        for name, path in self.files.items():
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+            self._offsets[name] = max(0, size - backlog_bytes)
+            self._partial[name] = b""
+            if self._offsets[name]:
+                self._skip_to_line_start(name, path)
+
+    def _skip_to_line_start(self, name: str, path: str):
+        """Moves the offset forward to the next line start (unless it already is one)."""
+        with open(path, "rb") as f:
+            f.seek(self._offsets[name] - 1)
+            if f.read(1) != b"\n":
+                f.readline()
+            self._offsets[name] = f.tell()
+
+    @staticmethod
+    def parse(logger: str, raw: str) -> LogLine:
+        m = _LEVEL_RE.search(raw)
+        return LogLine(logger, m.group(1) if m else "INFO", raw)
+
+    def poll(self, max_bytes: int = 1 << 20) -> List[LogLine]:
+        """
+        Reads what was appended to each file since the last poll. Returns the
+        new lines. If more than `max_bytes` were appended, the older part is
+        skipped and only the last `max_bytes` (from a line start) are read.
+        """
+        new_lines: List[LogLine] = []
+        for name, path in self.files.items():
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            offset = self._offsets[name]
+            if size < offset:
+                # filen har trunkerats eller roterats → börja om
+                offset, self._partial[name] = 0, b""
+            if size - offset > max_bytes:
+                # vi ligger efter skrivaren → hoppa till de senaste raderna
+                self.skipped_bytes += size - max_bytes - offset
+                self._offsets[name], self._partial[name] = size - max_bytes, b""
+                self._skip_to_line_start(name, path)
+                offset = self._offsets[name]
+            if size == offset:
+                continue
+
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read(size - offset)
+            self._offsets[name] = offset + len(data)
+
+            data = self._partial[name] + data
+            lines = data.split(b"\n")
+            self._partial[name] = lines.pop()  # ofullständig sista rad väntar till nästa poll
+            for raw in lines:
+                if raw:
+                    new_lines.append(self.parse(name, raw.decode("utf-8", errors="replace").rstrip("\r")))
+
+        self.buffer.extend(new_lines)
+        return new_lines
+
+    @staticmethod
+    def matches(line: LogLine, loggers: Optional[Iterable[str]] = None, min_level: str = "DEBUG") -> bool:
+        if loggers is not None and line.logger not in loggers:
+            return False
+        return LEVELS.index(line.level) >= LEVELS.index(min_level)
+
+    def filtered(self, loggers: Optional[Iterable[str]] = None, min_level: str = "DEBUG") -> List[LogLine]:
+        """Lines in the ring buffer that match the filter (no file access)."""
+        loggers = set(loggers) if loggers is not None else None
+        return [line for line in self.buffer if self.matches(line, loggers, min_level)]
@@ -2,27 +2,73 @@ import logging
 import os
 from datetime import datetime
 
-# Skapa loggmapp
+# Loggmappen skapas först när något faktiskt loggas (se LazyFileHandler)
 LOG_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "logs")
-os.makedirs(LOG_DIR, exist_ok=True)
+
+# logger-namn -> loggfil, används av loggvyn i GUI:t
+LOG_FILES: dict = {}
+# logger-namn -> (filnamn, handler), så att set_log_dir kan peka om dem
+_FILE_HANDLERS: dict = {}
+
+class LazyFileHandler(logging.FileHandler):
+    """
+    FileHandler that neither creates the log directory nor opens the file
+    until the first record is emitted, so importing `src` does no file I/O.
+    """
+
+    def __init__(self, filename, encoding="utf-8"):
+        super().__init__(filename, encoding=encoding, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+    def retarget(self, filename) -> None:
+        """Closes the current file; the next record is written to `filename`."""
+        self.acquire()
+        try:
+            if self.stream is not None:
+                self.flush()
+                self.stream.close()
+                self.stream = None
+            self.baseFilename = os.path.abspath(filename)
+        finally:
+            self.release()
+
 
 def create_logger(name: str, filename: str, level=logging.INFO) -> logging.Logger:
     """Skapar en logger med egen fil."""
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
+    log_path = os.path.join(LOG_DIR, filename)
+    LOG_FILES[name] = log_path
+
     if not logger.handlers:
-        log_path = os.path.join(LOG_DIR, filename)
-        handler = logging.FileHandler(log_path, encoding="utf-8")
+        handler = LazyFileHandler(log_path)
         formatter = logging.Formatter(
             "%(asctime)s [%(levelname)s] %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
         handler.setFormatter(formatter)
         logger.addHandler(handler)
+        _FILE_HANDLERS[name] = (filename, handler)
 
     return logger
 
+
+def set_log_dir(log_dir) -> str:
+    """
+    Pekar om projektets loggfiler till `log_dir` (t.ex. ett scenarios
+    Logs/) och returnerar den tidigare katalogen. Gäller hela processen.
+    """
+    global LOG_DIR
+    previous, LOG_DIR = LOG_DIR, os.fspath(log_dir)
+    for name, (filename, handler) in _FILE_HANDLERS.items():
+        LOG_FILES[name] = os.path.join(LOG_DIR, filename)
+        handler.retarget(LOG_FILES[name])
+    return previous
+
 # === Projektets loggers ===
 file_logger         = create_logger("file_logger",         "movement_files.log")
 movement_logger     = create_logger("movement_logger",     "movements.log")
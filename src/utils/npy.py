@@ -0,0 +1,104 @@
+import struct
+import sys
+from array import array
+from typing import BinaryIO, List, Sequence, Tuple
+
+# array-typkod -> NumPy dtype-beskrivning (little-endian)
+DTYPES = {
+    "b": "|i1", "B": "|u1",
+    "h": "<i2", "H": "<u2",
+    "i": "<i4", "I": "<u4",
+    "q": "<i8", "Q": "<u8",
+    "f": "<f4", "d": "<f8",
+}
+MAGIC = b"\x93NUMPY\x01\x00"
+HEADER_LEN = 128  # fast headerstorlek så att formen kan skrivas om i efterhand
+
+
+def npy_header(descr: str, shape: Tuple[int, ...]) -> bytes:
+    """Builds a version 1.0 .npy header padded to HEADER_LEN bytes."""
+    shape_str = "(" + ", ".join(str(n) for n in shape) + ("," if len(shape) == 1 else "") + ")"
+    text = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': {shape_str}, }}"
+    pad = HEADER_LEN - len(MAGIC) - 2 - len(text) - 1
+    if pad < 0:
+        raise ValueError(f"npy header too long for shape {shape}")
+    text = text + " " * pad + "\n"
+    return MAGIC + struct.pack("<H", len(text)) + text.encode("latin1")
+
+
+def write_array(f: BinaryIO, data: array) -> None:
+    """Writes the raw little-endian bytes of `data`."""
+    if sys.byteorder != "little" and data.itemsize > 1:
+        data = array(data.typecode, data)
+        data.byteswap()
+    data.tofile(f)
+
+
+def save_npy(path, data: array, shape: Tuple[int, ...] = None) -> None:
+    """Saves an array.array as a .npy file loadable (and mmap-able) with numpy.load."""
+    descr = DTYPES[data.typecode]
+    if descr[1:] != f"{descr[1]}{data.itemsize}":
+        raise ValueError(f"typecode {data.typecode!r} has itemsize {data.itemsize} on this platform")
+    with open(path, "wb") as f:
+        f.write(npy_header(descr, shape or (len(data),)))
+        write_array(f, data)
+
+
+def save_npy_strings(path, strings: Sequence[str]) -> None:
+    """Saves strings as a fixed-width unicode ('<U') .npy array."""
+    width = max((len(s) for s in strings), default=1) or 1
+    with open(path, "wb") as f:
+        f.write(npy_header(f"<U{width}", (len(strings),)))
+        f.write(b"".join(s.ljust(width, "\0").encode("utf-32-le") for s in strings))
+
+
+class NpyAppender:
+    """
+    A 1-D .npy column that grows on disk: `append` writes the raw values at
+    the end and rewrites the fixed-size header with the new length, so the
+    file is a valid (mmap-able) array after every append.
+    """
+
+    def __init__(self, path, typecode: str):
+        self.path = path
+        self.typecode = typecode
+        self.descr = DTYPES[typecode]
+        self.length = 0
+        self._f = open(path, "wb")
+        self._f.write(npy_header(self.descr, (0,)))
+
+    def append(self, data: array) -> None:
+        write_array(self._f, data)
+        self.length += len(data)
+        self._f.seek(0)
+        self._f.write(npy_header(self.descr, (self.length,)))
+        self._f.seek(0, 2)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def load_npy(path) -> Tuple[array, Tuple[int, ...]]:
+    """
+    Minimal reader for files written by save_npy, NpyAppender and
+    save_npy_strings (a list of str for '<U' arrays). Stdlib only, used by
+    tests and tools.
+    """
+    import ast
+
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a version 1.0 .npy file")
+        (header_len,) = struct.unpack("<H", f.read(2))
+        header = ast.literal_eval(f.read(header_len).decode("latin1"))
+        if header["descr"].startswith("<U"):
+            width = int(header["descr"][2:])
+            raw = f.read().decode("utf-32-le")
+            strings: List[str] = [raw[i:i + width].rstrip("\0") for i in range(0, len(raw), width)]
+            return strings, tuple(header["shape"])
+        typecode = next(tc for tc, d in DTYPES.items() if d == header["descr"])
+        data = array(typecode)
+        data.frombytes(f.read())
+    if sys.byteorder != "little" and data.itemsize > 1:
+        data.byteswap()
+    return data, tuple(header["shape"])
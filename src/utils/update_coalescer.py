@@ -0,0 +1,62 @@
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+
+class FleetSummary(NamedTuple):
+    round_number: int
+    active_subs: int
+    collisions_total: int
+    rounds_per_sec: float        # under senaste intervallet
+    collisions_in_interval: int
+    rounds_in_interval: int
+
+
+class UpdateCoalescer:
+    """
+    Latest-value slot between the simulation thread and the GUI.
+
+    The worker calls `publish` every round (cheap, overwrites the previous
+    value); the GUI calls `take` from a fixed-rate timer and gets at most one
+    summary per frame, with stats for everything that happened since the
+    previous frame. Stale intermediate rounds are simply never shown.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._latest = None          # (round_number, active_subs, collisions_total)
+        self._dirty = False
+        self._last_round = 0
+        self._last_collisions = 0
+        self._last_time = clock()
+
+    def publish(self, round_number: int, active_subs: int, collisions_total: int) -> None:
+        """Called from the simulation thread after each round."""
+        with self._lock:
+            self._latest = (round_number, active_subs, collisions_total)
+            self._dirty = True
+
+    def take(self) -> Optional[FleetSummary]:
+        """Called from the GUI thread; returns None if nothing new was published."""
+        with self._lock:
+            if not self._dirty:
+                return None
+            round_number, active_subs, collisions_total = self._latest
+            self._dirty = False
+
+        now = self._clock()
+        elapsed = now - self._last_time
+        rounds = round_number - self._last_round
+        summary = FleetSummary(
+            round_number=round_number,
+            active_subs=active_subs,
+            collisions_total=collisions_total,
+            rounds_per_sec=rounds / elapsed if elapsed > 0 else 0.0,
+            collisions_in_interval=collisions_total - self._last_collisions,
+            rounds_in_interval=rounds,
+        )
+        self._last_round = round_number
+        self._last_collisions = collisions_total
+        self._last_time = now
+        return summary
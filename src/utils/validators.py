@@ -13,7 +13,7 @@ class Validator:
         if len(serial_number) != 11: # assuming serial number length is 11
             return False
         
-        if serial_number[8] == "-": # assuming 9th character is a dash
+        if serial_number[8] != "-": # assuming 9th character is a dash
             return False
         
         left, right = serial_number[:8], serial_number[9:] # split into two parts
@@ -52,7 +52,7 @@ class Validator:
 
 # Example tests
 if __name__ == "__main__":
-    print(Validator.validate_serial_number("12345678-901")) # True
+    print(Validator.validate_serial_number("12345678-90")) # True
     print(Validator.validate_serial_number("12345678901")) # False              
     print(Validator.validate_movement_command("up")) # True
     print(Validator.validate_movement_command("left")) # False  
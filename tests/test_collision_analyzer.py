@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.collision_analyzer import CollisionAnalyzer
+from src.core.movement_manager import MovementManager
+from src.core.submarine import Submarine
+
+
+def run_engine(fleet):
+    manager = MovementManager(reader=None)
+    for sub_id, moves in fleet.items():
+        sub = Submarine(sub_id)
+        sub.attach_generator(iter(moves))
+        manager.submarines[sub_id] = sub
+    manager.run(Mock())
+    return manager
+
+
+def analyze(fleet, window):
+    analyzer = CollisionAnalyzer(window)
+    for sub_id, moves in fleet.items():
+        analyzer.add(sub_id, moves)
+    return analyzer.analyze()
+
+
+@pytest.mark.parametrize("seed,window", [(0, 1), (1, 4), (2, 16), (3, 256), (4, 7)])
+def test_matches_round_engine(seed, window, capsys):
+    rng = random.Random(seed)
+    fleet = {
+        f"S{i:02}": [(rng.choice(("up", "down", "forward")), rng.randint(0, 2))
+                     for _ in range(rng.randint(0, 50))]
+        for i in range(60)
+    }
+
+    engine = run_engine(fleet)
+    result = analyze(fleet, window)
+
+    assert result.collisions == engine.collisions
+    assert set(result.destroyed) == {s.id for s in engine.submarines.values() if not s.is_active}
+
+
+def test_three_subs_in_one_cell_and_cascade():
+    fleet = {
+        "a": [("forward", 1), ("forward", 1)],
+        "b": [("forward", 1)],
+        "c": [("forward", 1), ("forward", 1)],
+        "d": [("up", 1), ("forward", 2), ("down", 1)],
+    }
+    result = analyze(fleet, window=2)
+
+    # runda 1: b krockar med a och c tar cellen; runda 3 når d (2, 0) där c står kvar
+    assert result.collisions == [(1, (1, 0), "b", "a"), (3, (2, 0), "d", "c")]
+    assert result.destroyed == {"a": 1, "b": 1, "c": 3, "d": 3}
+    assert result.rounds == 3
+
+
+def test_meeting_with_destroyed_sub_is_averted():
+    fleet = {
+        "a": [("forward", 1), ("forward", 1)],
+        "b": [("forward", 1)],
+        "c": [("up", 1), ("forward", 2), ("down", 1)],
+    }
+    result = analyze(fleet, window=2)
+
+    # a förstörs i runda 1 och kan inte längre möta c på (2, 0) i runda 3
+    assert result.collisions == [(1, (1, 0), "b", "a")]
+    assert result.averted == [(3, (2, 0), ("a", "c"))]
+    assert result.rounds == 4
@@ -0,0 +1,110 @@
+import os
+import random
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.event_scheduler import EventScheduler
+from src.core.movement_manager import MovementManager
+from src.core.submarine import Submarine
+
+
+def random_fleet(seed, count=30, max_moves=40):
+    rng = random.Random(seed)
+    return {
+        f"S{i}": [(rng.choice(("up", "down", "forward")), rng.randint(0, 3))
+                  for _ in range(rng.randint(1, max_moves))]
+        for i in range(count)
+    }
+
+
+def make_subs(moves_by_sub):
+    subs = []
+    for sub_id, moves in moves_by_sub.items():
+        sub = Submarine(sub_id)
+        sub.attach_generator(iter(moves))
+        subs.append(sub)
+    return subs
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_uniform_cadence_matches_lockstep_rounds(seed, capsys):
+    fleet = random_fleet(seed)
+
+    manager = MovementManager(reader=None)
+    for sub in make_subs(fleet):
+        manager.submarines[sub.id] = sub
+    manager.run(Mock())
+
+    scheduler = EventScheduler()
+    for sub in make_subs(fleet):
+        scheduler.add(sub)
+    scheduler.run()
+
+    assert scheduler.collisions == manager.collisions
+    assert {s.id: (s.position, s.is_active) for s in scheduler.submarines.values()} == \
+           {s.id: (s.position, s.is_active) for s in manager.submarines.values()}
+
+
+def test_jumps_over_idle_ticks():
+    slow, fast = make_subs({"slow": [("forward", 1)] * 3, "fast": [("down", 1)] * 3})
+    scheduler = EventScheduler()
+    scheduler.add(slow, period=1000)
+    scheduler.add(fast, period=1)
+
+    ticks = scheduler.run()
+
+    # 3 drag + ett steg som upptäcker att dragen är slut, per sub – inte 4000 rundor
+    assert ticks == 4 + 4
+    assert scheduler.time == 4000
+    assert slow.position == (3, 0)
+
+
+def test_stationary_sub_is_hit_by_a_mover():
+    waiting, mover = make_subs({"waiting": [("forward", 2)] * 2, "mover": [("forward", 1), ("forward", 1)]})
+    scheduler = EventScheduler()
+    scheduler.add(waiting, period=10)
+    scheduler.add(mover, period=1, phase=10)
+
+    scheduler.run()
+
+    # waiting står på (2, 0) från tick 10; mover kommer dit på tick 12
+    assert scheduler.collisions == [(12, (2, 0), "mover", "waiting")]
+    assert not waiting.is_active and not mover.is_active
+
+
+def test_rejects_invalid_period():
+    with pytest.raises(ValueError):
+        EventScheduler().add(Submarine("x"), period=0)
+
+
+def test_sensor_manager_reads_once_per_move_of_active_subs():
+    a, b, c = make_subs({"a": [("forward", 1)] * 2, "b": [("forward", 1)] * 2, "c": [("down", 1)] * 3})
+    sensors = Mock()
+    scheduler = EventScheduler(sensor_manager=sensors)
+    scheduler.add(a)
+    scheduler.add(b)          # krockar med a på tick 1
+    scheduler.add(c, period=2)
+
+    scheduler.run()
+
+    calls = [call.args for call in sensors.process_ids.call_args_list]
+    assert calls[0] == (1, [])              # a och b förstörda, c rör sig inte på tick 1
+    assert calls[1] == (2, ["c"])
+    assert sum(len(ids) for _, ids in calls) == 4   # c: 3 drag + steget som upptäcker slutet
+
+
+def test_load_periods(tmp_path):
+    from src.core.event_scheduler import load_periods
+
+    path = tmp_path / "cadence.json"
+    path.write_text('{"a": 3, "b": 1}')
+    assert load_periods(path) == {"a": 3, "b": 1}
+    path.write_text('{"a": 0}')
+    with pytest.raises(ValueError):
+        load_periods(path)
@@ -0,0 +1,80 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.movement_manager import MovementManager
+from src.core.submarine import Submarine
+from src.data.event_store import COLLISION, DESTROYED, RUNOUT, EventStore, main
+
+
+class NoSensors:
+    def process_next_round(self, round_counter, only_active=True):
+        pass
+
+
+def make_manager(paths_by_id):
+    manager = MovementManager(reader=None)
+    for sub_id, moves in paths_by_id.items():
+        sub = Submarine(sub_id)
+        sub.attach_generator(iter(moves))
+        manager.submarines[sub_id] = sub
+    return manager
+
+
+def run_recorded(tmp_path, capsys, batch_rounds=256):
+    manager = make_manager({
+        "a": [("forward", 1), ("forward", 2), ("forward", 1)],
+        "b": [("down", 1), ("forward", 2), ("up", 1)],
+        "c": [("forward", 3)],   # står kvar på (3, 0) i runda 2, då dragen tar slut
+        "d": [("down", 5), ("down", 5)],
+    })
+    store = EventStore(tmp_path / "events.sqlite", batch_rounds=batch_rounds)
+    run_id = store.attach(manager, label="test")
+    manager.run(NoSensors())
+    capsys.readouterr()
+    return manager, store, run_id
+
+
+def test_records_collisions_destructions_and_runouts(tmp_path, capsys):
+    manager, store, run_id = run_recorded(tmp_path, capsys)
+
+    assert manager.collisions == [(2, (3, 0), "c", "a")]
+    assert [(e.round, e.kind, e.sub_id, e.other_id, (e.x, e.y)) for e in store.query(COLLISION)] == [
+        (2, COLLISION, "c", "a", (3, 0))
+    ]
+    assert sorted(e.sub_id for e in store.query(DESTROYED)) == ["a", "c"]
+    # c tar slut i samma runda som den kolliderar; a förstörs innan dess
+    runouts = {e.sub_id: (e.round, (e.x, e.y)) for e in store.query(RUNOUT)}
+    assert runouts == {"c": (2, (3, 0)), "d": (3, (0, 10)), "b": (4, (2, 0))}
+    assert store.runs()[0][0] == run_id
+    store.close()
+
+
+def test_queries_by_sub_round_range_and_box(tmp_path, capsys):
+    _, store, run_id = run_recorded(tmp_path, capsys, batch_rounds=1)
+
+    assert store.collided_with("a") == [(2, "c", (3, 0))]
+    assert store.collided_with("c") == [(2, "a", (3, 0))]
+    assert store.collided_with("d") == []
+    assert [e.kind for e in store.query(rounds=(2, 2))] == [COLLISION, DESTROYED, DESTROYED, RUNOUT]
+    assert [e.sub_id for e in store.query(rounds=(3, 4))] == ["d", "b"]
+    assert {e.sub_id for e in store.query(box=(0, 5, 0, 20))} == {"d"}
+    assert store.query(run_id=run_id + 1) == []
+    store.close()
+
+
+def test_new_run_is_separate_and_cli_prints_it(tmp_path, capsys):
+    _, store, first = run_recorded(tmp_path, capsys)
+    store.close()
+    _, store, second = run_recorded(tmp_path, capsys)
+    assert second == first + 1
+    assert len(store.query(run_id=first)) == len(store.query(run_id=second))
+    store.close()
+
+    assert main(["--db", str(tmp_path / "events.sqlite"), "--sub", "a", "--kind", COLLISION]) == 0
+    out = capsys.readouterr().out
+    assert "Round 2: collision c with a at (3, 0)" in out
+    assert "1 events" in out
@@ -0,0 +1,81 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data import fleet_manifest
+from src.data.fleet_manifest import FleetManifest, count_lines
+
+
+def make_dirs(tmp_path):
+    moves, sensors = tmp_path / "moves", tmp_path / "sensors"
+    moves.mkdir()
+    sensors.mkdir()
+    (moves / "10053472-25.txt").write_text("forward 5\nup 2\ndown 1\n")
+    (moves / "bad-id.txt").write_text("forward 1")
+    (sensors / "10053472-25.txt").write_text("0101\n1111\n")
+    return moves, sensors
+
+
+def new_manifest(tmp_path, moves, sensors):
+    return FleetManifest(tmp_path / "manifest.json", moves, sensors)
+
+
+def test_count_lines_handles_missing_trailing_newline(tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_bytes(b"a\nb")
+    assert count_lines(f) == 2
+    f.write_bytes(b"")
+    assert count_lines(f) == 0
+
+
+def test_build_and_persist(tmp_path):
+    moves, sensors = make_dirs(tmp_path)
+    manifest = new_manifest(tmp_path, moves, sensors)
+    assert manifest.refresh()
+    manifest.save()
+
+    entry = manifest.get("10053472-25")
+    assert entry.movement_lines == 3 and entry.sensor_lines == 2 and entry.valid_serial
+    assert not manifest.get("bad-id").has_sensor
+    assert not manifest.get("bad-id").valid_serial
+    assert manifest.drone_ids(valid_only=True) == ["10053472-25"]
+    assert manifest.summary()["movement_lines"] == 3 + manifest.get("bad-id").movement_lines
+
+    reloaded = new_manifest(tmp_path, moves, sensors)
+    assert reloaded.load()
+    assert reloaded.entries == manifest.entries
+    assert not reloaded.refresh()
+
+
+def test_refresh_only_recounts_changed_files(tmp_path, monkeypatch):
+    moves, sensors = make_dirs(tmp_path)
+    manifest = new_manifest(tmp_path, moves, sensors)
+    manifest.refresh()
+
+    counted = []
+    real_count = fleet_manifest.count_lines
+    monkeypatch.setattr(fleet_manifest, "count_lines", lambda p: counted.append(p) or real_count(p))
+
+    (moves / "bad-id.txt").write_text("forward 1\nforward 2\n")
+    os.utime(moves / "bad-id.txt", ns=(1, 1))
+    assert manifest.refresh()
+    assert counted == [moves / "bad-id.txt"]
+    assert manifest.get("bad-id").movement_lines == 2
+
+    (moves / "bad-id.txt").unlink()
+    (moves / "20000000-01.txt").write_text("up 1\n")
+    assert manifest.refresh()
+    assert manifest.drone_ids() == ["10053472-25", "20000000-01"]
+
+
+def test_load_rejects_manifest_for_other_directories(tmp_path):
+    moves, sensors = make_dirs(tmp_path)
+    manifest = new_manifest(tmp_path, moves, sensors)
+    manifest.refresh()
+    manifest.save()
+
+    other = FleetManifest(tmp_path / "manifest.json", tmp_path, sensors)
+    assert not other.load()
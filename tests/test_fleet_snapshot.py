@@ -0,0 +1,69 @@
+import os
+import sys
+from unittest.mock import Mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.movement_manager import MovementManager
+from src.core.submarine import Submarine
+
+
+def make_manager(moves_by_sub):
+    manager = MovementManager(reader=None)
+    for sub_id, moves in moves_by_sub.items():
+        sub = Submarine(sub_id)
+        sub.attach_generator(iter(moves))
+        manager.submarines[sub_id] = sub
+    return manager
+
+
+def test_step_round_publishes_new_snapshot_and_keeps_old_one_intact():
+    manager = make_manager({
+        "A": [("forward", 2), ("down", 1)],
+        "B": [("forward", 2)],
+        "C": [("down", 5), ("down", 5)],
+    })
+    manager.step_round(1, Mock())
+    first = manager.snapshot
+
+    assert first.round_number == 1
+    assert first.get("C").position == (0, 5)
+    assert first.active_count == 1          # A och B kolliderade på (2, 0)
+    assert first.collision_count == 1
+
+    manager.step_round(2, Mock())
+    second = manager.snapshot
+
+    assert second is not first
+    assert second.get("C").position == (0, 10)
+    assert first.get("C").position == (0, 5)  # gamla snapshoten ändras inte
+    assert second.ids is first.ids
+
+
+def test_states_match_submarine_interface():
+    manager = make_manager({"A": [("up", 3)], "B": []})
+    manager.step_round(1, Mock())
+    states = manager.snapshot.states(active_only=True)
+
+    assert [(s.id, s.position, s.is_active) for s in states] == [("A", (0, -3), True), ("B", (0, 0), True)]
+    assert manager.snapshot.get("missing") is None
+
+
+def test_swapped_fleet_of_same_size_gets_new_ids():
+    manager = make_manager({"A": [("down", 1)], "B": [("down", 2)]})
+    manager.step_round(1, Mock())
+    old = manager.snapshot
+
+    manager.submarines = {}
+    for sub_id in ("X", "Y"):
+        sub = Submarine(sub_id)
+        sub.attach_generator(iter([("forward", 4)]))
+        manager.submarines[sub_id] = sub
+    manager.step_round(2, Mock())
+
+    assert manager.snapshot.ids == ("X", "Y")
+    assert manager.snapshot.get("A") is None
+    assert manager.snapshot.get("Y").position == (4, 0)
+    assert old.ids == ("A", "B")
@@ -0,0 +1,68 @@
+import os
+import random
+import sys
+from collections import Counter
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.heatmap import TrafficHeatmap
+from src.utils.npy import load_npy
+
+
+def brute_force_walk(rng, steps):
+    """Slumpar en väg och räknar varje svept cell för hand."""
+    x = y = 0
+    segments, visited = [], Counter()
+    for _ in range(steps):
+        direction, d = rng.choice(["up", "down", "forward"]), rng.randint(0, 4)
+        nx, ny = x, y
+        if direction == "forward":
+            nx += d
+        elif direction == "up":
+            ny -= d
+        else:
+            ny += d
+        if d == 0:
+            visited[(x, y)] += 1
+        step_x = (nx > x) - (nx < x)
+        step_y = (ny > y) - (ny < y)
+        for i in range(1, d + 1):
+            visited[(x + step_x * i, y + step_y * i)] += 1
+        segments.append(((x, y), (nx, ny)))
+        x, y = nx, ny
+    return segments, visited
+
+
+def test_swept_cells_match_brute_force():
+    rng = random.Random(7)
+    heatmap = TrafficHeatmap()
+    expected = Counter()
+    for _ in range(5):
+        segments, visited = brute_force_walk(rng, 60)
+        expected.update(visited)
+        for start, end in segments:
+            heatmap.add_segment(start, end)
+
+    min_x, min_y, width, height, counts = heatmap.grid()
+    for (x, y), n in expected.items():
+        assert counts[(y - min_y) * width + (x - min_x)] == n
+        assert heatmap.visits(x, y) == n
+    assert sum(counts) == sum(expected.values())
+
+
+def test_binned_grid_and_npy_export(tmp_path):
+    heatmap = TrafficHeatmap()
+    heatmap.add_segment((0, 0), (9, 0))    # celler x=1..9 på rad 0
+    heatmap.add_segment((9, 0), (9, 3))    # celler y=1..3 i kolumn 9
+
+    # gränserna börjar på x=1, så blocken är x=1..5 och x=6..10
+    min_x, _, width, height, counts = heatmap.grid(cell_size=5)
+    assert (min_x, width, height) == (1, 2, 1)
+    assert list(counts) == [5, 7]
+
+    heatmap.save_npy(tmp_path / "heat.npy", cell_size=5)
+    data, shape = load_npy(tmp_path / "heat.npy")
+    assert shape == (1, 2)
+    assert list(data) == [5, 7]
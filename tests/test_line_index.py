@@ -0,0 +1,74 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.config import paths
+from src.data.file_reader import FileReader
+from src.data.line_index import LineIndex
+
+
+def test_offsets_match_readlines(tmp_path):
+    source = tmp_path / "moves" / "SUB.txt"
+    source.parent.mkdir()
+    source.write_bytes(b"up 1\nforward 22\n\ndown 333")
+    index = LineIndex(tmp_path / "idx")
+
+    with open(source, "rb") as f:
+        expected = f.read().split(b"\n")
+    assert index.line_count(source) == len(expected)
+    for i, line in enumerate(expected, start=1):
+        assert index.read_line(source, i) == line.decode()
+    assert index.read_line(source, len(expected) + 1) is None
+    assert index.index_path(source).exists()
+
+
+def test_index_is_reused_from_disk_and_rebuilt_on_change(tmp_path):
+    source = tmp_path / "SUB.txt"
+    source.write_text("a\nb\n")
+    LineIndex(tmp_path / "idx").build(source)
+
+    fresh = LineIndex(tmp_path / "idx")
+    assert fresh.line_count(source) == 2
+
+    source.write_text("a\nb\nc\n")
+    assert fresh.line_count(source) == 3
+
+
+def test_read_movement_and_sensor_by_round(tmp_path, monkeypatch):
+    moves = tmp_path / "MovementReports"
+    sensors = tmp_path / "Sensordata"
+    moves.mkdir()
+    sensors.mkdir()
+    (moves / "SUB.txt").write_text("up 7\nforward 12\nbroken line here\n")
+    (sensors / "SUB.txt").write_text("01" * 104 + "\n" + "1" * 208 + "\n")
+    monkeypatch.setattr(paths, "MOVEMENT_REPORTS_DIR", moves)
+    monkeypatch.setattr(paths, "SENSOR_DATA_DIR", sensors)
+
+    reader = FileReader(LineIndex(tmp_path / "idx"))
+    assert reader.read_movement("SUB", 2) == ("forward", 12)
+    assert reader.read_movement("SUB", 3) is None
+    assert reader.read_movement("SUB", 9) is None
+    assert reader.read_sensor("SUB", 2) == "1" * 208
+
+
+def test_rounds_follow_the_valid_records_the_readers_yield(tmp_path, monkeypatch):
+    moves = tmp_path / "MovementReports"
+    sensors = tmp_path / "Sensordata"
+    moves.mkdir()
+    sensors.mkdir()
+    (moves / "SUB.txt").write_text("forward 1\nforward x\nforward 2\n\ndown 5\n")
+    (sensors / "SUB.txt").write_text("0" * 208 + "\nbad\n" + "1" * 207 + "2\n\n" + "1" * 208 + "\n")
+    monkeypatch.setattr(paths, "MOVEMENT_REPORTS_DIR", moves)
+    monkeypatch.setattr(paths, "SENSOR_DATA_DIR", sensors)
+
+    reader = FileReader(LineIndex(tmp_path / "idx"))
+    simulated = list(reader.load_movements("SUB"))
+    assert simulated == [("forward", 1), ("forward", 2)]
+    assert [reader.read_movement("SUB", r) for r in (1, 2, 3, 4)] == simulated + [None, None]
+    assert reader.read_sensor("SUB", 2) == "1" * 208
+    assert reader.read_sensor("SUB", 3) is None
+    # det fysiska radindexet finns kvar oförändrat bredvid det filtrerade
+    assert reader.line_index.read_line(moves / "SUB.txt", 5) == "down 5"
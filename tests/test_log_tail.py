@@ -0,0 +1,71 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.utils.log_tail import LogTailer
+
+
+def append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_poll_reads_only_appended_lines(tmp_path):
+    log = tmp_path / "movements.log"
+    append(log, "2025-01-01 10:00:00 [INFO] old line\n")
+    tailer = LogTailer({"movement_logger": str(log)}, backlog_bytes=0)
+    assert tailer.poll() == []
+
+    append(log, "2025-01-01 10:00:01 [CRITICAL] Collision at (1, 2)\n2025-01-01 10:00:02 [INFO] half")
+    new = tailer.poll()
+    assert [line.level for line in new] == ["CRITICAL"]
+
+    append(log, " line\n")
+    assert [line.text[-9:] for line in tailer.poll()] == ["half line"]
+
+
+def test_ring_buffer_and_filters(tmp_path):
+    moves, sensor = tmp_path / "movements.log", tmp_path / "sensor.log"
+    append(moves, "".join(f"t [INFO] move {i}\n" for i in range(50)))
+    append(sensor, "t [WARNING] sensor low\n")
+    tailer = LogTailer({"movement_logger": str(moves), "sensor_logger": str(sensor)}, max_lines=10)
+    tailer.poll()
+
+    assert len(tailer.buffer) == 10
+    assert [line.logger for line in tailer.filtered(min_level="WARNING")] == ["sensor_logger"]
+    assert len(tailer.filtered(loggers={"movement_logger"})) == 9
+
+
+def test_truncated_file_is_read_from_start(tmp_path):
+    log = tmp_path / "nukes.log"
+    append(log, "t [INFO] first\n" * 3)
+    tailer = LogTailer({"nuke_logger": str(log)})
+    tailer.poll()
+
+    log.write_text("t [ERROR] new\n")
+    assert [line.level for line in tailer.poll()] == ["ERROR"]
+
+
+def test_fast_writer_is_skipped_to_the_latest_lines(tmp_path):
+    log = tmp_path / "movements.log"
+    append(log, "t [INFO] start\n")
+    tailer = LogTailer({"movement_logger": str(log)}, max_lines=5)
+    tailer.poll()
+
+    append(log, "".join(f"t [INFO] move {i:04d}\n" for i in range(1000)))
+    new = tailer.poll(max_bytes=200)
+    assert new[-1].text == "t [INFO] move 0999"
+    assert all(line.text.startswith("t [INFO] move ") for line in new)
+    assert [line.text for line in tailer.buffer][-5:] == [f"t [INFO] move {i:04d}" for i in range(995, 1000)]
+    assert tailer.skipped_bytes > 0
+
+
+def test_backlog_on_a_line_start_keeps_that_line(tmp_path):
+    log = tmp_path / "sensor.log"
+    append(log, "t [INFO] aaaa\nt [INFO] bbbb\n")
+    tailer = LogTailer({"sensor_logger": str(log)}, backlog_bytes=14)
+    append(log, "t [INFO] cccc\n")
+    assert [line.text for line in tailer.poll()] == ["t [INFO] bbbb", "t [INFO] cccc"]
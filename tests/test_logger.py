@@ -0,0 +1,35 @@
+import logging
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.utils.logger import LazyFileHandler
+
+
+def test_lazy_handler_creates_dir_and_file_on_first_emit(tmp_path):
+    log_path = tmp_path / "nested" / "test.log"
+    handler = LazyFileHandler(str(log_path))
+    logger = logging.getLogger("test_lazy_handler")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        assert not log_path.parent.exists()
+
+        logger.info("första raden")
+        handler.flush()
+
+        assert log_path.read_text(encoding="utf-8").strip() == "första raden"
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_importing_main2_does_not_load_qt():
+    import subprocess
+    code = "import sys, src.main2; print(any(m.startswith('PyQt5') for m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "False"
@@ -0,0 +1,94 @@
+import os
+import random
+import sys
+from itertools import combinations
+from unittest.mock import Mock
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.movement_manager import MovementManager
+from src.core.near_miss import Lookahead, NearMissPredictor
+from src.core.submarine import Submarine
+
+
+def make_manager(fleet):
+    manager = MovementManager(reader=None)
+    for sub_id, moves in fleet.items():
+        sub = Submarine(sub_id)
+        sub.attach_generator(iter(moves))
+        manager.submarines[sub_id] = sub
+    return manager
+
+
+def test_lookahead_peeks_without_consuming():
+    it = Lookahead(iter([1, 2, 3]))
+    assert it.peek(2) == [1, 2]
+    assert next(it) == 1
+    assert it.peek(5) == [2, 3]
+    assert it.exhausted
+    assert list(it) == [2, 3]
+
+
+def test_predicts_upcoming_collision_without_changing_the_run(capsys):
+    fleet = {
+        "a": [("forward", 1)] * 4,
+        "b": [("down", 3), ("up", 1), ("up", 1), ("forward", 4)],
+        "far": [("down", 50)] * 4,
+    }
+    manager = make_manager(fleet)
+    predictor = NearMissPredictor(horizon=3, distance=1.5)
+    predictor.attach(manager)
+
+    manager.step_round(1, Mock())
+
+    # a: (2,0),(3,0),(4,0); b: (0,2),(0,1),(4,1) → d=1 i runda 3 framåt
+    assert [(m.sub_a, m.sub_b, m.rounds_ahead, m.distance) for m in predictor.latest] == [("a", "b", 3, 1.0)]
+
+    manager.run(Mock())
+    reference = make_manager(fleet)
+    reference.run(Mock())
+    assert [s.position for s in manager.submarines.values()] == [s.position for s in reference.submarines.values()]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    fleet = {
+        f"S{i}": [(rng.choice(("up", "down", "forward")), rng.randint(0, 4)) for _ in range(rng.randint(0, 6))]
+        for i in range(40)
+    }
+    for sub_id, moves in fleet.items():
+        fleet[sub_id] = [(rng.choice(("up", "down")), rng.randint(0, 20)), ("forward", rng.randint(0, 20))] + moves
+    manager = make_manager(fleet)
+    manager.step_round(1, Mock())
+    manager.step_round(2, Mock())
+
+    predictor = NearMissPredictor(horizon=4, distance=2.5)
+    found = {(m.sub_a, m.sub_b): m.rounds_ahead for m in predictor.predict(manager.submarines.values())}
+
+    # brute force över alla par och rundor
+    paths = {}
+    for sub in manager.submarines.values():
+        if not sub.is_active or sub._gen is None:
+            continue
+        moves = sub._gen.peek(4)
+        x, y = sub.position
+        path = []
+        for direction, dist in moves:
+            x += dist if direction == "forward" else 0
+            y += dist if direction == "down" else -dist if direction == "up" else 0
+            path.append((x, y))
+        path.append((x, y))
+        paths[sub.id] = path[:4]
+    expected = {}
+    for a, b in combinations(paths, 2):
+        for k, (pa, pb) in enumerate(zip(paths[a], paths[b])):
+            if ((pa[0] - pb[0]) ** 2 + (pa[1] - pb[1]) ** 2) ** 0.5 <= 2.5:
+                expected[(a, b)] = k + 1
+                break
+
+    assert found == expected
@@ -0,0 +1,67 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.config import paths
+from src.data.parallel_reader import ParallelFileReader, split_ranges
+
+
+def write_moves(tmp_path, monkeypatch, lines):
+    monkeypatch.setattr(paths, "MOVEMENT_REPORTS_DIR", tmp_path)
+    (tmp_path / "SUB.txt").write_text("\n".join(lines) + "\n")
+
+
+def test_split_ranges_are_line_aligned(tmp_path):
+    source = tmp_path / "f.txt"
+    source.write_bytes(b"".join(b"forward %d\n" % i for i in range(500)))
+    ranges = split_ranges(source, 7, min_chunk=1)
+    data = source.read_bytes()
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and data[start - 1:start] == b"\n"
+
+
+def test_parallel_load_matches_sequential_semantics(tmp_path, monkeypatch):
+    lines = [f"forward {i}" for i in range(1, 300)]
+    lines[10] = "up x"          # ogiltig distans, rad 11
+    lines[200] = ""             # tom rad, rad 201 → läsningen stoppar
+    lines[250] = "down nope"    # efter den tomma raden, ska inte rapporteras
+    write_moves(tmp_path, monkeypatch, lines)
+
+    moves = ParallelFileReader(workers=4, min_chunk=1).load_movements("SUB")
+
+    assert len(moves) == 199
+    assert list(moves.iter_moves())[:2] == [("forward", 1), ("forward", 2)]
+    assert moves.line_numbers[10] == 12
+    assert [n for n, _, _ in moves.invalid] == [11]
+
+
+def test_parallel_load_respects_max_lines(tmp_path, monkeypatch):
+    lines = [f"down {i}" for i in range(100)]
+    lines[60] = "bad"
+    write_moves(tmp_path, monkeypatch, lines)
+
+    moves = ParallelFileReader(workers=3, min_chunk=1).load_movements("SUB", max_lines=50)
+
+    assert len(moves) == 50
+    assert moves.distances[-1] == 49
+    assert moves.invalid == []
+
+
+def test_parallel_load_matches_file_reader_on_edge_cases(tmp_path, monkeypatch):
+    from src.data.file_reader import FileReader
+
+    lines = [("left 3" if i % 97 == 5 else f"forward {i}") for i in range(400)]
+    lines[150] = "sideways 2"
+    write_moves(tmp_path, monkeypatch, lines)
+    parallel = ParallelFileReader(workers=4, min_chunk=1)
+
+    for max_lines in (0, 1, 120, 10_000):
+        expected = list(FileReader().load_movements("SUB", max_lines=max_lines))
+        assert list(parallel.load_movements("SUB", max_lines=max_lines).iter_moves()) == expected
+    assert ("left", 3) in expected and ("sideways", 2) in expected
+    assert parallel.load_movements("SUB", max_lines=None).invalid == []
@@ -0,0 +1,46 @@
+import os
+import random
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.pattern_index import PatternIndex
+from src.utils.bitpack import PATTERN_LEN, hamming, pack_pattern, unpack_pattern
+
+
+def test_pack_roundtrip():
+    pattern = "10" * (PATTERN_LEN // 2)
+    assert unpack_pattern(pack_pattern(pattern)) == pattern
+
+
+def test_search_matches_brute_force():
+    """MIH-sökningen ska ge exakt samma träffar som en brute-force-skanning."""
+    rng = random.Random(42)
+    base = rng.getrandbits(PATTERN_LEN)
+    patterns = [base]
+    for _ in range(300):
+        p = base
+        for bit in rng.sample(range(PATTERN_LEN), rng.randint(0, 20)):
+            p ^= 1 << bit
+        patterns.append(p)
+
+    index = PatternIndex(blocks=4)
+    for round_counter, p in enumerate(patterns, start=1):
+        index.add_pattern(p, f"SUB_{round_counter % 3}", round_counter)
+
+    for k in (0, 3, 7, 12):
+        expected = {p for p in patterns if hamming(p, base) <= k}
+        found = {index.registry.pattern(pid) for pid, _ in index.search(base, k)}
+        assert found == expected
+
+
+def test_occurrences_recorded_per_sub_and_round():
+    index = PatternIndex()
+    pid = index.add_pattern(7, "A", 1)
+    index.add_pattern(7, "B", 4)
+
+    assert len(index) == 1
+    assert index.occurrences[pid] == [("A", 1), ("B", 4)]
+    assert index.search(6, 1) == [(pid, 1)]
@@ -0,0 +1,32 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.core.pattern_registry import PatternRegistry
+
+
+def test_intern_assigns_one_id_per_pattern():
+    """Samma mönster ska alltid få samma id, oavsett vilken ubåt som rapporterar det."""
+    registry = PatternRegistry()
+    a = registry.record("SUB_1", "1010")
+    b = registry.record("SUB_2", "1010")
+    c = registry.record("SUB_2", "1100")
+
+    assert a == b
+    assert a != c
+    assert len(registry) == 2
+    assert registry.pattern(a) == "1010"
+
+
+def test_cross_fleet_queries():
+    """Testar 'vilka ubåtar såg mönster P' och 'vanligaste mönstret i flottan'."""
+    registry = PatternRegistry()
+    for sub_id, pattern in [("A", "11"), ("B", "11"), ("B", "11"), ("C", "00")]:
+        registry.record(sub_id, pattern)
+
+    assert registry.subs_with("11") == {"A", "B"}
+    assert registry.subs_with("01") == set()
+    assert registry.most_common(1) == [("11", 3)]
@@ -0,0 +1,88 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.prefetcher import Prefetcher
+
+
+def test_items_arrive_in_order_for_every_source():
+    prefetcher = Prefetcher(depth=8, block=3)
+    gens = {i: prefetcher.wrap(iter(range(i * 100, i * 100 + 50))) for i in range(20)}
+    try:
+        results = {i: [] for i in gens}
+        for _ in range(50):
+            for i, gen in gens.items():
+                results[i].append(next(gen))
+        assert all(results[i] == list(range(i * 100, i * 100 + 50)) for i in gens)
+        assert all(next(gen, None) is None for gen in gens.values())
+    finally:
+        prefetcher.close()
+
+
+def test_buffers_are_bounded():
+    pulled = []
+
+    def source():
+        for i in range(1000):
+            pulled.append(i)
+            yield i
+
+    prefetcher = Prefetcher(depth=10, block=4)
+    gen = prefetcher.wrap(source())
+    try:
+        assert next(gen) == 0
+        time.sleep(0.05)  # ge tråden tid att fylla bufferten
+        assert len(pulled) <= 1 + 10
+    finally:
+        prefetcher.close()
+
+
+def test_errors_are_raised_in_consumer_after_buffered_items():
+    def source():
+        yield 1
+        raise ValueError("trasig fil")
+
+    prefetcher = Prefetcher()
+    gen = prefetcher.wrap(source())
+    try:
+        assert next(gen) == 1
+        with pytest.raises(ValueError):
+            next(gen)
+    finally:
+        prefetcher.close()
+
+
+def test_consumer_reads_directly_after_close():
+    prefetcher = Prefetcher(depth=2, block=1)
+    gen = prefetcher.wrap(iter(range(100)))
+    assert next(gen) == 0
+    prefetcher.close()
+    assert list(gen) == list(range(1, 100))
+
+
+def test_direct_reads_wait_for_the_block_in_flight():
+    started, gate = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        gate.wait(5)  # tråden står inne i next() när close() anropas
+        yield from range(10)
+
+    prefetcher = Prefetcher(depth=4, block=4)
+    gen = prefetcher.wrap(slow())
+    assert started.wait(5)
+    closer = threading.Thread(target=prefetcher.close)
+    closer.start()
+    while not prefetcher._stopping:
+        time.sleep(0.001)
+    threading.Timer(0.05, gate.set).start()
+
+    assert list(gen) == list(range(10))
+    closer.join(5)
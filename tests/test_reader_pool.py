@@ -0,0 +1,59 @@
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.config import paths
+from src.data.file_reader import FileReader
+from src.data.reader_pool import ReaderPool
+
+
+def write_files(tmp_path, count, lines):
+    files = []
+    for i in range(count):
+        path = tmp_path / f"{i}.txt"
+        path.write_text("".join(f"forward {i + j}\n" for j in range(lines)) + "up 1")
+        files.append(path)
+    return files
+
+
+def test_interleaved_readers_stay_within_limit(tmp_path):
+    files = write_files(tmp_path, 10, 50)
+    pool = ReaderPool(max_open=3, block_size=16)
+    readers = [pool.lines(f) for f in files]
+    results = [[] for _ in files]
+
+    for _ in range(60):
+        for i, reader in enumerate(readers):
+            line = next(reader, None)
+            if line is not None:
+                results[i].append(line)
+        assert pool.open_count <= 3
+
+    for path, lines in zip(files, results):
+        assert "".join(lines) == path.read_text()
+    assert pool.evictions > 0
+    assert pool.open_count == 0   # färdiga läsare släpper sin fil
+
+
+def test_rejects_empty_pool():
+    with pytest.raises(ValueError):
+        ReaderPool(max_open=0)
+
+
+def test_file_reader_movements_through_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "MOVEMENT_REPORTS_DIR", tmp_path)
+    for path in write_files(tmp_path, 5, 20):
+        path.rename(tmp_path / f"sub{path.stem}.txt")
+
+    reader = FileReader(pool=ReaderPool(max_open=2, block_size=32))
+    gens = {i: reader.load_movements(f"sub{i}") for i in range(5)}
+    moves = {i: [next(gen) for _ in range(21)] for i, gen in gens.items()}
+
+    assert moves[3][0] == ("forward", 3)
+    assert moves[3][-1] == ("up", 1)
+    assert reader.pool.open_count <= 2
@@ -0,0 +1,97 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from src.core.movement_manager import MovementManager
+from src.core.replay import ReplayPlayer, ReplayRecorder
+from src.core.submarine import Submarine
+
+
+class NoSensors:
+    def process_next_round(self, round_counter, only_active=True):
+        pass
+
+
+class History:
+    """Observer som sparar varje publicerad snapshot och rundans drag."""
+
+    def __init__(self):
+        self.snapshots = {}
+        self.moves = {}
+
+    def on_round(self, manager, round_counter):
+        self.snapshots[round_counter] = manager.snapshot
+        self.moves[round_counter] = [(sub.id, prev, sub.position) for sub, prev in manager.round_moves]
+
+
+def record(tmp_path, capsys, keyframe_interval=4, close=True):
+    manager = MovementManager(reader=None)
+    fleet = {
+        "a": [("forward", 1), ("forward", 2), ("forward", 1)] + [("down", 1)] * 6,
+        "b": [("down", 2), ("forward", 5), ("up", 3)] * 4,
+        "c": [("forward", 3)],                      # a kör in i c i runda 2
+        "d": [("up", 1), ("forward", 1)] * 7,
+    }
+    for sub_id, moves in fleet.items():
+        sub = Submarine(sub_id)
+        sub.attach_generator(iter(moves))
+        manager.submarines[sub_id] = sub
+    manager.publish_snapshot(0)
+
+    history = History()
+    history.snapshots[0] = manager.snapshot
+    recorder = ReplayRecorder(tmp_path / "run.replay", keyframe_interval=keyframe_interval)
+    recorder.attach(manager)
+    manager.add_observer(history)
+    manager.run(NoSensors())
+    if close:
+        recorder.close()
+    else:
+        recorder._file.close()  # som en avbruten körning: inget index
+    capsys.readouterr()
+    return manager, history
+
+
+def same(a, b):
+    return (a.round_number, a.ids, list(a.xs), list(a.ys), a.active, a.collision_count) == \
+           (b.round_number, b.ids, list(b.xs), list(b.ys), b.active, b.collision_count)
+
+
+@pytest.mark.parametrize("close", [True, False])
+def test_seek_reproduces_every_round(tmp_path, capsys, close):
+    manager, history = record(tmp_path, capsys, close=close)
+    last = max(history.snapshots)
+
+    with ReplayPlayer(tmp_path / "run.replay") as player:
+        assert player.last_round == last
+        assert player.keyframes == [r for r in range(0, last + 1, 4)]
+        for r in [7, 0, 3, 1, 4, last]:   # framåt och bakåt
+            assert same(player.seek(r), history.snapshots[r])
+        assert player.collisions == manager.collisions
+
+
+def test_play_feeds_observers_like_the_manager(tmp_path, capsys):
+    manager, history = record(tmp_path, capsys)
+    replayed = History()
+
+    with ReplayPlayer(tmp_path / "run.replay") as player:
+        player.add_observer(replayed)
+        assert player.play(end=5) == 5
+        assert player.round_number == 5
+        assert player.play() == max(history.snapshots) - 5
+
+    for r, snapshot in replayed.snapshots.items():
+        assert same(snapshot, history.snapshots[r])
+        assert replayed.moves[r] == history.moves[r]
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "x.replay"
+    path.write_bytes(b"not a replay")
+    with pytest.raises(ValueError):
+        ReplayPlayer(path)
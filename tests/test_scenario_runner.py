@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.config import paths
+from src.utils import logger
+from src.scenario_runner import ScenarioRunner, main, run_scenario
+
+
+def make_scenario(root, moves):
+    (root / "MovementReports").mkdir(parents=True)
+    (root / "Sensordata").mkdir()
+    for sub_id, text in moves.items():
+        (root / "MovementReports" / f"{sub_id}.txt").write_text(text)
+        (root / "Sensordata" / f"{sub_id}.txt").write_text(("1" * 207 + "0\n") * 3)
+    return root
+
+
+def sleepy(root):
+    time.sleep(30)
+    return {}
+
+
+def broken(root):
+    raise RuntimeError(f"bad scenario {root}")
+
+
+def test_run_scenario_in_process(tmp_path, monkeypatch):
+    # run_scenario pekar om paths; återställ efter testet
+    for name in ("MOVEMENT_REPORTS_DIR", "SENSOR_DATA_DIR", "SECRETS_DIR", "LOG_DIR",
+                 "SENSOR_CACHE_DIR", "LINE_INDEX_DIR", "FLEET_MANIFEST_PATH", "EVENT_STORE_PATH"):
+        monkeypatch.setattr(paths, name, getattr(paths, name))
+    previous_log_dir = logger.LOG_DIR
+    root = make_scenario(tmp_path / "a", {
+        "10053472-25": "forward 2\ndown 1\n",
+        "10053473-26": "forward 2\ndown 1\n",   # samma bana → kollision i runda 1
+        "10053474-27": "down 9\nforward 1\n",
+    })
+    try:
+        result = run_scenario(str(root))
+    finally:
+        logger.set_log_dir(previous_log_dir)
+
+    assert "Collision" in (root / "Logs" / "collisions.log").read_text(encoding="utf-8")
+    assert result["collision_count"] == 1
+    assert result["collisions"][0][1:] == [[2, 0], "10053473-26", "10053472-25"]
+    assert result["final_positions"]["10053474-27"] == [1, 9, True]
+    assert result["active"] == 1
+    assert result["sensor"]["sensor_errors"] == result["sensor"]["readings"]  # en 0:a per rad
+    assert result["nuke_allowed"] == 1
+
+
+def test_runner_runs_scenarios_in_parallel_and_keeps_order(tmp_path):
+    a = make_scenario(tmp_path / "a", {"10053472-25": "forward 1\n"})
+    b = make_scenario(tmp_path / "b", {"10053472-25": "down 4\n", "10053473-26": "up 4\n"})
+
+    results = ScenarioRunner(workers=2).run([str(a), str(b)])
+
+    assert [r["root"] for r in results] == [str(a), str(b)]
+    assert all(r["status"] == "ok" for r in results)
+    assert results[0]["final_positions"] == {"10053472-25": [1, 0, True]}
+    # varje scenario loggar till sin egen Logs/
+    assert "10053473-26" not in (a / "Logs" / "movements.log").read_text(encoding="utf-8")
+    assert "10053473-26" in (b / "Logs" / "movements.log").read_text(encoding="utf-8")
+    assert results[1]["final_positions"] == {"10053472-25": [0, 4, True], "10053473-26": [0, -4, True]}
+
+
+def test_runner_times_out_and_reports_errors(tmp_path):
+    started = time.monotonic()
+    results = ScenarioRunner(workers=2, timeout=0.5, target=sleepy).run(["x", "y", "z"])
+    assert [r["status"] for r in results] == ["timeout"] * 3
+    assert time.monotonic() - started < 10
+
+    results = ScenarioRunner(workers=1, target=broken).run(["x"])
+    assert results[0]["status"] == "error"
+    assert "bad scenario x" in results[0]["error"]
+
+
+def test_main_writes_result_file(tmp_path):
+    a = make_scenario(tmp_path / "a", {"10053472-25": "forward 3\n"})
+    out = tmp_path / "results.json"
+
+    assert main([str(a), "-j", "1", "-o", str(out)]) == 0
+
+    data = json.loads(out.read_text())
+    assert data["workers"] == 1
+    assert data["scenarios"][0]["final_positions"] == {"10053472-25": [3, 0, True]}
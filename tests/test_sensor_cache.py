@@ -0,0 +1,43 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.sensor_cache import HEADER, SensorCache
+from src.utils.bitpack import PACKED_LEN, pack_pattern
+
+VALID_A = "1" * 200 + "0" * 8
+VALID_B = "01" * 104
+
+
+def write_sensor_file(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def test_build_packs_valid_lines_and_counts_invalid(tmp_path):
+    source = tmp_path / "SUB.txt"
+    write_sensor_file(source, [VALID_A, "10102", VALID_B, "x" * 208])
+    cache = SensorCache(tmp_path / "cache")
+
+    readings = list(cache.iter_packed("SUB", source))
+    header = cache.read_header(cache.cache_path("SUB"))
+
+    assert readings == [pack_pattern(VALID_A), pack_pattern(VALID_B)]
+    assert header.line_count == 2
+    assert header.invalid_count == 2
+    assert os.path.getsize(cache.cache_path("SUB")) == HEADER.size + 2 * PACKED_LEN
+
+
+def test_cache_is_rebuilt_when_source_changes(tmp_path):
+    source = tmp_path / "SUB.txt"
+    write_sensor_file(source, [VALID_A])
+    cache = SensorCache(tmp_path / "cache")
+    cache.ensure("SUB", source)
+    assert cache.is_fresh(source, cache.cache_path("SUB"))
+
+    write_sensor_file(source, [VALID_A, VALID_B])
+    assert not cache.is_fresh(source, cache.cache_path("SUB"))
+    assert len(list(cache.iter_packed("SUB", source))) == 2
@@ -0,0 +1,97 @@
+import os
+import sys
+from unittest.mock import Mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.config import paths
+from src.core.movement_manager import MovementManager
+from src.core.sensor_manager import SensorManager
+from src.core.sensor_pipeline import ActiveChannel, PipelinedSensorManager
+from src.data.file_reader import FileReader
+from src.data.sensor_cache import SensorCache
+
+
+def test_channel_round_trip_and_wraparound():
+    channel = ActiveChannel(fleet_size=20, depth=2)
+    for round_number in range(1, 6):
+        active = [i for i in range(20) if (i + round_number) % 3]
+        assert channel.put(round_number, active)
+        assert channel.get() == (round_number, active)
+    channel.put(6, [])
+    channel.close()
+    assert channel.get() == (6, [])
+    assert channel.get() is None
+
+
+def test_channel_put_times_out_when_full():
+    channel = ActiveChannel(fleet_size=3, depth=1)
+    assert channel.put(1, [0, 2])
+    assert not channel.put(2, [1], timeout=0.01)
+    assert channel.get() == (1, [0, 2])
+    assert channel.put(2, [1], timeout=0.01)
+
+
+def make_scenario(root):
+    (root / "MovementReports").mkdir(parents=True)
+    (root / "Sensordata").mkdir()
+    moves = {
+        "10053472-25": "forward 1\n" * 6,
+        "10053473-26": "down 1\nforward 2\nforward 2\nup 1\n",  # möter 25:an i (4, 0) i runda 4
+        "10053474-27": "down 5\n" * 8,
+    }
+    for i, (sub_id, text) in enumerate(moves.items()):
+        (root / "MovementReports" / f"{sub_id}.txt").write_text(text)
+        lines = [("1" * (200 + r % 8)).ljust(208, "0") for r in range(i, i + 10)]
+        (root / "Sensordata" / f"{sub_id}.txt").write_text("\n".join(lines) + "\n")
+    return root
+
+
+def run(sensor_factory):
+    reader = FileReader()
+    manager = MovementManager(reader)
+    manager.load_submarines_from_generator(reader.load_all_movement_files())
+    sensors = sensor_factory(manager)
+    manager.run(sensors)
+    sensors.final_summary()
+    return manager, sensors.summary()
+
+
+def test_pipeline_matches_serial_sensor_stage(tmp_path, monkeypatch, capsys):
+    root = make_scenario(tmp_path / "scenario")
+    for name in ("MOVEMENT_REPORTS_DIR", "SENSOR_DATA_DIR", "SECRETS_DIR", "LOG_DIR",
+                 "SENSOR_CACHE_DIR", "LINE_INDEX_DIR", "FLEET_MANIFEST_PATH", "EVENT_STORE_PATH"):
+        monkeypatch.setattr(paths, name, getattr(paths, name))
+    paths.set_files_dir(root)
+
+    def serial(manager):
+        sensors = SensorManager(manager, cache=SensorCache(tmp_path / "cache"))
+        sensors.attach_generators(manager.submarines.values())
+        return sensors
+
+    serial_manager, expected = run(serial)
+    pipelined_manager, actual = run(lambda m: PipelinedSensorManager(m, depth=2, files_dir=str(root)))
+
+    assert len(serial_manager.collisions) == 1
+    assert pipelined_manager.collisions == serial_manager.collisions
+    assert actual == expected
+    assert expected["subs"]["10053472-25"]["readings"] == 3   # förstörd i runda 4, före sensorsteget
+    assert expected["subs"]["10053474-27"]["readings"] == 9   # 8 drag + rundan då dragen tar slut
+
+
+def test_dead_worker_is_reported():
+    manager = Mock(submarines={"a": Mock(id="a")})
+    manager.active_subs = list(manager.submarines.values())
+    sensors = PipelinedSensorManager(manager, depth=1)
+    sensors.process.terminate()
+    sensors.process.join()
+
+    try:
+        for round_number in range(1, 4):
+            sensors.process_next_round(round_number)
+    except RuntimeError as e:
+        assert "sensor worker exited" in str(e)
+    else:
+        raise AssertionError("expected RuntimeError")
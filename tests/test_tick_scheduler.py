@@ -0,0 +1,83 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from src.core.movement_manager import MovementManager
+from src.core.submarine import Submarine
+from src.core.tick_scheduler import TickScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+    def work(self, seconds):
+        self.now += seconds
+
+
+def test_sleeps_only_the_remaining_budget():
+    clock = FakeClock()
+    ticks = TickScheduler(1.0, clock=clock, sleep=clock.sleep)
+    ticks.start()
+    for work in (0.2, 0.5, 0.9):
+        clock.work(work)
+        ticks.wait()
+
+    assert clock.slept == pytest.approx([0.8, 0.5, 0.1])
+    assert clock.now == pytest.approx(103.0)   # ingen drift: tre perioder exakt
+    stats = ticks.stats()
+    assert stats.ticks == 3 and stats.overruns == 0
+    assert stats.achieved_rate == pytest.approx(1.0)
+    assert stats.jitter_p99 == pytest.approx(0.0)
+
+
+def test_overrun_is_recorded_and_schedule_restarts():
+    clock = FakeClock()
+    ticks = TickScheduler(1.0, clock=clock, sleep=clock.sleep)
+    ticks.start()
+    clock.work(2.5)          # långt över perioden
+    ticks.wait()
+    clock.work(0.25)
+    ticks.wait()
+
+    assert clock.slept == pytest.approx([0.75])   # ingen ikappkörning efter överdraget
+    stats = ticks.stats()
+    assert stats.overruns == 1
+    assert stats.max_overrun == pytest.approx(1.5)
+    assert stats.jitter_p50 == pytest.approx(0.0) and stats.jitter_p99 == pytest.approx(1.5)
+    assert stats.achieved_rate == pytest.approx(2 / 3.5)
+    assert "1 overruns" in stats.describe()
+
+
+def test_rejects_non_positive_period():
+    with pytest.raises(ValueError):
+        TickScheduler(0)
+
+
+def test_manager_uses_the_scheduler(capsys):
+    manager = MovementManager(reader=None, tick_delay=0.01)
+    sub = Submarine("a")
+    sub.attach_generator(iter([("forward", 1)] * 3))
+    manager.submarines["a"] = sub
+
+    class NoSensors:
+        def process_next_round(self, round_counter, only_active=True):
+            pass
+
+    manager.run(NoSensors())
+    capsys.readouterr()
+    assert manager.scheduler.ticks == 4   # 3 drag + rundan då dragen tar slut
+    assert MovementManager(reader=None).scheduler is None
@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.config import paths
+from src.core.movement_manager import MovementManager
+from src.core.submarine import Submarine
+from src.core.trajectory_bounds import TrajectoryBounds, build_bounds
+
+
+def run_fleet(fleet, bounds=None):
+    manager = MovementManager(reader=None)
+    manager.bounds = bounds
+    for sub_id, moves in fleet.items():
+        sub = Submarine(sub_id)
+        sub.attach_generator(iter(moves))
+        manager.submarines[sub_id] = sub
+    manager.run(Mock())
+    return manager
+
+
+def test_window_boxes_cover_the_runout_round():
+    bounds = TrajectoryBounds(window=2)
+    bounds.add("a", [("forward", 3), ("down", 2), ("up", 5)])
+
+    assert bounds.box("a", 1) == (3, 0, 3, 2)     # runda 1–2
+    assert bounds.box("a", 3) == (3, -3, 3, -3)   # runda 3 + rundan då dragen tar slut
+    assert bounds.box("a", 5) is None
+    assert bounds.overall["a"] == (3, -3, 3, 2)
+
+
+def test_only_overlapping_subs_are_candidates():
+    bounds = TrajectoryBounds(window=2)
+    bounds.add("left", [("forward", 1)] * 4)
+    bounds.add("right", [("forward", 1)] * 2)
+    bounds.add("far", [("down", 100)] * 4)
+
+    # fönster 0: left (1..2, 0) och right (1..2, 0) överlappar
+    assert bounds.isolated(1) == {"far"}
+    # fönster 1: right är slut efter runda 3 men står kvar på (2, 0); left på (3..4, 0)
+    assert bounds.isolated(3) == {"left", "right", "far"}
+    assert "unknown" not in bounds.isolated(1)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pruning_does_not_change_collisions(seed):
+    rng = random.Random(seed)
+    fleet = {
+        f"S{i}": [(rng.choice(("up", "down", "forward")), rng.randint(0, 3 if i % 2 else 40))
+                  for _ in range(rng.randint(1, 60))]
+        for i in range(40)
+    }
+    bounds = TrajectoryBounds(window=8)
+    for sub_id, moves in fleet.items():
+        bounds.add(sub_id, moves)
+
+    plain = run_fleet(fleet)
+    pruned = run_fleet(fleet, bounds)
+
+    assert pruned.collisions == plain.collisions
+    assert [s.position for s in pruned.submarines.values()] == [s.position for s in plain.submarines.values()]
+
+
+def test_build_bounds_from_movement_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "MOVEMENT_REPORTS_DIR", tmp_path)
+    (tmp_path / "a.txt").write_text("forward 2\ndown 1\n\nforward 99\n")
+
+    bounds = build_bounds(["a", "missing"], window=4)
+
+    assert "missing" not in bounds
+    assert bounds.overall["a"] == (2, 0, 2, 1)
@@ -0,0 +1,101 @@
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from src.core.fleet_snapshot import FleetSnapshot
+from src.core.movement_manager import MovementManager
+from src.core.submarine import Submarine
+from src.core.trajectory_export import TrajectoryExporter, load_export
+from src.utils.npy import load_npy
+
+
+class NoSensors:
+    def process_next_round(self, round_counter, only_active=True):
+        pass
+
+
+class History:
+    def __init__(self):
+        self.snapshots = []
+
+    def on_round(self, manager, round_counter):
+        self.snapshots.append(manager.snapshot)
+
+
+def run_exported(tmp_path, capsys, every=1, chunk_rows=5):
+    manager = MovementManager(reader=None)
+    fleet = {
+        "10053472-25": [("forward", 1), ("forward", 2), ("forward", 1)],
+        "10053473-26": [("down", 2), ("forward", 5), ("up", 3), ("up", 1)],
+        "10053474-27": [("forward", 3)],   # kolliderar med 25:an i runda 2
+    }
+    for sub_id, moves in fleet.items():
+        sub = Submarine(sub_id)
+        sub.attach_generator(iter(moves))
+        manager.submarines[sub_id] = sub
+    manager.publish_snapshot(0)
+
+    history = History()
+    history.snapshots.append(manager.snapshot)
+    exporter = TrajectoryExporter(tmp_path / "export", every=every, chunk_rows=chunk_rows)
+    exporter.attach(manager)
+    manager.add_observer(history)
+    manager.run(NoSensors())
+    exporter.close()
+    capsys.readouterr()
+    return history.snapshots
+
+
+def test_columns_hold_every_round_of_the_fleet(tmp_path, capsys):
+    snapshots = run_exported(tmp_path, capsys)
+    ids, cols = load_export(tmp_path / "export")
+
+    assert ids == ["10053472-25", "10053473-26", "10053474-27"]
+    expected = [
+        (s.round_number, i, s.xs[i], s.ys[i], s.active[i])
+        for s in snapshots for i in range(len(ids))
+    ]
+    rows = list(zip(cols["round"], cols["sub"], cols["x"], cols["y"], cols["active"]))
+    assert rows == expected
+    assert rows[-1] == (5, 2, 3, 0, 0)   # 27:an förstördes i runda 2 och står kvar
+
+    meta = json.loads((tmp_path / "export" / "meta.json").read_text())
+    assert meta["rows"] == len(rows) and meta["rounds"] == len(snapshots)
+
+
+def test_every_nth_round(tmp_path, capsys):
+    run_exported(tmp_path, capsys, every=2)
+    _, cols = load_export(tmp_path / "export")
+    assert sorted(set(cols["round"])) == [0, 2, 4]
+
+
+def test_column_file_is_valid_after_each_chunk(tmp_path):
+    exporter = TrajectoryExporter(tmp_path / "export", chunk_rows=4)
+
+    subs = [Submarine("a"), Submarine("b")]
+    manager = MovementManager(reader=None)
+    manager.snapshot = FleetSnapshot.capture(0, subs)
+    exporter.attach(manager)
+    for r in range(1, 4):
+        manager.snapshot = FleetSnapshot.capture(r, subs)
+        exporter.on_round(manager, r)
+    # 8 rader har nått disken, inget close() ännu
+    data, shape = load_npy(tmp_path / "export" / "round.npy")
+    assert shape == (8,) and list(data) == [0, 0, 1, 1, 2, 2, 3, 3]
+    exporter.close()
+
+
+def test_numpy_can_memory_map_the_export(tmp_path, capsys):
+    np = pytest.importorskip("numpy")
+    run_exported(tmp_path, capsys)
+    x = np.load(tmp_path / "export" / "x.npy", mmap_mode="r")
+    ids = np.load(tmp_path / "export" / "ids.npy")
+    _, cols = load_export(tmp_path / "export")
+    assert list(x) == list(cols["x"])
+    assert ids[2] == "10053474-27"
@@ -0,0 +1,39 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.utils.update_coalescer import UpdateCoalescer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_take_returns_only_latest_round_with_interval_stats():
+    clock = FakeClock()
+    coalescer = UpdateCoalescer(clock=clock)
+    for round_number in range(1, 101):
+        coalescer.publish(round_number, 100 - round_number, round_number // 10)
+
+    clock.now = 0.5
+    summary = coalescer.take()
+    assert summary.round_number == 100
+    assert summary.active_subs == 0
+    assert summary.rounds_in_interval == 100
+    assert summary.rounds_per_sec == 200.0
+    assert summary.collisions_in_interval == 10
+
+
+def test_take_without_new_rounds_returns_none():
+    coalescer = UpdateCoalescer(clock=FakeClock())
+    assert coalescer.take() is None
+    coalescer.publish(1, 5, 0)
+    assert coalescer.take() is not None
+    assert coalescer.take() is None